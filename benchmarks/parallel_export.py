@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of parallel serialization of feed items by worker processes.
+
+Usage: python benchmarks/parallel_export.py [number of items] [numbers of workers...]
+
+For each number of workers the same items are exported to an in-memory feed.
+The process pool is started before the measurement like the pool of the pipeline that's shared by exporters.
+"""
+import os
+import sys
+import time
+from datetime import datetime
+from io import BytesIO
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scrapy_rss import RssItem  # noqa: E402
+from scrapy_rss.exporters import FeedItemExporter, create_process_pool  # noqa: E402
+
+
+def create_items(count):
+    items = []
+    for i in range(count):
+        item = RssItem()
+        item.title = 'Title {}'.format(i)
+        item.link = 'http://example.com/items/{}'.format(i)
+        item.description = 'Description of the item {} with <markup> & entities'.format(i) * 10
+        item.category = ['category {}'.format(i % 10), 'category {}'.format(i % 7)]
+        item.guid = {'value': 'http://example.com/items/{}'.format(i), 'isPermaLink': True}
+        item.pubDate = datetime(2000, 1, 1 + i % 28, i % 24, i % 60)
+        items.append(item)
+    return items
+
+
+def export(items, workers, executor):
+    exporter = FeedItemExporter(BytesIO(), 'Title', 'http://example.com/feed', 'Description',
+                                workers=workers, worker_batch_size=256, executor=executor)
+    exporter.start_exporting()
+    start = time.time()
+    exporter.export_items(items)
+    exporter.finish_exporting()
+    return time.time() - start
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    workers_list = [int(workers) for workers in sys.argv[2:]] or [1, 2, 4, 8]
+    items = create_items(count)
+    print('{} items, {} CPUs'.format(count, os.cpu_count() if hasattr(os, 'cpu_count') else '?'))
+    base_time = None
+    for workers in workers_list:
+        executor = create_process_pool(workers) if workers > 1 else None
+        try:
+            if executor is not None:
+                export(items[:workers * 256], workers, executor)  # start worker processes
+            elapsed = export(items, workers, executor)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        base_time = base_time or elapsed
+        print('workers: {:2d}  time: {:7.3f}s  items/s: {:9.0f}  speedup: {:5.2f}'
+              .format(workers, elapsed, count / elapsed, base_time / elapsed))
+
+
+if __name__ == '__main__':
+    main()
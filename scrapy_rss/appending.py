@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+
+import os
+import re
+import warnings
+from xml.sax.saxutils import unescape
+
+
+FEED_TAIL_SEARCH_SIZE = 4096
+FEED_HEAD_SEARCH_SIZE = 65536
+
+_NS_DECLARATION = re.compile(r'\sxmlns(?::([^\s=]+))?\s*=\s*(?:"([^"]*)"|\'([^\']*)\')')
+
+
+def read_declared_namespaces(file, encoding='utf-8'):
+    """
+    Read namespaces that are declared by the root element of the feed.
+    The file position is kept
+
+    Parameters
+    ----------
+    file : file object
+        Binary file of the feed that's opened for reading
+    encoding : str
+        Encoding of the feed
+
+    Returns
+    -------
+    dict
+        Namespaces {prefix: URI}, prefix of the default namespace is None
+    """
+    position = file.tell()
+    try:
+        file.seek(0)
+        head = file.read(FEED_HEAD_SEARCH_SIZE).decode(encoding, 'replace')
+    finally:
+        file.seek(position)
+    start = head.find(u'<rss')
+    end = head.find(u'>', start)
+    if start < 0 or end < 0:
+        return {}
+    return {match.group(1) or None: unescape(match.group(2) if match.group(2) is not None else match.group(3),
+                                             {'&quot;': '"', '&apos;': "'"})
+            for match in _NS_DECLARATION.finditer(head, start, end)}
+
+
+def update_last_build_date(file, last_build_date_markup, encoding='utf-8'):
+    """
+    Replace the lastBuildDate element of the channel in place if the new element has the same size.
+    The file position is kept
+
+    Parameters
+    ----------
+    file : file object
+        Binary file of the feed that's opened for reading and writing
+    last_build_date_markup : str
+        New lastBuildDate element
+    encoding : str
+        Encoding of the feed
+    """
+    position = file.tell()
+    try:
+        file.seek(0)
+        head = file.read(min(position, FEED_HEAD_SEARCH_SIZE))
+        items_offset = head.find(u'<item'.encode(encoding))
+        if items_offset >= 0:
+            head = head[:items_offset]
+        start = head.find(u'<lastBuildDate>'.encode(encoding))
+        if start < 0:
+            return
+        end_tag = u'</lastBuildDate>'.encode(encoding)
+        end = head.find(end_tag, start)
+        if end < 0:
+            return
+        markup = last_build_date_markup.encode(encoding, 'xmlcharrefreplace')
+        if len(markup) != end + len(end_tag) - start:
+            warnings.warn('lastBuildDate of the feed {} is not updated since it has another size'
+                          .format(getattr(file, 'name', file)))
+            return
+        file.seek(start)
+        file.write(markup)
+    finally:
+        file.seek(position)
+
+
+def open_feed_for_append(path, encoding='utf-8', buffering=-1):
+    """
+    Open the existing feed file for appending of items to its channel.
+    The file is positioned at the closing tags of the channel and the root element where new items are written,
+    the closing tags must be truncated by the caller when exporting is started
+
+    Parameters
+    ----------
+    path : str
+        Path to the feed file that's previously exported by FeedItemExporter
+    encoding : str
+        Encoding of the feed
+    buffering : int
+        Buffering policy of the file
+
+    Returns
+    -------
+    file object
+        Binary file that's opened for reading and writing
+
+    Raises
+    ------
+    ValueError
+        If the file is not a complete feed
+    """
+    file = open(path, 'r+b', buffering)
+    try:
+        file.seek(0, os.SEEK_END)
+        size = file.tell()
+        tail_offset = max(0, size - FEED_TAIL_SEARCH_SIZE)
+        file.seek(tail_offset)
+        tail = file.read()
+        channel_end = tail.rfind(u'</channel>'.encode(encoding))
+        if channel_end < 0 or tail[channel_end:].strip() != u'</channel></rss>'.encode(encoding):
+            raise ValueError('File {} is not a complete feed'.format(path))
+        file.seek(tail_offset + channel_end)
+    except Exception:
+        file.close()
+        raise
+    return file
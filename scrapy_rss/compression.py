@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+
+import bz2
+import gzip
+import os
+
+import six
+
+try:
+    import lzma
+except ImportError:
+    lzma = None
+
+
+def _open_gzip(file, level):
+    return gzip.GzipFile(fileobj=file, mode='wb', compresslevel=9 if level is None else level)
+
+
+def _open_bz2(file, level):
+    if six.PY2:
+        raise ValueError('bz2 compression of the feed is supported on Python 3 only')
+    return bz2.BZ2File(file, 'wb', compresslevel=9 if level is None else level)
+
+
+def _open_xz(file, level):
+    if lzma is None:
+        raise ValueError('xz compression of the feed requires lzma module that is available on Python 3 only')
+    return lzma.LZMAFile(file, 'wb', preset=level)
+
+
+COMPRESSIONS = {
+    'gzip': _open_gzip,
+    'bz2': _open_bz2,
+    'xz': _open_xz,
+}
+
+COMPRESSION_EXTENSIONS = {
+    '.gz': 'gzip',
+    '.gzip': 'gzip',
+    '.bz2': 'bz2',
+    '.xz': 'xz',
+}
+
+
+def get_compression(path, compression=None):
+    """
+    Get name of the compression of the feed file
+
+    Parameters
+    ----------
+    path : str
+        Path to the feed file
+    compression : str or None
+        Name of the compression ('gzip', 'bz2', 'xz' or 'none').
+        None means the compression that's chosen by the file extension
+
+    Returns
+    -------
+    str or None
+        Name of the compression or None if the file is not compressed
+    """
+    if compression is None:
+        return COMPRESSION_EXTENSIONS.get(os.path.splitext(path)[1].lower())
+    if compression == 'none':
+        return None
+    if compression not in COMPRESSIONS:
+        raise ValueError('Unknown compression {!r}, supported compressions: {}'
+                         .format(compression, ', '.join(sorted(COMPRESSIONS))))
+    return compression
+
+
+class CompressedFile(object):
+    """
+    Binary file-like object that compresses written data to the underlying file as a stream
+    """
+
+    def __init__(self, file, compression, level=None):
+        """
+        Parameters
+        ----------
+        file : file-like object
+            Binary file that's opened for writing, it's closed with this file
+        compression : str
+            Name of the compression: 'gzip', 'bz2' or 'xz'
+        level : int or None
+            Compression level (preset of xz compression), None means the default level of the codec
+        """
+        self.file = file
+        self.compression = compression
+        self._compressed_file = COMPRESSIONS[compression](file, level)
+
+    @property
+    def name(self):
+        return self.file.name
+
+    def write(self, data):
+        return self._compressed_file.write(data)
+
+    def flush(self):
+        """
+        Flush the compressed data to the underlying file.
+        Data of gzip stream is flushed completely,
+        bz2 and xz streams flush only data that's already compressed
+        """
+        self._compressed_file.flush()
+        self.file.flush()
+
+    def fileno(self):
+        return self.file.fileno()
+
+    def tell(self):
+        """
+        Get size of the already compressed data
+        """
+        return self.file.tell()
+
+    def close(self):
+        try:
+            self._compressed_file.close()
+        finally:
+            self.file.close()
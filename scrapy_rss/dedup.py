@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+
+import hashlib
+import os
+import sqlite3
+import struct
+
+import six
+
+
+_replace_file = getattr(os, 'replace', os.rename)
+
+
+def get_item_key(item):
+    """
+    Get de-duplication key of the feed item: content of guid element or link element if guid is not assigned
+
+    Parameters
+    ----------
+    item : RssItem
+        Feed item
+
+    Returns
+    -------
+    str or None
+        Key of the item or None if it has neither guid nor link
+    """
+    for name in ('guid', 'link'):
+        element = getattr(item, name, None)
+        if element is not None and element.assigned:
+            value = element._attrs[element.content_name].value
+            if value is not None:
+                return six.text_type(value)
+    return None
+
+
+class BloomFilter(object):
+    """
+    Bloom filter of key digests
+    """
+
+    _header = struct.Struct('<QQ16s')  # size, hashes, token of the saved filter
+
+    def __init__(self, size, hashes=7):
+        """
+        Parameters
+        ----------
+        size : int
+            Number of bits
+        hashes : int
+            Number of hash functions
+        """
+        self.size = size
+        self.hashes = hashes
+        self.bits = bytearray((size + 7) // 8)
+
+    def _positions(self, digest):
+        h1, h2 = struct.unpack('<QQ', digest)
+        size = self.size
+        return [(h1 + i * h2) % size for i in range(self.hashes)]
+
+    def add(self, digest):
+        bits = self.bits
+        for position in self._positions(digest):
+            bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, digest):
+        bits = self.bits
+        for position in self._positions(digest):
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+    def save(self, path, token):
+        """
+        Save the filter to the file atomically
+
+        Parameters
+        ----------
+        path : str
+            Path to the file
+        token : bytes
+            16-byte token that identifies the saved state
+        """
+        temp_path = path + '.tmp'
+        with open(temp_path, 'wb') as file:
+            file.write(self._header.pack(self.size, self.hashes, token))
+            file.write(self.bits)
+        _replace_file(temp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load the filter from the file that's written by method save
+
+        Parameters
+        ----------
+        path : str
+            Path to the file
+
+        Returns
+        -------
+        (BloomFilter, bytes) or (None, None)
+            Filter and its token or pair of None if the file doesn't exist or it's malformed
+        """
+        try:
+            with open(path, 'rb') as file:
+                header = file.read(cls._header.size)
+                if len(header) != cls._header.size:
+                    return None, None
+                size, hashes, token = cls._header.unpack(header)
+                bloom = cls(size, hashes)
+                if file.readinto(bloom.bits) != len(bloom.bits):
+                    return None, None
+        except (IOError, OSError):
+            return None, None
+        return bloom, token
+
+
+class SeenKeysIndex(object):
+    """
+    Index of keys of already exported items.
+
+    Keys are stored as 16-byte digests in the SQLite database
+    with Bloom filter in front of it, so lookups of new keys don't touch the disk
+    and the index is not loaded into memory. Without the database path keys are kept in memory set.
+
+    The Bloom filter is saved next to the database on close and loaded on the next start.
+    If the saved filter is absent, stale (e.g. after a crash) or too small for the number of keys,
+    it's rebuilt by a full scan of the database that reads all stored digests.
+    """
+
+    bits_per_key = 20  # bits of the automatically sized Bloom filter per key, it's enough for doubling of keys
+    min_bloom_size = 1 << 23
+
+    def __init__(self, path=None, bloom_size=None, commit_every=10000):
+        """
+        Parameters
+        ----------
+        path : str or None
+            Path to the SQLite database, None means in-memory index of the current process only
+        bloom_size : int or None
+            Number of bits of Bloom filter, None means the size that's chosen by the number of stored keys
+        commit_every : int
+            Number of added keys between commits
+        """
+        self.path = path
+        self.bloom_path = path + '.bloom' if path is not None else None
+        self.commit_every = commit_every
+        self._uncommitted = 0
+        if path is None:
+            self._db = None
+            self._keys = set()
+            return
+        self._db = sqlite3.connect(path)
+        self._db.execute('CREATE TABLE IF NOT EXISTS seen_keys (digest BLOB PRIMARY KEY) WITHOUT ROWID')
+        self._db.execute('CREATE TABLE IF NOT EXISTS seen_keys_meta (name TEXT PRIMARY KEY, value)')
+        self.count = self._get_meta('count')
+        if self.count is None:
+            self.count = self._db.execute('SELECT COUNT(*) FROM seen_keys').fetchone()[0]
+        bloom, token = BloomFilter.load(self.bloom_path)
+        db_token = self._get_meta('bloom_token')
+        if (bloom is None or db_token is None or token != bytes(db_token)
+                or (bloom_size is not None and bloom.size != bloom_size)
+                or (bloom_size is None and bloom.size < self.bits_per_key * self.count // 2)):
+            bloom = BloomFilter(bloom_size or max(self.min_bloom_size, self.bits_per_key * self.count))
+            self.count = 0  # the stored count is stale after a crash too
+            for digest, in self._db.execute('SELECT digest FROM seen_keys'):
+                bloom.add(bytes(digest))
+                self.count += 1
+        self._bloom = bloom
+        # the saved filter becomes stale with added keys until it's saved again on close
+        self._set_meta('bloom_token', None)
+        self._db.commit()
+
+    def _get_meta(self, name):
+        row = self._db.execute('SELECT value FROM seen_keys_meta WHERE name = ?', (name,)).fetchone()
+        return row[0] if row is not None else None
+
+    def _set_meta(self, name, value):
+        self._db.execute('INSERT OR REPLACE INTO seen_keys_meta (name, value) VALUES (?, ?)', (name, value))
+
+    @staticmethod
+    def _digest(key):
+        return hashlib.md5(key.encode('utf-8')).digest()
+
+    def __contains__(self, key):
+        digest = self._digest(key)
+        if self._db is None:
+            return digest in self._keys
+        if digest not in self._bloom:
+            return False
+        return self._db.execute('SELECT 1 FROM seen_keys WHERE digest = ?',
+                                (sqlite3.Binary(digest),)).fetchone() is not None
+
+    def add(self, key):
+        """
+        Add the key of the exported item
+        """
+        digest = self._digest(key)
+        if self._db is None:
+            self._keys.add(digest)
+            return
+        self._bloom.add(digest)
+        cursor = self._db.execute('INSERT OR IGNORE INTO seen_keys (digest) VALUES (?)', (sqlite3.Binary(digest),))
+        self.count += cursor.rowcount
+        self._uncommitted += 1
+        if self._uncommitted >= self.commit_every:
+            self._commit()
+
+    def _commit(self):
+        self._set_meta('count', self.count)
+        self._db.commit()
+        self._uncommitted = 0
+
+    def close(self):
+        """
+        Commit added keys and save the Bloom filter
+        """
+        if self._db is not None:
+            try:
+                self._commit()
+                token = os.urandom(16)
+                self._bloom.save(self.bloom_path, token)
+                self._set_meta('bloom_token', sqlite3.Binary(token))
+                self._db.commit()
+            finally:
+                self._db.close()
+                self._db = None
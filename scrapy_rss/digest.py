@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+
+import hashlib
+import io
+import json
+import os
+import re
+from email.utils import formatdate
+
+import six
+
+
+FEED_HEAD_SEARCH_SIZE = 65536
+
+_replace_file = getattr(os, 'replace', os.rename)
+
+
+def get_metadata_path(path):
+    """
+    Get path to the sidecar file with metadata of the feed file
+
+    Parameters
+    ----------
+    path : str
+        Path to the feed file
+
+    Returns
+    -------
+    str
+    """
+    return path + '.meta.json'
+
+
+def get_temp_path(path):
+    """
+    Get path to the temporary feed file that keeps extension of the feed file,
+    so the compression chosen by the extension is the same
+
+    Parameters
+    ----------
+    path : str
+        Path to the feed file
+
+    Returns
+    -------
+    str
+    """
+    root, ext = os.path.splitext(path)
+    return root + '.tmp' + ext
+
+
+def read_metadata(path):
+    """
+    Read metadata of the feed file from its sidecar file
+
+    Parameters
+    ----------
+    path : str
+        Path to the feed file
+
+    Returns
+    -------
+    dict
+        Metadata with 'digest', 'etag', 'last_modified' and 'size' keys,
+        empty dict if the sidecar file doesn't exist or it's malformed
+    """
+    try:
+        with io.open(get_metadata_path(path), 'r', encoding='utf-8') as file:
+            metadata = json.load(file)
+    except (IOError, OSError, ValueError):
+        return {}
+    return metadata if isinstance(metadata, dict) else {}
+
+
+def write_metadata(path, digest):
+    """
+    Write metadata of the feed file to its sidecar file atomically.
+    ETag and Last-Modified values are intended for the web server that serves the feed
+
+    Parameters
+    ----------
+    path : str
+        Path to the feed file
+    digest : str
+        Hex digest of the feed content
+    """
+    metadata = {
+        'digest': digest,
+        'etag': '"{}"'.format(digest[:32]),
+        'last_modified': formatdate(os.path.getmtime(path), usegmt=True),
+        'size': os.path.getsize(path),
+    }
+    metadata_path = get_metadata_path(path)
+    temp_path = metadata_path + '.tmp'
+    with io.open(temp_path, 'w', encoding='utf-8') as file:
+        file.write(six.text_type(json.dumps(metadata, indent=2, sort_keys=True)))
+    _replace_file(temp_path, metadata_path)
+
+
+class DigestFeedFile(object):
+    """
+    Binary file-like object of the feed that's written to a temporary file and computes a streaming digest
+    of the written markup excluding lastBuildDate element of the channel.
+
+    On finish the temporary file replaces the feed file only if the digest differs from the digest
+    of the previous feed that's stored in the sidecar file, otherwise the feed file is left untouched.
+    """
+
+    def __init__(self, path, open_file, encoding='utf-8'):
+        """
+        Parameters
+        ----------
+        path : str
+            Path to the feed file
+        open_file : callable
+            Function that opens binary file by its path for writing
+        encoding : str
+            Encoding of the feed
+        """
+        self.path = path
+        self.temp_path = get_temp_path(path)
+        self.file = open_file(self.temp_path)
+        self.changed = None
+        self._digest = hashlib.sha256()
+        self._head = b''  # written markup before lastBuildDate of the channel is found
+        self._last_build_date = re.compile(re.escape(u'<lastBuildDate>'.encode(encoding)) + b'[^<]*'
+                                           + re.escape(u'</lastBuildDate>'.encode(encoding)))
+        self._item_start = u'<item'.encode(encoding)
+
+    @property
+    def name(self):
+        return self.path
+
+    @property
+    def closed(self):
+        return self.file is None
+
+    def _update_head(self, data=b'', final=False):
+        self._head += data
+        items_offset = self._head.find(self._item_start)
+        head = self._head if items_offset < 0 else self._head[:items_offset]
+        match = self._last_build_date.search(head)
+        if match is not None:
+            self._digest.update(self._head[:match.start()])
+            self._digest.update(self._head[match.end():])
+        elif final or items_offset >= 0 or len(self._head) > FEED_HEAD_SEARCH_SIZE:
+            self._digest.update(self._head)
+        else:
+            return
+        self._head = None
+
+    def write(self, data):
+        if self._head is not None:
+            self._update_head(bytes(data))
+        else:
+            self._digest.update(data)
+        return self.file.write(data)
+
+    def flush(self):
+        self.file.flush()
+
+    def fileno(self):
+        return self.file.fileno()
+
+    def tell(self):
+        return self.file.tell()
+
+    def hexdigest(self):
+        """
+        Get hex digest of the written markup excluding lastBuildDate element of the channel
+        """
+        if self._head is not None:
+            self._update_head(final=True)
+        return self._digest.hexdigest()
+
+    def finish(self):
+        """
+        Close the temporary file and replace the feed file by it if the feed is changed,
+        otherwise remove the temporary file
+
+        Returns
+        -------
+        bool
+            Whether the feed file is replaced
+        """
+        file, self.file = self.file, None
+        try:
+            file.close()
+            digest = self.hexdigest()
+            self.changed = not (os.path.isfile(self.path) and read_metadata(self.path).get('digest') == digest)
+            if self.changed:
+                _replace_file(self.temp_path, self.path)
+                write_metadata(self.path, digest)
+        finally:
+            if os.path.exists(self.temp_path):
+                os.remove(self.temp_path)
+        return self.changed
+
+    def close(self):
+        """
+        Close and remove the temporary file if the feed is not finished
+        """
+        if self.file is not None:
+            file, self.file = self.file, None
+            try:
+                file.close()
+            finally:
+                if os.path.exists(self.temp_path):
+                    os.remove(self.temp_path)
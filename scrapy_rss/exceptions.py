@@ -43,6 +43,12 @@ class InvalidFeedItemError(ValueError):
     pass
 
 
+class ReleasedItemError(RuntimeError):
+    """
+    Item is used after its release to the items pool
+    """
+
+
 class InvalidComponentError(ValueError):
     def __init__(self, component, name=None, msg=None):
         """
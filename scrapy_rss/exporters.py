@@ -1,8 +1,9 @@
 # -*- coding: utf-8 -*-
 
+import pickle
+from io import BytesIO
 from itertools import chain
-from collections import Counter
-from operator import itemgetter
+from collections import Counter, deque
 
 from datetime import datetime
 import scrapy
@@ -13,10 +14,49 @@ from .rss.channel import ChannelElement
 from .rss.old.items import RssItem as OldRssItem
 from .exceptions import *
 from .utils import get_tzlocal, is_strict_subclass, get_full_class_name, deprecated_class
+from .writers import XmlWriter, get_xml_writer_cls
 from . import meta
 
+try:
+    from concurrent.futures import ProcessPoolExecutor
+except ImportError:
+    ProcessPoolExecutor = None
+
+
+def create_process_pool(workers):
+    """
+    Create pool of worker processes for parallel serialization of items that can be shared by exporters.
+    Worker processes are started by forkserver or spawn start methods
+    since forking of the process that runs threads (e.g. the export thread of the pipeline) is not safe
+
+    Parameters
+    ----------
+    workers : int
+        Number of worker processes
+
+    Returns
+    -------
+    concurrent.futures.ProcessPoolExecutor
+    """
+    if ProcessPoolExecutor is None:
+        raise ImportError('concurrent.futures is required for parallel serialization')
+    try:
+        import multiprocessing
+        start_method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+        return ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context(start_method))
+    except (AttributeError, TypeError):  # start methods are not supported by Python < 3.7
+        return ProcessPoolExecutor(workers)
+
 
 class FeedItemExporter(XmlItemExporter):
+    # serialized channel children {(exporter class, writer class, encoding, namespaces, channel fingerprint):
+    #                              markup parts}
+    _channel_markup_cache = {}
+    _channel_markup_cache_size = 64
+    # declared namespaces and content scopes of elements {(scope, namespaces, attrs namespaces): mappings}
+    _prefix_mappings_cache = {}
+    _prefix_mappings_cache_size = 4096
+
     def __init__(self, file, channel_title, channel_link, channel_description,
                  namespaces=None, item_cls=None,
                  language=None, copyright=None, managing_editor=None, webmaster=None,
@@ -24,6 +64,7 @@ class FeedItemExporter(XmlItemExporter):
                  generator='Scrapy {}'.format(scrapy.__version__),
                  docs=None, cloud=None, ttl=None, image=None, rating=None, text_input=None,
                  skip_hours=None, skip_days=None,
+                 hoist_namespaces=False, xml_writer=None, workers=None, worker_batch_size=64, executor=None,
                  **kwargs):
         """
         RSS parameters semantics: https://validator.w3.org/feed/docs/rss2.html
@@ -34,6 +75,23 @@ class FeedItemExporter(XmlItemExporter):
             predefined XML namespaces {prefix: URI, ...} or [(prefix, URI), ...]
         item_cls : type
             main class of RSS items (default: RssItem)
+        hoist_namespaces : bool
+            whether declare in the root element namespaces of all element classes
+            that are reachable from the item class including base classes of multiple elements,
+            so only conflicting namespaces are declared in items
+        xml_writer : str or type or None
+            XML writer backend: 'native' (default) writes escaped markup directly in large batches,
+            'sax' uses SAX XMLGenerator. Path to a writer class or the class itself are also allowed
+        workers : int or None
+            number of worker processes that serialize items in parallel,
+            serialized items are written in the order of their export.
+            Items and the exporter must be picklable. None or 1 means serialization in the current process
+        worker_batch_size : int
+            number of items that are serialized by a worker process at once
+        executor : concurrent.futures.Executor or None
+            pool of worker processes that's shared by exporters (see create_process_pool),
+            it's not shut down by the exporter. None means the pool that's created by the exporter
+            when exporting is started if workers are used
 
         Item fields that corresponds to RSS element with attributes or sub-elements,
         must be a dictionary-like such as
@@ -48,6 +106,7 @@ class FeedItemExporter(XmlItemExporter):
         kwargs['root_element'] = 'rss'
         kwargs['item_element'] = 'item'
         super(FeedItemExporter, self).__init__(file, **kwargs)
+        self.xg = get_xml_writer_cls(xml_writer)(file, encoding=self.encoding)
 
         self.channel_element_name = 'channel'
         self.channel = ChannelElement()
@@ -79,13 +138,17 @@ class FeedItemExporter(XmlItemExporter):
             raise ValueError('Item class must be strict subclass of FeedItem')
         self._item_cls = item_cls
         self._allowed_item_classes = tuple({RssItem, OldRssItem, self._item_cls})
+        self._feed_item_classes = set()  # classes of items that are checked by isinstance already
 
         if not namespaces:
             namespaces = {}
         elif isinstance(namespaces, (list, tuple)):
             namespaces = dict(namespaces)
         namespaces_iter = namespaces.items() if isinstance(namespaces, dict) else namespaces
-        item_cls_namespaces = item_cls().get_namespaces(False, attrs_only=False)
+        if hoist_namespaces:
+            item_cls_namespaces = self._get_reachable_namespaces(item_cls())
+        else:
+            item_cls_namespaces = item_cls().get_namespaces(False, attrs_only=False)
         self._namespaces = {}
         skipped_ns_prefixes = set()
         for ns_prefix, ns_uri in chain(namespaces_iter, item_cls_namespaces):
@@ -96,12 +159,55 @@ class FeedItemExporter(XmlItemExporter):
                 skipped_ns_prefixes.add(ns_prefix)
             else:
                 self._namespaces[ns_prefix] = ns_uri
-        self._started_ns_counter = Counter()
+        self._root_namespaces = self._namespaces  # namespaces that are declared by the root element
+        self._ns_scope = frozenset()  # namespaces that are declared by the current element and its ancestors
 
+        self._workers = workers if workers and workers > 1 else None
+        if self._workers:
+            if ProcessPoolExecutor is None:
+                raise ImportError('concurrent.futures is required for parallel serialization')
+            if not isinstance(self.xg, XmlWriter):
+                raise ValueError('Parallel serialization requires the native XML writer')
+        self._worker_batch_size = worker_batch_size
+        self._shared_executor = executor
+        self._executor = None
+        self._worker_state = None  # pickled exporter that serializes items in worker processes
+        self._batch = []
+        self._fragments = deque()
+
+    @classmethod
+    def _get_reachable_namespaces(cls, element, visited_classes=None):
+        """
+        Get namespaces of the element and all its children elements
+        including elements of base classes of multiple elements
+
+        Parameters
+        ----------
+        element : Element
+        visited_classes : set of type or None
+            Base classes of multiple elements that are already scanned
+
+        Returns
+        -------
+        set of (str or None, str or None)
+            Set of pairs (namespace_prefix, namespace_uri)
+        """
+        if visited_classes is None:
+            visited_classes = set()
+        namespaces = element.get_namespaces(False, attrs_only=True)
+        for child in element._children.values():
+            if isinstance(child, meta.MultipleElements):
+                namespaces.update(child.get_namespaces(False))
+                if child.base_element_cls not in visited_classes:
+                    visited_classes.add(child.base_element_cls)
+                    namespaces.update(cls._get_reachable_namespaces(child.base_element_cls(), visited_classes))
+            else:
+                namespaces.update(cls._get_reachable_namespaces(child, visited_classes))
+        return namespaces
 
     def _export_xml_element(self, element, xml_name=None, attrs_only_namespaces=True):
         """
-        Export the element as an XML element
+        Validate the element and export it as an XML element
 
         Parameters
         ----------
@@ -112,21 +218,61 @@ class FeedItemExporter(XmlItemExporter):
         attrs_only_namespaces : bool
             Whether extract namespaces from attributes and itself only
         """
+        self._validate_xml_element(element, xml_name)
+        self._serialize_xml_element(element, xml_name, attrs_only_namespaces)
+
+    @staticmethod
+    def _validate_xml_element(element, xml_name=None):
+        """
+        Validate the element before its export
+
+        Parameters
+        ----------
+        element : Element
+        xml_name : (str or None, str) or None
+            Name of the base XML element in the format **(ns_uri, name)**
+        """
         if not isinstance(element, meta.Element):
             raise ValueError('Argument element must be instance of <Element>, not <{}>'
                              .format(element.__class__.__name__ if hasattr(element, '__class__')
                                      else repr(element)))
 
+        element_instances = element if isinstance(element, meta.MultipleElements) else (element,)
+        for instance in element_instances:
+            try:
+                instance.validate(xml_name[1] if xml_name else None)
+            except InvalidComponentError as e:
+                raise InvalidFeedItemComponentsError(instance, msg=str(e))
+
+    def _serialize_xml_element(self, element, xml_name=None, attrs_only_namespaces=True):
+        """
+        Export the already validated element as an XML element
+        using serialization plan of the element class
+
+        Parameters
+        ----------
+        element : Element
+        xml_name : (str or None, str) or None
+            Name of the base XML element in the format **(ns_uri, name)**.
+            If it's None then export children XML elements only without parent element
+        attrs_only_namespaces : bool
+            Whether extract namespaces from attributes and itself only
+        """
         if xml_name:
-            namespaces = element.get_namespaces(attrs_only=attrs_only_namespaces)
-            attrs_namespaces = element.get_namespaces(attrs_only=True)
-            new_namespaces = namespaces - set(self._started_ns_counter)
-            count_prefixes = Counter(map(itemgetter(0), new_namespaces))
-            # ignore multiple namespaces with the same prefix
-            new_namespaces = {ns for ns in namespaces
-                              if count_prefixes[ns[0]] == 1
-                              or ns in attrs_namespaces and ns not in self._started_ns_counter}
-            self._started_ns_counter.update(new_namespaces)
+            scope = self._ns_scope
+            new_namespaces = ()
+            if (attrs_only_namespaces and not element._attrs_namespaces
+                    and not isinstance(element, meta.MultipleElements)):
+                # namespace of the element itself, most elements don't have it
+                if element._ns_uri:
+                    namespaces = ((element._ns_prefix, element._ns_uri),)
+                    new_namespaces, self._ns_scope = self._get_prefix_mappings(namespaces, namespaces)
+            else:
+                namespaces = frozenset(element.get_namespaces(attrs_only=attrs_only_namespaces))
+                if namespaces:
+                    attrs_namespaces = (namespaces if attrs_only_namespaces
+                                        else frozenset(element.get_namespaces(attrs_only=True)))
+                    new_namespaces, self._ns_scope = self._get_prefix_mappings(namespaces, attrs_namespaces)
             qname = '{}:{}'.format(element.ns_prefix, xml_name[1]) if element.ns_prefix else xml_name
 
             for ns_prefix, ns_uri in new_namespaces:
@@ -134,61 +280,378 @@ class FeedItemExporter(XmlItemExporter):
 
         element_instances = element if isinstance(element, meta.MultipleElements) else (element,)
         for instance in element_instances:
-            try:
-                instance.validate(xml_name[1] if xml_name else None)
-            except InvalidComponentError as e:
-                raise InvalidFeedItemComponentsError(instance, msg=str(e))
+            attrs_plan, content_name, children_plan = instance._serialization_plan
+            instance_attrs = instance._attrs
+            attrs = {}
+            for attr_name, attr_xml_name in attrs_plan:
+                attr = instance_attrs[attr_name]
+                if attr.value is not None:
+                    attrs[attr_xml_name] = attr.serializer(attr.value)
+            content = None
+            if content_name:
+                attr = instance_attrs[content_name]
+                if attr.value is not None:
+                    content = attr.serializer(attr.value)
 
-            attrs = instance.serialize_attrs()
-            content = attrs.pop(instance.content_name.xml_name, None) if instance.content_name else None
             if xml_name:
                 self.xg.startElementNS(xml_name, qname, attrs)
             if content:
                 self.xg.characters(content)
-            for child_name, child in instance.children.items():
+            instance_children = instance._children
+            for child_name, child_xml_name in children_plan:
+                child = instance_children[child_name]
                 if child.assigned:
-                    self._export_xml_element(child, child_name.xml_name)
+                    self._serialize_xml_element(child, child_xml_name)
             if xml_name:
                 self.xg.endElementNS(xml_name, qname)
 
         if xml_name:
             for ns_prefix, ns_uri in new_namespaces:
                 self.xg.endPrefixMapping(ns_prefix)
-            self._started_ns_counter -= Counter(new_namespaces)
+            self._ns_scope = scope
+
+    def _get_prefix_mappings(self, namespaces, attrs_namespaces):
+        """
+        Get namespaces that are declared by the element in the current namespace scope.
+        Results are cached by the scope and namespaces of the element,
+        so prefix mappings of elements are computed once per distinct combination
+
+        Parameters
+        ----------
+        namespaces : frozenset or tuple of (str or None, str)
+            Namespaces of the element and its content
+        attrs_namespaces : frozenset or tuple of (str or None, str)
+            Namespaces of the element and its attributes only
 
+        Returns
+        -------
+        (tuple of (str or None, str), frozenset of (str or None, str))
+            Declared namespaces in the stable order and the namespace scope of the element content
+        """
+        key = (self._ns_scope, namespaces, attrs_namespaces)
+        try:
+            return self._prefix_mappings_cache[key]
+        except KeyError:
+            pass
+        scope = self._ns_scope
+        count_prefixes = Counter(ns_prefix for ns_prefix, ns_uri in namespaces if (ns_prefix, ns_uri) not in scope)
+        # ignore multiple namespaces with the same prefix
+        new_namespaces = tuple(sorted({ns for ns in namespaces
+                                       if count_prefixes[ns[0]] == 1
+                                       or ns in attrs_namespaces and ns not in scope},
+                                      key=lambda ns: (ns[0] or '', ns[1])))
+        if len(self._prefix_mappings_cache) >= self._prefix_mappings_cache_size:
+            self._prefix_mappings_cache.clear()
+        mappings = self._prefix_mappings_cache[key] = (new_namespaces, scope.union(new_namespaces))
+        return mappings
 
     def start_exporting(self):
         self.xg.startDocument()
 
         for ns_prefix, ns_uri in self._namespaces.items():
             self.xg.startPrefixMapping(ns_prefix, ns_uri)
-        self._started_ns_counter.update(self._namespaces.items())
+        self._ns_scope = frozenset(self._namespaces.items())
 
         root_attrs = {(None, 'version'): '2.0'}
         self.xg.startElementNS((None, self.root_element), self.root_element, root_attrs)
         self.xg.startElement(self.channel_element_name, {})
-        self._export_xml_element(self.channel)
+        self._export_channel()
+        self._start_workers()
 
-    def export_item(self, item):
-        if (not isinstance(item, self._allowed_item_classes)
-                and not isinstance(getattr(item, 'rss', None), RssItem)):
+    def start_appending(self, declared_namespaces):
+        """
+        Start exporting of items that are appended to the channel of the existing feed.
+        The output file must be positioned at the closing tag of the channel.
+        The native XML writer is required
+
+        Parameters
+        ----------
+        declared_namespaces : dict
+            Namespaces {prefix: URI} that are declared by the root element of the existing feed.
+            Namespaces of the exporter that are not declared the same way are declared by items
+        """
+        if not isinstance(self.xg, XmlWriter):
+            raise ValueError('Appending to the feed requires the native XML writer')
+        self._root_namespaces = {ns_prefix: ns_uri for ns_prefix, ns_uri in self._namespaces.items()
+                                 if declared_namespaces.get(ns_prefix or None) == ns_uri}
+        for ns_prefix, ns_uri in self._root_namespaces.items():
+            self.xg.map_declared_prefix(ns_prefix, ns_uri)
+        self._ns_scope = frozenset(self._root_namespaces.items())
+        self._start_workers()
+
+    def _start_workers(self):
+        if self._workers:
+            self._worker_state = pickle.dumps(self, pickle.HIGHEST_PROTOCOL)
+            self._executor = self._shared_executor or create_process_pool(self._workers)
+
+    def __getstate__(self):
+        """
+        Get state of the exporter that's passed to worker processes without its output, channel and workers
+        """
+        state = self.__dict__.copy()
+        for name in ('xg', 'channel', '_shared_executor', '_executor', '_worker_state', '_batch', '_fragments'):
+            state.pop(name, None)
+        return state
+
+    def _export_channel(self):
+        """
+        Export children of the channel element.
+        Serialized markup is cached for the writers that support raw markup writing,
+        so the same channel is validated and serialized once.
+        The lastBuildDate element is the only element that's rendered every time
+        """
+        if not isinstance(self.xg, XmlWriter) or not isinstance(self.channel, ChannelElement):
+            self._export_xml_element(self.channel)
+            return
+
+        last_build_date = self.channel.lastBuildDate
+        cache_key = (self.__class__, self.xg.__class__, self.encoding, tuple(sorted(self._namespaces.items(), key=str)),
+                     self._get_element_fingerprint(self.channel, skipped_element=last_build_date))
+        markup_parts = self._channel_markup_cache.get(cache_key)
+        if markup_parts is None:
+            self.xg.start_capture()
+            self._export_xml_element(self.channel)
+            markup = self.xg.stop_capture()
+            if last_build_date.assigned:
+                head, separator, tail = markup.partition(self._get_last_build_date_markup(last_build_date))
+                if not separator:
+                    return
+                markup_parts = (head, tail)
+            else:
+                markup_parts = (markup,)
+            if len(self._channel_markup_cache) >= self._channel_markup_cache_size:
+                self._channel_markup_cache.clear()
+            self._channel_markup_cache[cache_key] = markup_parts
+        elif len(markup_parts) > 1:
+            if not last_build_date.assigned:
+                raise InvalidFeedItemComponentsError(self.channel, msg='lastBuildDate must be assigned')
+            self.xg.write_raw(markup_parts[0])
+            self.xg.write_raw(self._get_last_build_date_markup(last_build_date))
+            self.xg.write_raw(markup_parts[1])
+        else:
+            self.xg.write_raw(markup_parts[0])
+
+    @staticmethod
+    def _get_last_build_date_markup(last_build_date):
+        attr = last_build_date._attrs[last_build_date.content_name]
+        return u'<lastBuildDate>{}</lastBuildDate>'.format(XmlWriter._escape(attr.serializer(attr.value)))
+
+    @classmethod
+    def _get_element_fingerprint(cls, element, skipped_element=None):
+        """
+        Get hashable fingerprint of the element content
+
+        Parameters
+        ----------
+        element : Element
+        skipped_element : Element or None
+            Child element whose content is not included into the fingerprint
+
+        Returns
+        -------
+        tuple
+        """
+        if isinstance(element, meta.MultipleElements):
+            return (element.__class__, element.ns_prefix, element.ns_uri,
+                    tuple(cls._get_element_fingerprint(elem) for elem in element))
+        return (element.__class__, element.ns_prefix, element.ns_uri,
+                tuple((attr_name, repr(attr.value), attr.serializer)
+                      for attr_name, attr in element._attrs.items()),
+                tuple(cls._get_element_fingerprint(child) if child is not skipped_element else None
+                      for child in element._children.values()))
+
+    def _get_feed_item(self, item):
+        """
+        Get the feed item that's exported for the item
+
+        Parameters
+        ----------
+        item : RssItem or scrapy.Item
+            Feed item or item with 'rss' field
+
+        Returns
+        -------
+        RssItem
+            Feed item itself or value of its 'rss' field
+        """
+        if item.__class__ in self._feed_item_classes:
+            return item
+        if isinstance(item, self._allowed_item_classes):
+            self._feed_item_classes.add(item.__class__)
+            return item
+        feed_item = getattr(item, 'rss', None)
+        if not isinstance(feed_item, RssItem):
             raise InvalidFeedItemError("Item must be type {} or have 'rss' field of type 'RssItem'"
                                        .format(', '.join(map(repr, map(get_full_class_name, self._allowed_item_classes)))))
-        if not isinstance(item, self._allowed_item_classes):
-            item = item.rss
+        return feed_item
 
-        self._export_xml_element(item, (None, self.item_element), attrs_only_namespaces=False)
+    def validate_item(self, item):
+        """
+        Validate the item without its export
+
+        Parameters
+        ----------
+        item : RssItem or scrapy.Item
+            Feed item or item with 'rss' field
 
+        Returns
+        -------
+        RssItem
+            Validated feed item that can be passed to export_validated_item method
+        """
+        item = self._get_feed_item(item)
+        self._validate_xml_element(item, (None, self.item_element))
+        return item
+
+    def export_validated_item(self, item):
+        """
+        Export the feed item that's already returned by validate_item method
+
+        Parameters
+        ----------
+        item : RssItem
+            Validated feed item
+        """
+        if self._executor is None:
+            self._serialize_xml_element(item, (None, self.item_element), attrs_only_namespaces=False)
+            return
+        self._batch.append((item.__class__, item.snapshot()))
+        if len(self._batch) >= self._worker_batch_size:
+            self._submit_batch()
+
+    def _submit_batch(self):
+        """
+        Submit batched items to the worker processes
+        and write already serialized fragments in the submission order
+        """
+        self._fragments.append(self._executor.submit(_serialize_items_fragment, self._worker_state, self._batch))
+        self._batch = []
+        while self._fragments and (self._fragments[0].done() or len(self._fragments) > 2 * self._workers):
+            self._write_fragment(self._fragments.popleft().result())
+
+    def _write_fragment(self, fragment):
+        self.xg.write_raw(fragment)
+        self.xg.flush()
+
+    def export_item(self, item):
+        self.export_validated_item(self.validate_item(item))
+
+    def flush(self):
+        """
+        Write markup that's buffered by the XML writer to the file.
+        Items that are serialized by worker processes are written when their batches are done
+        """
+        flush = getattr(self.xg, 'flush', None)
+        if flush is not None:
+            flush()
+
+    def export_items(self, items, batch_size=1000):
+        """
+        Export multiple items in batches.
+        All items of a batch are validated before the export of the batch,
+        so the batch with an invalid item is not exported at all
+        but the previous batches are already exported.
+
+        Parameters
+        ----------
+        items : iterable of (RssItem or scrapy.Item)
+            Feed items or items with 'rss' field
+        batch_size : int
+            Number of items that are validated and exported at once
+
+        Returns
+        -------
+        int
+            Number of exported items
+        """
+        xml_name = (None, self.item_element)
+        get_feed_item = self._get_feed_item
+        validate = self._validate_xml_element
+        count = 0
+        batch = []
+        for item in items:
+            item = get_feed_item(item)
+            validate(item, xml_name)
+            batch.append(item)
+            if len(batch) >= batch_size:
+                self._export_validated_batch(batch)
+                count += len(batch)
+                batch = []
+        if batch:
+            self._export_validated_batch(batch)
+            count += len(batch)
+        return count
+
+    def _export_validated_batch(self, items):
+        if self._executor is not None:
+            for item in items:
+                self.export_validated_item(item)
+            return
+        serialize = self._serialize_xml_element
+        xml_name = (None, self.item_element)
+        for item in items:
+            serialize(item, xml_name, attrs_only_namespaces=False)
 
     def finish_exporting(self):
+        if self._executor is not None:
+            try:
+                if self._batch:
+                    self._submit_batch()
+                while self._fragments:
+                    self._write_fragment(self._fragments.popleft().result())
+            finally:
+                if self._executor is not self._shared_executor:
+                    self._executor.shutdown()
+                self._executor = None
         self.xg.endElement(self.channel_element_name)
         self.xg.endElementNS((None, self.root_element), self.root_element)
-        for ns_prefix, ns_uri in self._namespaces.items():
+        for ns_prefix, ns_uri in self._root_namespaces.items():
             self.xg.endPrefixMapping(ns_prefix)
-        self._started_ns_counter -= Counter(self._namespaces.items())
+        self._ns_scope = frozenset()
         self.xg.endDocument()
 
 
+_worker_exporters = {}  # {pickled exporter: exporter} in worker processes
+_worker_exporters_size = 16
+
+
+def _serialize_items_fragment(exporter_state, items):
+    """
+    Serialize validated feed items in a worker process
+
+    Parameters
+    ----------
+    exporter_state : bytes
+        Pickled exporter whose exporting is started
+    items : list of (type, tuple)
+        Classes and snapshots of validated feed items
+
+    Returns
+    -------
+    str
+        Markup of the items
+    """
+    exporter = _worker_exporters.get(exporter_state)
+    if exporter is None:
+        if len(_worker_exporters) >= _worker_exporters_size:
+            _worker_exporters.clear()
+        exporter = _worker_exporters[exporter_state] = pickle.loads(exporter_state)
+    # the namespace scope and the writer are reset for each batch, so a failed batch doesn't affect next batches
+    exporter._ns_scope = frozenset(exporter._root_namespaces.items())
+    exporter.xg = XmlWriter(BytesIO(), encoding=exporter.encoding)
+    for ns_prefix, ns_uri in exporter._root_namespaces.items():
+        exporter.xg.map_declared_prefix(ns_prefix, ns_uri)
+    exporter.xg.start_capture()
+    try:
+        for item_cls, snapshot in items:
+            exporter._serialize_xml_element(item_cls.from_snapshot(snapshot), (None, exporter.item_element),
+                                            attrs_only_namespaces=False)
+    except Exception:
+        del _worker_exporters[exporter_state]
+        raise
+    return exporter.xg.stop_capture()
+
+
 @deprecated_class('Use FeedItemExporter instead')
 class RssItemExporter(FeedItemExporter):
     pass
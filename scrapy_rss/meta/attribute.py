@@ -1,13 +1,16 @@
 # -*- coding: utf-8 -*-
 
 import re
+from copy import deepcopy
 
-from .nscomponent import BaseNSComponent
+from .nscomponent import BaseNSComponent, _get_slots_names
 from ..exceptions import InvalidComponentError
 from ..utils import deprecated_class
 
 
 class ElementAttribute(BaseNSComponent):
+    __slots__ = ('_required', '_is_content', 'serializer', 'value')
+
     def __init__(self, value=None, serializer=str,
                  required=False, is_content=False, **kwargs):
         """
@@ -32,6 +35,17 @@ class ElementAttribute(BaseNSComponent):
         self.serializer = serializer
         self.value = value
 
+    def __deepcopy__(self, memo):
+        cls = self.__class__
+        attr = cls.__new__(cls)
+        memo[id(self)] = attr
+        for name in _get_slots_names(cls):
+            value = getattr(self, name)
+            object.__setattr__(attr, name, deepcopy(value, memo) if name == 'value' else value)
+        if hasattr(self, '__dict__'):
+            attr.__dict__.update(deepcopy(self.__dict__, memo))
+        return attr
+
     @property
     def required(self):
         """
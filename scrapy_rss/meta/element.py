@@ -2,6 +2,7 @@
 
 from copy import deepcopy
 import re
+import weakref
 from itertools import chain
 
 import six
@@ -12,11 +13,48 @@ from ..exceptions import InvalidComponentNameError, InvalidComponentError, Inval
 from ..utils import Mapping, Iterable, object_to_list, deprecated_class, deprecated_func
 
 
+class _SharedComponent(object):
+    """
+    Descriptor of the private name of an attribute or child element (such as **__name**).
+
+    Instances of elements share components with the class (or with the copied element)
+    until the first access to the component by its private name,
+    then the component is copied to the instance.
+    """
+
+    def __init__(self, name):
+        """
+        Parameters
+        ----------
+        name : NSComponentName
+            name of an attribute or child element
+        """
+        self.name = name
+
+    def __get__(self, instance, owner):
+        holder = owner if instance is None else instance
+        components = holder._attrs if self.name in holder._attrs else holder._children
+        component = components[self.name]
+        if instance is None:
+            return component
+        if isinstance(component, Element):
+            component = component._copy_on_write()
+        else:
+            component = deepcopy(component)
+        components[self.name] = component
+        instance.__dict__[self.name.priv_name] = component
+        if isinstance(component, Element):
+            component._parents = (weakref.ref(instance),)
+        return component
+
+
 class ElementMeta(type):
     _blacklisted_comp_names = frozenset((
         '_attrs', 'attrs', '_children', 'children', '_required_attrs', 'required_attrs',
         '_required_children', 'required_children', '_content_name', 'content_name',
-        '_required', 'required', '_assigned', 'assigned', 'base_element_cls'
+        '_required', 'required', '_assigned', 'assigned', 'base_element_cls', '_components_priv_names',
+        '_serialization_plan', '_assigned_children', '_parents', '_attrs_namespaces', '_children_namespaces',
+        '_namespaces_delta', '_snapshot_slots'
     ))
 
     def __new__(mcs, cls_name, cls_bases, cls_attrs):
@@ -30,10 +68,8 @@ class ElementMeta(type):
             if isinstance(cls_base, ElementMeta):
                 cls_attrs['_attrs'].update(cls_base._attrs)
                 cls_attrs['_children'].update(cls_base._children)
-                for comp_name, comp_value in cls_base.__dict__.items():
-                    if (isinstance(comp_value.__class__, ElementMeta)
-                            or isinstance(comp_value, ElementAttribute)):
-                        cls_attrs[comp_name] = comp_value
+                for comp_name in chain(cls_base._attrs, cls_base._children):
+                    cls_attrs[comp_name.priv_name] = _SharedComponent(comp_name)
         elem_attrs = {NSComponentName(attr_name, ns_prefix=attr_descr.ns_prefix, ns_uri=attr_descr.ns_uri):
                       attr_descr for attr_name, attr_descr in cls_attrs.items()
                       if isinstance(attr_descr, ElementAttribute) and not attr_name.startswith('__')}
@@ -53,8 +89,8 @@ class ElementMeta(type):
                 elem.ns_prefix = elem_name.ns_prefix
         cls_attrs['_children'].update(children)
 
-        cls_attrs.update({comp_name.priv_name: comp_descr
-                          for comp_name, comp_descr in chain(elem_attrs.items(), children.items())})
+        cls_attrs.update({comp_name.priv_name: _SharedComponent(comp_name)
+                          for comp_name in chain(elem_attrs, children)})
         cls_attrs.update({comp_name.pub_name:
                           property(_build_component_getter(comp_name),
                                    _build_component_setter(comp_name))
@@ -64,11 +100,11 @@ class ElementMeta(type):
 
     def __init__(cls, cls_name, cls_bases, cls_attrs):
         cls._assigned = False
-        cls.assigned = property(
-            lambda self: self._assigned or any(child.assigned for child in self._children.values())
-        )
-        cls.attrs = property(lambda self: self._attrs) # Attributes dict
-        cls.children = property(lambda self: self._children) # children elements dict
+        # number of assigned children elements, it's maintained by children on their changes
+        cls._assigned_children = sum(1 for child in cls._children.values() if child.assigned)
+        cls.assigned = property(lambda self: self._assigned or self._assigned_children > 0)
+        cls.attrs = property(lambda self: self._get_own_components(self._attrs)) # Attributes dict
+        cls.children = property(lambda self: self._get_own_components(self._children)) # children elements dict
 
         cls._required_attrs = {attr_name
                                for attr_name, attr_descr in cls._attrs.items()
@@ -91,10 +127,39 @@ class ElementMeta(type):
                 (lambda self: self._content_name)
         )
 
+        cls._components_priv_names = frozenset(comp_name.priv_name
+                                               for comp_name in chain(cls._attrs, cls._children))
+
+        # serialization plan: (attributes, content attribute name, children)
+        # where attributes and children are tuples of pairs (component name, XML name)
+        cls._serialization_plan = (
+            tuple((attr_name, attr_name.xml_name)
+                  for attr_name, attr_descr in cls._attrs.items()
+                  if not attr_descr.is_content),
+            cls._content_name,
+            tuple((child_name, child_name.xml_name) for child_name in cls._children),
+        )
+
+        # static namespaces: namespaced attributes as pairs (attribute name, namespace)
+        # and namespaces closure of all children elements.
+        # Namespaces that are changed dynamically (by namespace setters
+        # or inside MultipleElements) are marked by the flag _namespaces_delta
+        cls._attrs_namespaces = tuple((attr_name, (attr_descr.ns_prefix, attr_descr.ns_uri))
+                                      for attr_name, attr_descr in cls._attrs.items()
+                                      if attr_descr.ns_uri)
+        cls._children_namespaces = frozenset(chain.from_iterable(child.get_namespaces(False)
+                                                                 for child in cls._children.values()))
+        cls._namespaces_delta = (getattr(cls, '_namespaces_delta', False)
+                                 or any(child._namespaces_delta for child in cls._children.values()))
+
+        # snapshot slots: pairs (component name, whether it's attribute) in the stable order
+        cls._snapshot_slots = tuple(sorted(chain(((attr_name, True) for attr_name in cls._attrs),
+                                                 ((child_name, False) for child_name in cls._children)),
+                                           key=lambda slot: str(slot[0])))
+
         cls.serialize_attrs = lambda self: {
             attr_name.xml_name: attr.serializer(attr.value)
-            for attr_name in self.attrs
-            for attr in (getattr(self, attr_name.priv_name),)
+            for attr_name, attr in self._attrs.items()
             if attr.assigned
         }
 
@@ -137,20 +202,17 @@ class Element(BaseNSComponent):
     """
 
     _inited = False
+    _parents = ()  # weak references to elements that contain this element as a child
+    # elements keep namespace in the instance dict (not in slots of BaseNSComponent),
+    # so it's copied with other instance fields
+    _ns_prefix = ''
+    _ns_uri = ''
 
     def __new__(cls, *args, **kwargs):
         instance = super(Element, cls).__new__(cls)
-        new_attrs = {}
-        new_children = {}
-        for component_name in chain(instance._attrs, instance._children):
-            new_component = deepcopy(getattr(instance, component_name.priv_name))
-            Element.__setattr__(instance, component_name.priv_name, new_component)
-            if isinstance(new_component, ElementAttribute):
-                new_attrs[component_name] = new_component
-            else:
-                new_children[component_name] = new_component
-        Element.__setattr__(instance, '_attrs', new_attrs)
-        Element.__setattr__(instance, '_children', new_children)
+        # components are shared with the class until the first access (see _SharedComponent)
+        Element.__setattr__(instance, '_attrs', dict(cls._attrs))
+        Element.__setattr__(instance, '_children', dict(cls._children))
         return instance
 
     def __init__(self, *args, **kwargs):
@@ -203,7 +265,7 @@ class Element(BaseNSComponent):
             raise KeyError("Element does not support components: {}. "
                            "Constructor of class '{}' supports only the next named arguments: {}"
                            .format(list(kwargs.keys()), self.__class__.__name__,
-                                   [str(a) for a in chain(self.attrs, self.children)]))
+                                   [str(a) for a in chain(self._attrs, self._children)]))
         self._inited = True
 
     @property
@@ -216,22 +278,32 @@ class Element(BaseNSComponent):
         settings['required'] = self._required
         return settings
 
+    @BaseNSComponent.ns_prefix.setter
+    def ns_prefix(self, ns_prefix):
+        BaseNSComponent.ns_prefix.fset(self, ns_prefix)
+        self._notify_parents_namespaces()
+
+    @BaseNSComponent.ns_uri.setter
+    def ns_uri(self, ns_uri):
+        BaseNSComponent.ns_uri.fset(self, ns_uri)
+        self._notify_parents_namespaces()
+
     def __setattr__(self, key, value):
         if self._inited and not hasattr(self, key):
             raise AttributeError("No attribute {!r}. Supported components: {}"
                                  .format(key,
-                                         ', '.join(map(repr, map(str, chain(self.attrs, self.children))))))
+                                         ', '.join(map(repr, map(str, chain(self._attrs, self._children))))))
         super(Element, self).__setattr__(key, value)
 
     def __repr__(self):
         super_repr = super(Element, self).__repr__()
-        if not hasattr(self, 'attrs') or not hasattr(self, 'children') or not hasattr(self, '_required'):
+        if not hasattr(self, '_attrs') or not hasattr(self, '_children') or not hasattr(self, '_required'):
             return super_repr
         s_match = re.match(r'^[^(]+\((.*?)\)$', super_repr)
         s_repr = s_match.group(1) if s_match else ''
         comps_repr = ", ".join("{}={!r}".format(comp_name, comp)
-                               for comp_name, comp in chain(self.attrs.items(),
-                                                            self.children.items()))
+                               for comp_name, comp in chain(self._attrs.items(),
+                                                            self._children.items()))
         return "{}(required={!r}, {})".format(self.__class__.__name__,
                                               self._required,
                                               ", ".join(filter(None, [comps_repr, s_repr])))
@@ -240,9 +312,9 @@ class Element(BaseNSComponent):
         """
         Clear attributes and all children elements
         """
-        for comp in chain(self.attrs.values(), self.children.values()):
-            comp.clear()
-        self._assigned = False
+        for comp_name in list(chain(self._attrs, self._children)):
+            getattr(self, comp_name.priv_name).clear()
+        self._set_assigned(False)
 
     def validate(self, name=None):
         """
@@ -264,11 +336,210 @@ class Element(BaseNSComponent):
             if self.required:
                 raise InvalidComponentError(self, name, "missing required element")
             return
-        for comp_name, comp in chain(self._attrs.items(), self._children.items()):
+        for comp_name, comp in list(chain(self._attrs.items(), self._children.items())):
+            if isinstance(comp, Element) and comp.assigned:
+                # validation can modify the element, so it must not be shared
+                comp = getattr(self, comp_name.priv_name)
             name_path = object_to_list(name)
             name_path.append(comp_name)
             comp.validate(name_path)
 
+    def _get_own_components(self, components):
+        """
+        Copy shared components to this element
+
+        Parameters
+        ----------
+        components : {NSComponentName : ElementAttribute or Element}
+            Attributes or children elements dict of this element
+
+        Returns
+        -------
+        {NSComponentName : ElementAttribute or Element}
+            The same dict that contains components of this element only
+        """
+        for comp_name in list(components):
+            getattr(self, comp_name.priv_name)
+        return components
+
+    def _copy_on_write(self):
+        """
+        Copy the element lazily: components of the copy are shared with this element
+        until the first access to them
+
+        Returns
+        -------
+        Element
+            Copy of this element
+        """
+        instance = Element.__new__(self.__class__)
+        for key, value in self.__dict__.items():
+            if key in ('_attrs', '_children'):
+                value = dict(value)
+            elif key in self._components_priv_names or key == '_parents':
+                continue
+            else:
+                value = deepcopy(value)
+            instance.__dict__[key] = value
+        return instance
+
+    def _reset(self):
+        """
+        Reset the element to the state of a new instance:
+        all components are shared with the class again
+        """
+        cls = self.__class__
+        instance_dict = self.__dict__
+        for priv_name in cls._components_priv_names:
+            instance_dict.pop(priv_name, None)
+        instance_dict['_attrs'] = dict(cls._attrs)
+        instance_dict['_children'] = dict(cls._children)
+        was_assigned = self.assigned
+        for key in ('_assigned', '_assigned_children', '_namespaces_delta'):
+            instance_dict.pop(key, None)
+        self._notify_parents(was_assigned)
+
+    def _set_assigned(self, assigned):
+        """
+        Set own assigned flag of the element and notify parents elements if its state is changed
+
+        Parameters
+        ----------
+        assigned : bool
+            New value of the own assigned flag
+        """
+        was_assigned = self.assigned
+        self._assigned = assigned
+        self._notify_parents(was_assigned)
+
+    def _notify_parents(self, was_assigned):
+        """
+        Update counters of assigned children of parents elements
+        if assigned state of this element is changed
+
+        Parameters
+        ----------
+        was_assigned : bool
+            Assigned state of this element before its change
+        """
+        if self.assigned == was_assigned:
+            return
+        delta = 1 if not was_assigned else -1
+        for parent_ref in self._parents:
+            parent = parent_ref()
+            if parent is not None:
+                parent_was_assigned = parent.assigned
+                parent._assigned_children += delta
+                parent._notify_parents(parent_was_assigned)
+
+    def _replace_child(self, name, child):
+        """
+        Replace child element with another element
+
+        Parameters
+        ----------
+        name : NSComponentName
+            Name of the child element
+        child : Element
+            New child element
+        """
+        old_child = getattr(self, name.priv_name)
+        old_child._parents = tuple(ref for ref in old_child._parents if ref() is not self)
+        setattr(self, name.priv_name, child)
+        self._children[name] = child
+        child._parents += (weakref.ref(self),)
+        if child._namespaces_delta:
+            self._mark_namespaces_delta()
+        was_assigned = self.assigned
+        self._assigned_children += child.assigned - old_child.assigned
+        self._notify_parents(was_assigned)
+
+    def _mark_namespaces_delta(self):
+        """
+        Mark this element and its parents elements as containing dynamically changed namespaces
+        """
+        if self._namespaces_delta:
+            return
+        self._namespaces_delta = True
+        self._notify_parents_namespaces()
+
+    def _notify_parents_namespaces(self):
+        """
+        Notify parents elements that namespaces of this element are changed
+        """
+        for parent_ref in self._parents:
+            parent = parent_ref()
+            if parent is not None:
+                parent._mark_namespaces_delta()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.pop('_parents', None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        for child_name, child in self._children.items():
+            if child_name.priv_name in state:
+                child._parents += (weakref.ref(self),)
+
+    def _get_snapshot(self, default):
+        """
+        Get compact picklable snapshot of the element state
+
+        Parameters
+        ----------
+        default : Element or ElementMeta
+            Element (or element class) whose state is restored before the snapshot loading
+
+        Returns
+        -------
+        tuple
+            Flat tuple (header, slot_index, value, slot_index, value, ...)
+            where header is None or pair (ns_prefix, ns_uri) if namespace differs from the default one,
+            slot_index is index of the component in _snapshot_slots of the element class
+            and value is an attribute value or a snapshot of the child element.
+            Components that are the same as default components are skipped
+        """
+        ns = (self._ns_prefix, self._ns_uri)
+        snapshot = [None if ns == (default._ns_prefix, default._ns_uri) else ns]
+        attrs, default_attrs = self._attrs, default._attrs
+        children, default_children = self._children, default._children
+        for slot_index, (comp_name, is_attr) in enumerate(self._snapshot_slots):
+            if is_attr:
+                attr, default_attr = attrs[comp_name], default_attrs[comp_name]
+                if attr is not default_attr and attr.value is not default_attr.value:
+                    snapshot.append(slot_index)
+                    snapshot.append(attr.value)
+            else:
+                child, default_child = children[comp_name], default_children[comp_name]
+                if child is not default_child:
+                    child_snapshot = child._get_snapshot(default_child)
+                    if len(child_snapshot) > 1 or child_snapshot[0] is not None:
+                        snapshot.append(slot_index)
+                        snapshot.append(child_snapshot)
+        return tuple(snapshot)
+
+    def _load_snapshot(self, snapshot):
+        """
+        Load state from the snapshot that's created by _get_snapshot method
+
+        Parameters
+        ----------
+        snapshot : tuple
+            Snapshot of the element whose default state matches the state of this element
+        """
+        if snapshot[0] is not None:
+            self.ns_uri = snapshot[0][1]
+            self.ns_prefix = snapshot[0][0]
+        slots = self._snapshot_slots
+        for idx in range(1, len(snapshot), 2):
+            comp_name, is_attr = slots[snapshot[idx]]
+            if is_attr:
+                setattr(self, comp_name.pub_name, snapshot[idx + 1])
+            else:
+                getattr(self, comp_name.priv_name)._load_snapshot(snapshot[idx + 1])
+
     def get_namespaces(self, assigned_only=True, attrs_only=False):
         """
         Get namespaces of the element
@@ -286,10 +557,22 @@ class Element(BaseNSComponent):
             Set of pairs (namespace_prefix, namespace_uri)
         """
         namespaces = super(Element, self).get_namespaces()
-        for comp in chain(self.attrs.values(),
-                          self.children.values() if not attrs_only else []):
-            if not assigned_only or comp.assigned:
+        if not assigned_only:
+            for comp in chain(self._attrs.values(),
+                              self._children.values() if not attrs_only else []):
                 namespaces.update(comp.get_namespaces(assigned_only))
+            return namespaces
+
+        attrs = self._attrs
+        for attr_name, ns in self._attrs_namespaces:
+            if attrs[attr_name].assigned:
+                namespaces.add(ns)
+        if not attrs_only and (self._children_namespaces or self._namespaces_delta):
+            # skip subtrees that cannot contain namespaces
+            for child in self._children.values():
+                if child.assigned and (child._ns_uri or child._attrs_namespaces
+                                       or child._children_namespaces or child._namespaces_delta):
+                    namespaces.update(child.get_namespaces())
         return namespaces
 
 
@@ -298,6 +581,8 @@ class MultipleElements(Element):
     Represents sibling elements of the same base class
     """
 
+    _namespaces_delta = True  # namespaces of elements are not known in advance
+
     def __init__(self, base_element_cls, **kwargs):
         if not isinstance(base_element_cls, ElementMeta):
             raise TypeError("Invalid type of elements class: {}".format(base_element_cls))
@@ -347,7 +632,7 @@ class MultipleElements(Element):
             or content value of element
         """
         self.elements.append(self._check_value(elem))
-        self._assigned = True
+        self._set_assigned(True)
 
     def extend(self, iterable):
         """
@@ -382,7 +667,7 @@ class MultipleElements(Element):
         Remove all elements
         """
         del self.elements[:]
-        self._assigned = False
+        self._set_assigned(False)
 
     def pop(self, index=-1):
         """
@@ -395,7 +680,7 @@ class MultipleElements(Element):
         """
         elem = self.elements.pop(index)
         if not self.elements:
-            self._assigned = False
+            self._set_assigned(False)
         return elem
 
     def validate(self, name=None):
@@ -408,7 +693,7 @@ class MultipleElements(Element):
     def __delitem__(self, index):
         self.elements.__delitem__(index)
         if not self.elements:
-            self._assigned = False
+            self._set_assigned(False)
 
     def __getitem__(self, index):
         return self.elements[index]
@@ -464,6 +749,39 @@ class MultipleElements(Element):
         base_cls_repr = "base_element_cls={!r}".format(self.base_element_cls)
         return "{}({})".format(self.__class__.__name__, ", ".join(filter(None, [base_cls_repr, s_repr])))
 
+    def _copy_on_write(self):
+        return deepcopy(self)
+
+    def _get_snapshot(self, default):
+        """
+        Get compact picklable snapshot of the elements
+
+        Returns
+        -------
+        tuple
+            Flat tuple (header, element_cls, element_snapshot, element_cls, element_snapshot, ...)
+            where element_cls is None if class of the element is the base element class
+        """
+        ns = (self._ns_prefix, self._ns_uri)
+        snapshot = [None if ns == (default._ns_prefix, default._ns_uri) else ns]
+        for elem in self.elements:
+            elem_cls = elem.__class__
+            snapshot.append(None if elem_cls is self.base_element_cls else elem_cls)
+            snapshot.append(elem._get_snapshot(elem_cls))
+        return tuple(snapshot)
+
+    def _load_snapshot(self, snapshot):
+        if snapshot[0] is not None:
+            self.ns_uri = snapshot[0][1]
+            self.ns_prefix = snapshot[0][0]
+        required = self._kwargs.get('required', False)
+        for idx in range(1, len(snapshot), 2):
+            elem = (snapshot[idx] or self.base_element_cls)(required=required)
+            elem._load_snapshot(snapshot[idx + 1])
+            self.elements.append(elem)
+        if self.elements:
+            self._set_assigned(True)
+
     def get_namespaces(self, assigned_only=True, attrs_only=False):
         namespaces = super(MultipleElements, self).get_namespaces()
         for elem in self.elements:
@@ -511,27 +829,24 @@ def _build_component_setter(name):
             if not component.compatible_with(value):
                 raise InvalidElementValueError(name, component.__class__, value,
                                                msg="Value class or its attributes are incompatible.")
-            setattr(self, name.priv_name, value)
-            self._children[name] = value
+            self._replace_child(name, value)
         elif isinstance(value, Element):
             raise InvalidElementValueError(name, component.__class__, value)
         elif isinstance(value, Mapping):
             args = dict(**value)
             args.update(component.settings)
-            new_value = component.__class__(**args)
-            setattr(self, name.priv_name, new_value)
-            self._children[name] = new_value
+            self._replace_child(name, component.__class__(**args))
         elif (component.content_name
               and (not component.required_attrs
                    or len(component.required_attrs) == 1
                        and component.content_name in component.required_attrs)):
             setattr(component, component.content_name.pub_name, value)
-        elif len(component.children) == 1 and not component.required_attrs:
-            child_name = next(iter(component.children))
+        elif len(component._children) == 1 and not component.required_attrs:
+            child_name = next(iter(component._children))
             setattr(component, str(child_name), value)
         else:
             raise InvalidElementValueError(name, component.__class__, value)
-        self._assigned = value is not None
+        self._set_assigned(value is not None)
 
     return setter
 
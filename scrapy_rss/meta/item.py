@@ -3,6 +3,7 @@
 import six
 from scrapy.item import ItemMeta as BaseItemMeta, Item as BaseItem
 
+from ..exceptions import ReleasedItemError
 from ..utils import MutableMapping, deprecated_class
 
 try:
@@ -17,6 +18,26 @@ class ItemMeta(ElementMeta, BaseItemMeta):
     _blacklisted_comp_names = ElementMeta._blacklisted_comp_names | {'_elements', 'elements'}
 
 
+class _ReleasedComponents(object):
+    """
+    Placeholder of components of the item that's released in the debug mode of items pool
+    """
+
+    def _raise(self, *args, **kwargs):
+        raise ReleasedItemError('Item is used after its release to the items pool')
+
+    __contains__ = __getitem__ = __setitem__ = __delitem__ = __iter__ = __len__ = _raise
+    __bool__ = __nonzero__ = _raise
+
+    def __getattr__(self, name):
+        self._raise()
+
+
+_released_components = _ReleasedComponents()
+_items_pools = {}  # {item class: list of released items}
+_state_attr_names = {}  # {item class: names of instance attributes that are restored from snapshot components}
+
+
 class FeedItem(six.with_metaclass(ItemMeta, Element, BaseItem)):
     """
     Properties
@@ -25,6 +46,10 @@ class FeedItem(six.with_metaclass(ItemMeta, Element, BaseItem)):
         All elements of the item
     """
 
+    _pool_size = 1024
+    _pool_debug = False
+    _released = False
+
     def __init__(self, *args, **kwargs):
         if len(args) == 1 and isinstance(args[0], MutableMapping):
             args[0].update(kwargs)
@@ -40,13 +65,150 @@ class FeedItem(six.with_metaclass(ItemMeta, Element, BaseItem)):
 
     @property
     def elements(self):
-        return self._children
+        return self.children
 
     def __setattr__(self, name, value):
         if name in self.fields:
             raise AttributeError("Use item[{!r}] = {!r} to set field value".format(name, value))
         super(MutableMapping, self).__setattr__(name, value)
 
+    @classmethod
+    def configure_pool(cls, size=None, debug=None):
+        """
+        Configure pool of released items of this class and its subclasses
+
+        Parameters
+        ----------
+        size : int or None
+            Maximum number of released items that are kept for reuse
+        debug : bool or None
+            Whether released items are never reused and raise ReleasedItemError on any access
+        """
+        if size is not None:
+            cls._pool_size = size
+        if debug is not None:
+            cls._pool_debug = debug
+
+    @classmethod
+    def acquire(cls):
+        """
+        Get an item from the pool of released items or create a new item
+
+        Returns
+        -------
+        FeedItem
+            Item of this class in the state of the item that's created without arguments
+        """
+        try:
+            item = _items_pools[cls].pop()
+        except (KeyError, IndexError):
+            item = cls()
+        else:
+            item._released = False
+        item._pooled = True
+        return item
+
+    def release(self):
+        """
+        Clear the item and return it to the pool of its class for reuse by method acquire.
+        The item must not be used after its release.
+
+        Components, fields and nested items in public attributes are reset,
+        other state that's set by custom constructors is kept as is.
+
+        Raises
+        ------
+        ReleasedItemError
+            If the item is already released
+        """
+        if self._released:
+            raise ReleasedItemError('Item is already released to the items pool')
+        cls = self.__class__
+        self._released = True
+        if cls._pool_debug:
+            for priv_name in cls._components_priv_names:
+                self.__dict__.pop(priv_name, None)
+            self.__dict__.update(_attrs=_released_components, _children=_released_components,
+                                 _values=_released_components, _assigned=_released_components,
+                                 _assigned_children=_released_components,
+                                 _namespaces_delta=_released_components)
+            return
+        self._reset_item()
+        pool = _items_pools.setdefault(cls, [])
+        if len(pool) < cls._pool_size:
+            pool.append(self)
+
+    def _reset_item(self):
+        self._reset()
+        self._values.clear()
+        for name, value in self.__dict__.items():
+            if not name.startswith('_') and isinstance(value, FeedItem):
+                value._reset_item()
+
+    def snapshot(self):
+        """
+        Get compact picklable snapshot of the item
+
+        Returns
+        -------
+        tuple
+            Flat tuple (fields, attrs, header, slot_index, value, slot_index, value, ...)
+            where fields is dict of item fields values or None,
+            attrs is dict of instance attributes that are not components or their state
+            (e.g. attributes that are set by constructors of subclasses) or None,
+            header is None or pair (ns_prefix, ns_uri) of the item namespace
+            and pairs (slot_index, value) contain values of assigned attributes
+            and snapshots of assigned elements keyed by index of the component in the item class
+        """
+        state_attr_names = self._get_state_attr_names()
+        attrs = {name: value for name, value in self.__dict__.items() if name not in state_attr_names}
+        return (dict(self._values) or None, attrs or None) + self._get_snapshot(self.__class__)
+
+    @classmethod
+    def _get_state_attr_names(cls):
+        """
+        Get names of instance attributes of the item state that's saved by components of the snapshot
+        """
+        try:
+            return _state_attr_names[cls]
+        except KeyError:
+            item = cls.__new__(cls)
+            FeedItem.__init__(item)
+            names = _state_attr_names[cls] = (frozenset(item.__dict__) | cls._components_priv_names
+                                              | type(cls)._blacklisted_comp_names | {'_pooled', '_released'})
+            return names
+
+    @classmethod
+    def from_snapshot(cls, snapshot):
+        """
+        Create item from the snapshot
+
+        Parameters
+        ----------
+        snapshot : tuple
+            Snapshot that's returned by method snapshot of the item of the same class
+
+        Returns
+        -------
+        FeedItem
+            New item
+        """
+        item = cls.__new__(cls)
+        FeedItem.__init__(item)
+        item._load_snapshot(snapshot[2:])
+        if snapshot[0]:
+            item.update(snapshot[0])
+        if snapshot[1]:
+            item.__dict__.update(snapshot[1])
+        return item
+
+    def __reduce__(self):
+        return _item_from_snapshot, (self.__class__, self.snapshot())
+
+
+def _item_from_snapshot(item_cls, snapshot):
+    return item_cls.from_snapshot(snapshot)
+
 
 # Backward compatibility
 @deprecated_class("Use FeedItem class instead")
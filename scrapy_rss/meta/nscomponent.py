@@ -6,9 +6,38 @@ from ..exceptions import NoNamespaceURIError, InvalidComponentError
 from ..utils import Iterable
 
 
+def _get_slots_names(cls):
+    """
+    Get names of all slots of the class including slots of base classes
+
+    Parameters
+    ----------
+    cls : type
+
+    Returns
+    -------
+    tuple of str
+    """
+    try:
+        return _slots_names[cls]
+    except KeyError:
+        pass
+    names = []
+    for base_cls in reversed(cls.__mro__):
+        slots = base_cls.__dict__.get('__slots__', ())
+        if isinstance(slots, str):
+            slots = (slots,)
+        names.extend(name for name in slots if name not in ('__dict__', '__weakref__') and name not in names)
+    _slots_names[cls] = names = tuple(names)
+    return names
+
+
+_slots_names = {}
+
+
 class BaseNSComponent(object):
-    _ns_prefix = ''
-    _ns_uri = ''
+    # components are created in large numbers, so their layout is slotted
+    __slots__ = ('_ns_prefix', '_ns_uri')
 
     def __init__(self, ns_prefix=None, ns_uri=None):
         """
@@ -26,6 +55,15 @@ class BaseNSComponent(object):
         if ns_prefix and not ns_uri:
             raise NoNamespaceURIError(self, None, "No URI for prefix '{}'".format(ns_prefix))
 
+    def __getstate__(self):
+        state = {name: getattr(self, name) for name in _get_slots_names(self.__class__) if hasattr(self, name)}
+        state.update(getattr(self, '__dict__', ()))
+        return state
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+
     @property
     def ns_prefix(self):
         """
@@ -180,7 +218,18 @@ class BaseNSComponent(object):
 
 
 class NSComponentName(BaseNSComponent):
-    def __init__(self, name, ns_prefix=None, ns_uri=None):
+    """
+    Immutable name of a component.
+
+    Names are interned: each distinct combination of constructor arguments maps to a single instance
+    whose hash and derived names are precomputed.
+    """
+
+    __slots__ = ('_name', '_public_fullname', '_private_fullname', '_xml_name', '_qname', '_hash')
+
+    _interned = {}  # {(class, name, ns_prefix, ns_uri): instance}
+
+    def __new__(cls, name, ns_prefix=None, ns_uri=None):
         """
         Component' name wrapper
 
@@ -194,18 +243,49 @@ class NSComponentName(BaseNSComponent):
         ns_uri : str or None
             a namespace URI
         """
+        key = (cls, name, ns_prefix or None, ns_uri or None)
+        try:
+            return cls._interned[key]
+        except KeyError:
+            pass
+        instance = super(NSComponentName, cls).__new__(cls)
         if '__' in name.rstrip('_'):
             secondary_ns_prefix, name = name.split('__', 1)
         else: 
             secondary_ns_prefix = None
-        super(NSComponentName, self).__init__(ns_prefix=ns_prefix or secondary_ns_prefix,
-                                              ns_uri=ns_uri)
-        self._name = name
+        BaseNSComponent.__init__(instance, ns_prefix=ns_prefix or secondary_ns_prefix, ns_uri=ns_uri)
+        instance._name = name
         if secondary_ns_prefix:
-            self._public_fullname = '{}__{}'.format(secondary_ns_prefix, name)
+            instance._public_fullname = '{}__{}'.format(secondary_ns_prefix, name)
         else:
-            self._public_fullname = name
-        self._private_fullname = '__{}'.format(self._public_fullname) 
+            instance._public_fullname = name
+        instance._private_fullname = '__{}'.format(instance._public_fullname)
+        instance._xml_name = (instance._ns_uri, name.rstrip('_'))
+        instance._qname = ('{}:{}'.format(instance._ns_prefix, instance._xml_name[1]) if instance._ns_prefix
+                           else instance._xml_name[1])
+        instance._hash = hash((instance._ns_uri, name))
+        cls._interned[key] = instance
+        return instance
+
+    def __init__(self, name, ns_prefix=None, ns_uri=None):
+        pass  # the name is initialized once by the constructor
+
+    def __reduce__(self):
+        return self.__class__, (self._public_fullname, self._ns_prefix, self._ns_uri)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    @BaseNSComponent.ns_prefix.setter
+    def ns_prefix(self, ns_prefix):
+        raise AttributeError('Names of components are immutable')
+
+    @BaseNSComponent.ns_uri.setter
+    def ns_uri(self, ns_uri):
+        raise AttributeError('Names of components are immutable')
 
     @property
     def settings(self):
@@ -235,7 +315,19 @@ class NSComponentName(BaseNSComponent):
         (str or None, str)
             component name in the namespaced SAX format where the second item without trailing underscores
         """
-        return self._ns_uri, self._name.rstrip('_')
+        return self._xml_name
+
+    @property
+    def qname(self):
+        """
+        Get qualified name of the XML element or attribute such as **nsprefix:name**
+
+        Returns
+        -------
+        str
+            qualified XML name
+        """
+        return self._qname
 
     @property
     def pub_name(self):
@@ -266,15 +358,14 @@ class NSComponentName(BaseNSComponent):
     def __str__(self):
         return self._public_fullname
 
-    def __key(self):
-        return self._ns_uri, self._name
-
     def __hash__(self):
-        return hash(self.__key())
+        return self._hash
 
     def __eq__(self, other):
+        if self is other:
+            return True
         if isinstance(other, NSComponentName):
-            return self.__key() == other.__key()
+            return self._ns_uri == other._ns_uri and self._name == other._name
         raise NotImplementedError("Cannot compare instances of {} and {}".format(self.__class__, other.__class__))
 
     def __repr__(self):
@@ -1,35 +1,260 @@
 # -*- coding: utf-8 -*-
 
+import os
+import threading
+import time
+from collections import deque
+from functools import partial
+
 import six
+from six.moves.queue import Queue, Empty, Full
 from scrapy import signals
-from scrapy.exceptions import NotConfigured, CloseSpider
+from scrapy.exceptions import NotConfigured, CloseSpider, DropItem
 from scrapy.utils.misc import load_object
+from twisted.internet import defer
+from twisted.internet.task import LoopingCall
 
+from .appending import open_feed_for_append, read_declared_namespaces, update_last_build_date
+from .compression import CompressedFile, get_compression
+from .dedup import SeenKeysIndex, get_item_key
+from .digest import DigestFeedFile
 from .items import RssItem
-from .exporters import FeedItemExporter
+from .meta import FeedItem
+from .rolling import RollingFeedExporter
+from .sharding import ShardedFeedExporter
+from .sorting import SortedFeedExporter, get_sort_key
+from .exporters import FeedItemExporter, create_process_pool
 from .utils import deprecated_class
 
 
+class FeedFlushPolicy(object):
+    """
+    Policy of flushing of the exported feed to the file
+
+    Buffered markup is flushed after the given number of exported items
+    or when the given interval is elapsed since the last flush
+    (it's checked on the item export and periodically by method check).
+    Flushed data is optionally synced to the disk.
+    """
+
+    def __init__(self, exporter, file, every_items=None, interval=None, fsync=False):
+        """
+        Parameters
+        ----------
+        exporter : FeedItemExporter
+            Exporter of the feed
+        file : file-like object
+            Binary file of the feed
+        every_items : int or None
+            Number of exported items between flushes
+        interval : float or None
+            Minimum number of seconds between flushes
+        fsync : bool
+            Whether flushed data and the finished feed are synced to the disk by os.fsync
+        """
+        self.exporter = exporter
+        self.file = file
+        self.every_items = every_items
+        self.interval = interval
+        self.fsync = fsync
+        self.unflushed_items = 0
+        self.last_flush_time = time.time()
+
+    def item_exported(self):
+        """
+        Flush the feed if it's required by the policy after the item export
+        """
+        self.unflushed_items += 1
+        if (self.every_items and self.unflushed_items >= self.every_items
+                or self.interval and time.time() - self.last_flush_time >= self.interval):
+            self.exporter.flush()
+            self.flush()
+
+    def check(self):
+        """
+        Flush exported items if the interval is elapsed since the last flush,
+        so items are flushed when the crawl is idle
+        """
+        if self.unflushed_items and self.interval and time.time() - self.last_flush_time >= self.interval:
+            self.exporter.flush()
+            self.flush()
+
+    def flush(self):
+        """
+        Flush the file and sync it to the disk if it's required
+        """
+        if getattr(self.file, 'closed', False):
+            return
+        self.file.flush()
+        if self.fsync:
+            fsync = getattr(self.file, 'fsync', None)  # file of multiple files syncs them itself
+            if fsync is not None:
+                fsync()
+            else:
+                os.fsync(self.file.fileno())
+        self.unflushed_items = 0
+        self.last_flush_time = time.time()
+
+
+class FeedExportThread(threading.Thread):
+    """
+    Thread that exports already validated feed items from the bounded queue
+
+    Snapshots of items are put to the queue by the pipeline in the reactor thread,
+    so changes of items by next pipelines don't affect exported items.
+    If the queue is full then items wait for free space in FIFO order
+    and the pipeline returns deferreds that are fired when items are queued.
+    """
+
+    _stop_marker = object()
+
+    def __init__(self, exporter, queue_size, flush_policy=None):
+        """
+        Parameters
+        ----------
+        exporter : FeedItemExporter
+            Exporter whose exporting is already started
+        queue_size : int
+            Maximum number of queued items
+        flush_policy : FeedFlushPolicy or None
+            Policy of flushing of the feed that's applied in this thread
+        """
+        super(FeedExportThread, self).__init__(name='FeedExportThread')
+        self.daemon = True
+        self.exporter = exporter
+        self.queue = Queue(queue_size)
+        self.pending = deque()  # ((item class, snapshot, result), deferred) pairs, accessed by the reactor thread only
+        self.flush_policy = flush_policy
+        self.error = None
+
+    def run(self):
+        interval = self.flush_policy.interval if self.flush_policy is not None else None
+        while True:
+            try:
+                entry = self.queue.get(timeout=interval or None)
+            except Empty:
+                self._check_flush_policy()
+                continue
+            if entry is self._stop_marker:
+                break
+            item_cls, snapshot, result = entry
+            if self.error is None:
+                try:
+                    self.exporter.export_validated_item(item_cls.from_snapshot(snapshot))
+                    if self.flush_policy is not None:
+                        self.flush_policy.item_exported()
+                except Exception as e:
+                    self.error = e  # keep draining the queue to not block the reactor thread
+            if self.pending:
+                from twisted.internet import reactor
+                if reactor.running:  # otherwise pending items are queued on close
+                    reactor.callFromThread(self._release_pending)
+
+    def _check_flush_policy(self):
+        if self.error is None:
+            try:
+                self.flush_policy.check()
+            except Exception as e:
+                self.error = e
+
+    def _raise_error(self):
+        if self.error is not None:
+            raise self.error
+
+    def _release_pending(self):
+        while self.pending:
+            entry, deferred = self.pending[0]
+            try:
+                self.queue.put_nowait(entry)
+            except Full:
+                return
+            self.pending.popleft()
+            deferred.callback(entry)
+
+    def put(self, item, result):
+        """
+        Put snapshot of the validated item to the queue
+
+        Parameters
+        ----------
+        item : FeedItem
+            Validated feed item
+        result : object
+            Result of the pipeline processing
+
+        Returns
+        -------
+        object or Deferred
+            Result itself if the item is queued immediately
+            or deferred that's fired with the result when the item is queued
+        """
+        self._raise_error()
+        entry = (item.__class__, item.snapshot(), result)
+        if not self.pending:
+            try:
+                self.queue.put_nowait(entry)
+                return result
+            except Full:
+                pass
+        deferred = defer.Deferred()
+        deferred.addCallback(lambda _: result)
+        self.pending.append((entry, deferred))
+        # the queue could be drained before the item became pending
+        self._release_pending()
+        return deferred
+
+    def close(self):
+        """
+        Export all queued and pending items and stop the thread
+        """
+        while self.pending:
+            entry, deferred = self.pending.popleft()
+            self.queue.put(entry)
+            deferred.callback(entry)
+        self.queue.put(self._stop_marker)
+        self.join()
+        self._raise_error()
+
+
 class FeedExportPipeline(object):
     def __init__(self):
         self.files = {}
         self.exporters = {}
+        self.export_threads = {}
+        self.flush_policies = {}
+        self.flush_loops = {}
+        self.executors = {}
+        self.seen_keys = {}
+        self.release_items = False
 
     @classmethod
     def from_crawler(cls, crawler):
         pipeline = cls()
         crawler.signals.connect(pipeline.spider_opened, signals.spider_opened)
         crawler.signals.connect(pipeline.spider_closed, signals.spider_closed)
+        crawler.signals.connect(pipeline.item_processed, signals.item_scraped)
+        crawler.signals.connect(pipeline.item_processed, signals.item_dropped)
         return pipeline
 
-    def spider_opened(self, spider):
+    @staticmethod
+    def _open_file(spider, path):
+        """
+        Open the feed file for writing with the configured buffering and compression
+        """
+        file = open(path, 'wb', spider.settings.getint('FEED_BUFFER_SIZE', -1))
         try:
-            file = open(spider.settings.get('FEED_FILE'), 'wb')
-        except TypeError:
-            raise NotConfigured('FEED_FILE parameter does not string or does not exist')
-        except (IOError, OSError) as e:
-            raise CloseSpider('Cannot open file {}: {}'.format(spider.settings.get('FEED_FILE', None), e))
-        self.files[spider] = file
+            compression = get_compression(path, spider.settings.get('FEED_COMPRESSION'))
+            if compression:
+                compression_level = spider.settings.get('FEED_COMPRESSION_LEVEL')
+                file = CompressedFile(file, compression,
+                                      int(compression_level) if compression_level is not None else None)
+        except Exception:
+            file.close()
+            raise
+        return file
+
+    def spider_opened(self, spider):
+        # settings are validated before opening of the feed file since the appended feed is modified in place
         feed_title = spider.settings.get('FEED_TITLE')
         if not feed_title:
             raise NotConfigured('FEED_TITLE parameter does not exist')
@@ -40,6 +265,43 @@ class FeedExportPipeline(object):
         if feed_description is None:
             raise NotConfigured('FEED_DESCRIPTION parameter does not exist')
 
+        feed_file = spider.settings.get('FEED_FILE')
+        shard_items = spider.settings.getint('FEED_SHARD_ITEMS')
+        shard_bytes = spider.settings.getint('FEED_SHARD_BYTES')
+        rotation = spider.settings.get('FEED_ROTATION')
+        sharded = shard_items > 0 or shard_bytes > 0 or bool(rotation)
+        max_items = spider.settings.getint('FEED_MAX_ITEMS')
+        if max_items > 0 and (sharded or spider.settings.getbool('FEED_APPEND')
+                              or get_compression(feed_file, spider.settings.get('FEED_COMPRESSION'))):
+            raise ValueError('FEED_MAX_ITEMS is not supported for sharded, rotated, appended or compressed feeds')
+        sort_by = spider.settings.get('FEED_SORT_BY')
+        if sort_by and max_items > 0:
+            raise ValueError('FEED_SORT_BY is not supported with FEED_MAX_ITEMS that sorts items by pubDate')
+        append = (spider.settings.getbool('FEED_APPEND') and isinstance(feed_file, six.string_types)
+                  and os.path.isfile(feed_file) and os.path.getsize(feed_file) > 0)
+        if append and (sharded or get_compression(feed_file, spider.settings.get('FEED_COMPRESSION'))):
+            raise ValueError('FEED_APPEND is not supported for sharded, rotated or compressed feeds')
+        skip_unchanged = spider.settings.getbool('FEED_SKIP_UNCHANGED')
+        if skip_unchanged and (sharded or max_items > 0 or spider.settings.getbool('FEED_APPEND')):
+            raise ValueError('FEED_SKIP_UNCHANGED is not supported for sharded, rotated, rolling or appended feeds')
+        if (sharded or max_items > 0) and isinstance(feed_file, six.string_types):
+            file = None
+        else:
+            try:
+                if append:
+                    file = open_feed_for_append(feed_file, buffering=spider.settings.getint('FEED_BUFFER_SIZE', -1))
+                elif skip_unchanged and isinstance(feed_file, six.string_types):
+                    file = DigestFeedFile(feed_file, partial(self._open_file, spider))
+                else:
+                    file = self._open_file(spider, feed_file)
+            except ValueError as e:
+                raise CloseSpider(str(e))
+            except TypeError:
+                raise NotConfigured('FEED_FILE parameter does not string or does not exist')
+            except (IOError, OSError) as e:
+                raise CloseSpider('Cannot open file {}: {}'.format(feed_file, e))
+            self.files[spider] = file
+
         item_cls = spider.settings.get('FEED_ITEM_CLASS', spider.settings.get('FEED_ITEM_CLS', RssItem))
         if isinstance(item_cls, six.string_types):
             item_cls = load_object(item_cls)
@@ -51,19 +313,173 @@ class FeedExportPipeline(object):
             feed_exporter = load_object(feed_exporter)
         if not issubclass(feed_exporter, FeedItemExporter):
             raise TypeError("FEED_EXPORTER must be FeedItemExporter or its subclass, not '{}'".format(feed_exporter))
-        self.exporters[spider] = feed_exporter(file, feed_title, feed_link, feed_description,
-                                               namespaces=namespaces, item_cls=item_cls)
-        self.exporters[spider].start_exporting()
+        exporter_kwargs = {}
+        if spider.settings.getbool('FEED_HOIST_NAMESPACES'):
+            exporter_kwargs['hoist_namespaces'] = True
+        if spider.settings.get('FEED_XML_WRITER'):
+            exporter_kwargs['xml_writer'] = spider.settings.get('FEED_XML_WRITER')
+        if spider.settings.getint('FEED_EXPORT_WORKERS') > 1 and not max_items > 0:
+            exporter_kwargs['workers'] = spider.settings.getint('FEED_EXPORT_WORKERS')
+            # the pool is shared by exporters of all shards and rotated files
+            exporter_kwargs['executor'] = self.executors[spider] = create_process_pool(exporter_kwargs['workers'])
+            if spider.settings.get('FEED_EXPORT_BATCH_SIZE'):
+                exporter_kwargs['worker_batch_size'] = spider.settings.getint('FEED_EXPORT_BATCH_SIZE')
+
+        def create_exporter(file):
+            return feed_exporter(file, feed_title, feed_link, feed_description,
+                                 namespaces=namespaces, item_cls=item_cls, **exporter_kwargs)
+
+        if file is None and max_items > 0:
+            exporter = RollingFeedExporter(feed_file, partial(self._open_file, spider), create_exporter, max_items,
+                                           fsync=spider.settings.getbool('FEED_FSYNC'))
+            exporter.start_exporting()
+            file = self.files[spider] = exporter.file
+            self.exporters[spider] = exporter
+        elif file is None:
+            exporter = ShardedFeedExporter(feed_file, partial(self._open_file, spider), create_exporter,
+                                           max_items=shard_items if shard_items > 0 else None,
+                                           max_bytes=shard_bytes if shard_bytes > 0 else None,
+                                           index_path=spider.settings.get('FEED_SHARD_INDEX'),
+                                           fsync=spider.settings.getbool('FEED_FSYNC'),
+                                           rotation=rotation or None,
+                                           rotation_by=spider.settings.get('FEED_ROTATION_BY', 'time'),
+                                           path_params={'spider': spider.name},
+                                           max_open_windows=spider.settings.getint('FEED_ROTATION_OPEN_WINDOWS', 3))
+            try:
+                exporter.start_exporting()
+            except (IOError, OSError) as e:
+                raise CloseSpider('Cannot open file {}: {}'.format(feed_file, e))
+            file = self.files[spider] = exporter.file
+            self.exporters[spider] = exporter
+        elif append:
+            try:
+                exporter = create_exporter(file)
+                exporter.start_appending(read_declared_namespaces(file, exporter.encoding))
+            except Exception:
+                # the existing feed is left untouched
+                self.files.pop(spider).close()
+                raise
+            file.truncate()
+            self.exporters[spider] = exporter
+            update_last_build_date(file, exporter._get_last_build_date_markup(exporter.channel.lastBuildDate),
+                                   exporter.encoding)
+        else:
+            self.exporters[spider] = create_exporter(file)
+            self.exporters[spider].start_exporting()
+
+        if sort_by:
+            reverse = spider.settings.get('FEED_SORT_REVERSE')
+            reverse = sort_by == 'pubDate' if reverse is None else spider.settings.getbool('FEED_SORT_REVERSE')
+            self.exporters[spider] = SortedFeedExporter(
+                self.exporters[spider], get_sort_key(sort_by), reverse=reverse,
+                memory_limit=spider.settings.getint('FEED_SORT_MEMORY_LIMIT', 64 * 1024 * 1024),
+                temp_dir=spider.settings.get('FEED_SORT_TEMP_DIR'))
+
+        if spider.settings.getbool('FEED_DEDUP'):
+            index_path = spider.settings.get('FEED_DEDUP_INDEX')
+            if not index_path and spider.settings.get('JOBDIR'):
+                jobdir = spider.settings.get('JOBDIR')
+                if not os.path.isdir(jobdir):
+                    os.makedirs(jobdir)
+                index_path = os.path.join(jobdir, 'feed_seen_keys.sqlite')
+            self.seen_keys[spider] = SeenKeysIndex(
+                index_path, bloom_size=spider.settings.getint('FEED_DEDUP_BLOOM_SIZE') or None)
+
+        flush_every_items = spider.settings.getint('FEED_FLUSH_EVERY_ITEMS')
+        flush_interval = spider.settings.getfloat('FEED_FLUSH_INTERVAL')
+        fsync = spider.settings.getbool('FEED_FSYNC')
+        if flush_every_items > 0 or flush_interval > 0 or fsync:
+            self.flush_policies[spider] = FeedFlushPolicy(self.exporters[spider], file,
+                                                          every_items=flush_every_items,
+                                                          interval=flush_interval, fsync=fsync)
+
+        self.release_items = spider.settings.getbool('FEED_ITEM_POOL')
+        if self.release_items:
+            FeedItem.configure_pool(size=spider.settings.getint('FEED_ITEM_POOL_SIZE', 1024),
+                                    debug=spider.settings.getbool('FEED_ITEM_POOL_DEBUG'))
+
+        if spider.settings.getbool('FEED_ASYNC_EXPORT') and not max_items > 0:
+            export_thread = FeedExportThread(self.exporters[spider],
+                                             spider.settings.getint('FEED_ASYNC_QUEUE_SIZE', 1000),
+                                             flush_policy=self.flush_policies.get(spider))
+            export_thread.start()
+            self.export_threads[spider] = export_thread
+        elif flush_interval > 0:
+            # the export thread checks the interval itself
+            flush_loop = self.flush_loops[spider] = LoopingCall(self.flush_policies[spider].check)
+            flush_loop.start(flush_interval, now=False)
 
     def spider_closed(self, spider):
-        self.exporters[spider].finish_exporting()
-        file = self.files.pop(spider)
-        file.close()
+        flush_loop = self.flush_loops.pop(spider, None)
+        if flush_loop is not None and flush_loop.running:
+            flush_loop.stop()
+        try:
+            export_thread = self.export_threads.pop(spider, None)
+            if export_thread is not None:
+                export_thread.close()
+            self.exporters[spider].finish_exporting()
+            flush_policy = self.flush_policies.pop(spider, None)
+            if flush_policy is not None:
+                flush_policy.flush()
+            if isinstance(self.files[spider], DigestFeedFile):
+                self.files[spider].finish()
+        finally:
+            self.flush_policies.pop(spider, None)
+            seen_keys = self.seen_keys.pop(spider, None)
+            if seen_keys is not None:
+                seen_keys.close()
+            executor = self.executors.pop(spider, None)
+            if executor is not None:
+                executor.shutdown()
+            file = self.files.pop(spider)
+            file.close()
 
     def process_item(self, item, spider):
-        self.exporters[spider].export_item(item)
+        seen_keys = self.seen_keys.get(spider)
+        if seen_keys is not None:
+            feed_item = item if isinstance(item, FeedItem) else getattr(item, 'rss', None)
+            key = get_item_key(feed_item) if isinstance(feed_item, FeedItem) else None
+            if key is not None and key in seen_keys:
+                raise DropItem('Duplicate feed item {!r}'.format(key))
+        export_thread = self.export_threads.get(spider)
+        if export_thread is not None:
+            result = export_thread.put(self.exporters[spider].validate_item(item), item)
+        else:
+            self.exporters[spider].export_item(item)
+            flush_policy = self.flush_policies.get(spider)
+            if flush_policy is not None:
+                flush_policy.item_exported()
+            result = item
+        if seen_keys is not None and key is not None:
+            seen_keys.add(key)
+        return result
+
+    def item_processed(self, item, spider):
+        """
+        Release the acquired item to the items pool when all pipelines processed it or it's dropped.
+        The export thread exports snapshots of items, so items are released without waiting for their export.
+        Signal handlers are called in order of their connection, so handlers of the same signals
+        that are connected after this one receive the released item
+        """
+        if self.release_items:
+            self._release_item(item)
+
+    @staticmethod
+    def _get_pooled_item(item):
+        if not getattr(item, '_pooled', False):
+            try:
+                item = item['rss']
+            except (KeyError, TypeError):
+                item = getattr(item, 'rss', None)
+            if not getattr(item, '_pooled', False):
+                return None
         return item
 
+    def _release_item(self, item):
+        item = self._get_pooled_item(item)
+        if item is not None:
+            item.release()
+
 
 @deprecated_class('Use FeedExportPipeline instead')
 class RssExportPipeline(FeedExportPipeline):
@@ -0,0 +1,248 @@
+# -*- coding: utf-8 -*-
+
+import calendar
+import heapq
+import io
+import os
+import re
+import time
+from datetime import datetime
+from email.utils import parsedate_tz, mktime_tz
+from xml.sax.saxutils import unescape
+
+from .dedup import get_item_key
+from .writers import XmlWriter
+
+
+_ITEM_START = re.compile(br'<item[\s>]')
+_PUB_DATE = re.compile(br'<pubDate>([^<]*)</pubDate>')
+_KEY_ELEMENTS = (re.compile(r'<guid(?:\s[^>]*)?>([^<]*)</guid>'), re.compile(r'<link>([^<]*)</link>'))
+
+_replace_file = getattr(os, 'replace', os.rename)
+
+
+def get_item_timestamp(item, default=None):
+    """
+    Get publication date of the feed item as POSIX timestamp
+
+    Parameters
+    ----------
+    item : RssItem
+        Feed item
+    default : float or None
+        Timestamp of the item without publication date, None means the current time
+
+    Returns
+    -------
+    float
+    """
+    pub_date = getattr(item, 'pubDate', None)
+    date = getattr(pub_date, 'value', None) if pub_date is not None and pub_date.assigned else None
+    if isinstance(date, datetime):
+        if date.tzinfo is not None and date.utcoffset() is not None:
+            return calendar.timegm(date.utctimetuple()) + date.microsecond / 1e6
+        return time.mktime(date.timetuple()) + date.microsecond / 1e6
+    return time.time() if default is None else default
+
+
+def get_markup_key(markup):
+    """
+    Get de-duplication key of the serialized feed item: content of guid element
+    or link element if guid is absent
+
+    Parameters
+    ----------
+    markup : str
+        Markup of the feed item
+
+    Returns
+    -------
+    str or None
+        Key of the item or None if it has neither guid nor link
+    """
+    for key_element in _KEY_ELEMENTS:
+        match = key_element.search(markup)
+        if match is not None:
+            return unescape(match.group(1), {'&quot;': '"', '&apos;': "'"})
+    return None
+
+
+def iter_feed_items(file, encoding='utf-8', chunk_size=65536):
+    """
+    Iterate over markup of items of the feed that's exported by FeedItemExporter.
+    The file is read by chunks, so only the current item is kept in memory
+
+    Parameters
+    ----------
+    file : file object
+        Binary file of the feed
+    encoding : str
+        Encoding of the feed
+    chunk_size : int
+        Size of read chunks
+
+    Yields
+    ------
+    (bytes, float or None)
+        Item markup and timestamp of its publication date
+    """
+    end_tag = u'</item>'.encode(encoding)
+    data = b''
+    eof = False
+    while not eof:
+        chunk = file.read(chunk_size)
+        eof = not chunk
+        data += chunk
+        position = 0
+        while True:
+            match = _ITEM_START.search(data, position)
+            if match is None:
+                position = max(position, len(data) - len(end_tag))
+                break
+            end = data.find(end_tag, match.start())
+            if end < 0:
+                position = match.start()
+                break
+            end += len(end_tag)
+            markup = data[match.start():end]
+            pub_date = _PUB_DATE.search(markup)
+            parsed_date = parsedate_tz(pub_date.group(1).decode(encoding)) if pub_date else None
+            yield markup, mktime_tz(parsed_date) if parsed_date else None
+            position = end
+        data = data[position:]
+
+
+class _RollingFile(object):
+    """
+    File-like object of the feed that's written on finish of the export
+    """
+
+    closed = True
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class RollingFeedExporter(object):
+    """
+    Exporter of the feed that contains the given number of the newest items
+    of the previous feed and the exported items.
+    Items are ordered by their publication dates from the newest to the oldest,
+    the exported item without publication date is considered as published at its export.
+
+    Items of the previous feed with the same guid (or link if guid is absent) as an exported item are dropped.
+
+    The newest exported items are kept as snapshots in a bounded heap, markup of items of the previous feed
+    is kept until the finish of the export.
+    The feed is written to the temporary file that replaces the feed file atomically on finish of the export.
+
+    It has the interface of FeedItemExporter that's used by the pipeline.
+    """
+
+    def __init__(self, path, open_file, create_exporter, max_items, fsync=False):
+        """
+        Parameters
+        ----------
+        path : str
+            Path to the feed file
+        open_file : callable
+            Function that opens binary file by its path for writing
+        create_exporter : callable
+            Function that creates not started FeedItemExporter for the file
+        max_items : int
+            Maximum number of items in the feed
+        fsync : bool
+            Whether the written feed is synced to the disk by os.fsync before its replace
+        """
+        self.path = path
+        self.open_file = open_file
+        self.create_exporter = create_exporter
+        self.max_items = max_items
+        self.fsync = fsync
+        self.file = _RollingFile()
+        self._validator = create_exporter(io.BytesIO())
+        if not isinstance(self._validator.xg, XmlWriter):
+            raise ValueError('Rolling window feed requires the native XML writer')
+        # (timestamp, sequence number, markup or None, item class, snapshot),
+        # items of the previous feed have negative sequence numbers in the order of the feed
+        self._heap = []
+        self._previous_entries = []  # entries of items of the previous feed, None for dropped items
+        self._previous_keys = {}  # {key: indices of entries} of items of the previous feed
+        self._count = 0
+
+    def _push(self, timestamp, item):
+        key = (timestamp, self._count)
+        if len(self._heap) >= self.max_items and key <= self._heap[0][:2]:
+            return
+        entry = key + (None, item.__class__, item.snapshot())
+        if len(self._heap) >= self.max_items:
+            heapq.heappushpop(self._heap, entry)
+        else:
+            heapq.heappush(self._heap, entry)
+
+    def start_exporting(self):
+        """
+        Load items of the previous feed if it exists
+        """
+        if not os.path.isfile(self.path):
+            return
+        default_timestamp = os.path.getmtime(self.path)
+        encoding = self._validator.encoding
+        with open(self.path, 'rb') as file:
+            for index, (markup, timestamp) in enumerate(iter_feed_items(file, encoding)):
+                markup = markup.decode(encoding)
+                key = get_markup_key(markup)
+                if key is not None:
+                    self._previous_keys.setdefault(key, []).append(index)
+                self._previous_entries.append((default_timestamp if timestamp is None else timestamp,
+                                               -index - 1, markup, None, None))
+
+    def validate_item(self, item):
+        return self._validator.validate_item(item)
+
+    def export_validated_item(self, item):
+        self._count += 1
+        self._push(get_item_timestamp(item), item)
+        if self._previous_keys:
+            key = get_item_key(item)
+            if key is not None and key in self._previous_keys:
+                for index in self._previous_keys.pop(key):
+                    self._previous_entries[index] = None
+
+    def export_item(self, item):
+        self.export_validated_item(self.validate_item(item))
+
+    def flush(self):
+        pass
+
+    def finish_exporting(self):
+        temp_path = self.path + '.tmp'
+        file = self.open_file(temp_path)
+        try:
+            try:
+                exporter = self.create_exporter(file)
+                exporter.start_exporting()
+                entries = heapq.nlargest(self.max_items, self._heap + [entry for entry in self._previous_entries
+                                                                       if entry is not None])
+                for _, _, markup, item_cls, snapshot in entries:
+                    if markup is not None:
+                        exporter.xg.write_raw(markup)
+                    else:
+                        exporter.export_validated_item(item_cls.from_snapshot(snapshot))
+                exporter.finish_exporting()
+                if self.fsync:
+                    file.flush()
+                    os.fsync(file.fileno())
+            finally:
+                file.close()
+            _replace_file(temp_path, self.path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        self._heap = []
+        self._previous_entries = []
+        self._previous_keys = {}
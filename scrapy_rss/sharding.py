@@ -0,0 +1,337 @@
+# -*- coding: utf-8 -*-
+
+import io
+import json
+import os
+import re
+from datetime import datetime
+
+import six
+
+from .compression import COMPRESSION_EXTENSIONS
+from .utils import format_rfc822, get_cached_tzlocal
+
+
+def get_shard_path(path, number):
+    """
+    Get path of the feed shard
+
+    Parameters
+    ----------
+    path : str
+        Path to the feed file that can contain placeholder {shard} (for example, feed-{shard:04d}.rss).
+        Without the placeholder the shard number is inserted before the file extension
+    number : int
+        Number of the shard starting from 1
+
+    Returns
+    -------
+    str
+        Path to the shard file
+    """
+    if '{shard' in path:
+        return path.format(shard=number)
+    root, ext = os.path.splitext(path)
+    if ext.lower() in COMPRESSION_EXTENSIONS:
+        root, uncompressed_ext = os.path.splitext(root)
+        ext = uncompressed_ext + ext
+    return '{}.{}{}'.format(root, number, ext)
+
+
+def get_shards_index_path(path):
+    """
+    Get default path of the index of feed shards
+
+    Parameters
+    ----------
+    path : str
+        Path to the feed file
+
+    Returns
+    -------
+    str
+        Path to the JSON index file
+    """
+    path = re.sub(r'[-_.]?\{shard[^}]*\}', '', path)
+    root, ext = os.path.splitext(path)
+    if ext.lower() in COMPRESSION_EXTENSIONS:
+        root = os.path.splitext(root)[0]
+    return root + '.index.json'
+
+
+ROTATION_FORMATS = {
+    'hourly': '%Y-%m-%dT%H',
+    'daily': '%Y-%m-%d',
+}
+
+
+class _Shard(object):
+    """
+    State of the shard that's being exported
+    """
+
+    __slots__ = ('window', 'file', 'exporter', 'entry', 'items', 'dates')
+
+    def __init__(self, window, file, exporter, entry):
+        self.window = window
+        self.file = file
+        self.exporter = exporter
+        self.entry = entry  # entry of the shard in the index
+        self.items = 0
+        self.dates = None  # (first publication date, last publication date)
+
+
+class _ShardsFile(object):
+    """
+    File-like object that represents open shard files
+    """
+
+    def __init__(self, exporter):
+        self._exporter = exporter
+
+    @property
+    def closed(self):
+        return not self._exporter.open_shards
+
+    def write(self, data):
+        return self._exporter.last_shard.file.write(data)
+
+    def flush(self):
+        for shard in self._exporter.open_shards.values():
+            shard.file.flush()
+
+    def fileno(self):
+        return self._exporter.last_shard.file.fileno()
+
+    def fsync(self):
+        """
+        Sync all open shard files to the disk
+        """
+        for shard in self._exporter.open_shards.values():
+            os.fsync(shard.file.fileno())
+
+    def close(self):
+        self._exporter.close()
+
+
+class ShardedFeedExporter(object):
+    """
+    Exporter that starts a new feed file every given number of items or bytes
+    and/or every time window (hour or day) of the wall-clock time or publication dates of items.
+    Each shard is a complete feed, finished shards are immutable and listed in the JSON index file
+    with their item counts and date ranges of items.
+    Rotated files of previous runs are never overwritten, items of their windows are exported to additional files.
+
+    It has the interface of FeedItemExporter that's used by the pipeline.
+    """
+
+    def __init__(self, path, open_file, create_exporter, max_items=None, max_bytes=None, index_path=None,
+                 fsync=False, rotation=None, rotation_by='time', path_params=None, max_open_windows=3):
+        """
+        Parameters
+        ----------
+        path : str
+            Path to the feed file, see get_shard_path.
+            If rotation is used then it's a template with parameters %(date)s
+            (the time window) and parameters from path_params
+        open_file : callable
+            Function that opens binary file by its path for writing
+        create_exporter : callable
+            Function that creates not started FeedItemExporter for the file
+        max_items : int or None
+            Maximum number of items in a shard
+        max_bytes : int or None
+            Maximum size of a shard file in bytes. A shard is finished
+            when its size reaches the limit, so it exceeds the limit by the closing markup and the last item
+        index_path : str or None
+            Path to the index file (template if rotation is used).
+            None means the path that's derived from the feed path or no index if rotation is used
+        fsync : bool
+            Whether finished shards are synced to the disk by os.fsync
+        rotation : str or None
+            Time window of shards: 'hourly' or 'daily'. None means no time-based rotation
+        rotation_by : str
+            Source of time of items: 'time' (wall-clock time of the export)
+            or 'pubDate' (publication date of the item or wall-clock time if it's not assigned).
+            Items that are late for the finished window are exported to an additional shard of the window
+        path_params : dict or None
+            Parameters of the path template
+        max_open_windows : int
+            Maximum number of windows whose shards are open if rotation is by 'pubDate'.
+            The shard of the oldest window is finished when a shard of a newer window is started,
+            so items that are not sorted by publication dates don't start a new shard per item.
+            Shards of windows are finished one by one if rotation is by 'time'
+        """
+        if rotation is not None and rotation not in ROTATION_FORMATS:
+            raise ValueError('Unknown rotation {!r}, supported rotations: {}'
+                             .format(rotation, ', '.join(sorted(ROTATION_FORMATS))))
+        if rotation_by not in ('time', 'pubDate'):
+            raise ValueError("Rotation must be by 'time' or 'pubDate', not {!r}".format(rotation_by))
+        self.path = path
+        self.open_file = open_file
+        self.create_exporter = create_exporter
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.rotation = rotation
+        self.rotation_by = rotation_by
+        self.path_params = dict(path_params or {})
+        if rotation:
+            self.index_path = index_path % self.path_params if index_path else None
+        else:
+            self.index_path = index_path or get_shards_index_path(path)
+        self.fsync = fsync
+        self.max_open_windows = max(max_open_windows, 1) if rotation_by == 'pubDate' else 1
+        self.file = _ShardsFile(self)
+        self.shards = []  # entries of the index
+        self.open_shards = {}  # {window: _Shard}, the window is None without rotation
+        self.last_shard = None  # the shard of the last exported item
+        self._validator = create_exporter(io.BytesIO())  # it's never started, shards can be absent
+        self._path_shards = {}  # {path: number of its shards}
+
+    def _get_shard_path(self, window):
+        path = self.path
+        if self.rotation:
+            path = path % dict(self.path_params, date=window)
+        number = self._path_shards.get(path, 0)
+        while True:
+            number += 1
+            shard_path = path
+            if not self.rotation or self.max_items or self.max_bytes or number > 1:
+                shard_path = get_shard_path(path, number)
+            # files of windows that are exported by previous runs are immutable
+            if not self.rotation or not os.path.exists(shard_path):
+                break
+        self._path_shards[path] = number
+        return shard_path
+
+    def _get_window(self, item):
+        date = None
+        if self.rotation_by == 'pubDate':
+            date = self._get_pub_date(item)
+        if date is None:
+            date = datetime.now()
+        return date.strftime(ROTATION_FORMATS[self.rotation])
+
+    def _start_shard(self, window=None):
+        path = self._get_shard_path(window)
+        dirname = os.path.dirname(path)
+        if dirname and not os.path.isdir(dirname):
+            try:
+                os.makedirs(dirname)
+            except OSError:
+                if not os.path.isdir(dirname):
+                    raise
+        file = self.open_file(path)
+        try:
+            exporter = self.create_exporter(file)
+            exporter.start_exporting()
+        except Exception:
+            file.close()
+            raise
+        if self.index_path:
+            path = os.path.relpath(path, os.path.dirname(os.path.abspath(self.index_path)))
+        entry = {'file': path, 'items': 0, 'first_pub_date': None, 'last_pub_date': None}
+        if self.rotation:
+            entry['window'] = window
+        self.shards.append(entry)
+        shard = self.open_shards[window] = _Shard(window, file, exporter, entry)
+        return shard
+
+    def _finish_shard(self, shard):
+        del self.open_shards[shard.window]
+        if self.last_shard is shard:
+            self.last_shard = None
+        try:
+            shard.exporter.finish_exporting()
+            if self.fsync:
+                shard.file.flush()
+                os.fsync(shard.file.fileno())
+        finally:
+            shard.file.close()
+        shard.entry['items'] = shard.items
+        if shard.dates:
+            shard.entry['first_pub_date'] = format_rfc822(shard.dates[0])
+            shard.entry['last_pub_date'] = format_rfc822(shard.dates[1])
+        if self.index_path:
+            self._write_index()
+
+    def _write_index(self):
+        data = json.dumps({'shards': self.shards}, indent=2, ensure_ascii=False)
+        with open(self.index_path, 'wb') as index_file:
+            index_file.write(data.encode('utf-8') if isinstance(data, six.text_type) else data)
+
+    @staticmethod
+    def _get_pub_date(item):
+        pub_date = getattr(item, 'pubDate', None)
+        date = getattr(pub_date, 'value', None) if pub_date is not None and pub_date.assigned else None
+        return date if isinstance(date, datetime) else None
+
+    def _update_dates(self, shard, item):
+        date = self._get_pub_date(item)
+        if date is None:
+            return
+        if not date.tzinfo:
+            date = date.replace(tzinfo=get_cached_tzlocal())
+        if shard.dates is None:
+            shard.dates = (date, date)
+        else:
+            shard.dates = (min(shard.dates[0], date), max(shard.dates[1], date))
+
+    def _read_index(self):
+        try:
+            with open(self.index_path, 'rb') as index_file:
+                index = json.loads(index_file.read().decode('utf-8'))
+        except (IOError, OSError, ValueError):
+            return []
+        shards = index.get('shards') if isinstance(index, dict) else None
+        return shards if isinstance(shards, list) else []
+
+    def start_exporting(self):
+        if not self.rotation:
+            self._start_shard()
+        elif self.index_path:
+            # rotated files of previous runs are kept, so they are kept in the index too
+            self.shards = self._read_index()
+
+    def validate_item(self, item):
+        return self._validator.validate_item(item)
+
+    def export_validated_item(self, item):
+        window = self._get_window(item) if self.rotation else None
+        shard = self.open_shards.get(window)
+        if shard is None:
+            shard = self._start_shard(window)
+        shard.exporter.export_validated_item(item)
+        shard.items += 1
+        self.last_shard = shard
+        self._update_dates(shard, item)
+        if self.max_items and shard.items >= self.max_items:
+            self._finish_shard(shard)
+        elif self.max_bytes:
+            shard.exporter.flush()
+            if shard.file.tell() >= self.max_bytes:
+                self._finish_shard(shard)
+        while len(self.open_shards) > self.max_open_windows:
+            self._finish_shard(self.open_shards[min(self.open_shards)])
+
+    def export_item(self, item):
+        self.export_validated_item(self.validate_item(item))
+
+    def flush(self):
+        for shard in self.open_shards.values():
+            shard.exporter.flush()
+
+    def finish_exporting(self):
+        if not self.open_shards and not self.shards:
+            self._start_shard(self._get_window(None) if self.rotation else None)
+        for window in sorted(self.open_shards, key=lambda window: window or ''):
+            self._finish_shard(self.open_shards[window])
+
+    def close(self):
+        """
+        Close open shard files without finishing of their export
+        """
+        for shard in list(self.open_shards.values()):
+            shard.file.close()
+        self.open_shards.clear()
+        self.last_shard = None
@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+
+import heapq
+import tempfile
+from functools import partial
+
+import six
+from six.moves import cPickle as pickle
+from scrapy.utils.misc import load_object
+
+from .meta import MultipleElements
+from .rolling import get_item_timestamp
+
+
+class _Reversed(object):
+    """
+    Sort key with the reversed order
+    """
+
+    __slots__ = ('key',)
+
+    def __init__(self, key):
+        self.key = key
+
+    def __lt__(self, other):
+        return other.key < self.key
+
+    def __eq__(self, other):
+        return self.key == other.key
+
+    def __getstate__(self):
+        return self.key
+
+    def __setstate__(self, state):
+        self.key = state
+
+
+def _get_element_content(name, item):
+    element = getattr(item, name, None)
+    if isinstance(element, MultipleElements):
+        element = element[0] if len(element) else None
+    if element is None or not element.assigned or not element.content_name:
+        return u''
+    return six.text_type(element._attrs[element.content_name].value)
+
+
+def get_sort_key(sort_by):
+    """
+    Get function of the sort key of feed items
+
+    Parameters
+    ----------
+    sort_by : str or callable
+        'pubDate' (publication date, the item without it is considered as published at its export),
+        name of other item element (the element content is compared as a string,
+        content of the first element is compared for multiple elements),
+        path to a function or the function itself that gets the feed item and returns its sort key
+
+    Returns
+    -------
+    callable
+    """
+    if callable(sort_by):
+        return sort_by
+    if sort_by == 'pubDate':
+        return get_item_timestamp
+    if '.' in sort_by:
+        return load_object(sort_by)
+    return partial(_get_element_content, sort_by)
+
+
+def _iter_run(file):
+    file.seek(0)
+    load = pickle.Unpickler(file).load
+    while True:
+        try:
+            yield load()
+        except EOFError:
+            return
+
+
+class SortedFeedExporter(object):
+    """
+    Exporter that sorts feed items before their export by the wrapped exporter.
+
+    Snapshots of items are buffered in memory until the memory limit is exceeded,
+    then they are sorted and spilled to a temporary run file.
+    On finish of the export sorted runs are merged directly into the wrapped exporter.
+    The sort is stable, so items with equal keys are exported in the order of their export.
+
+    It has the interface of FeedItemExporter that's used by the pipeline.
+    """
+
+    def __init__(self, exporter, key=get_item_timestamp, reverse=False, memory_limit=64 * 1024 * 1024,
+                 temp_dir=None):
+        """
+        Parameters
+        ----------
+        exporter : FeedItemExporter
+            Already started exporter that exports sorted items
+        key : callable
+            Function that gets the feed item and returns its sort key
+        reverse : bool
+            Whether items are sorted in the descending order
+        memory_limit : int
+            Approximate maximum size of buffered snapshots in bytes
+        temp_dir : str or None
+            Directory of temporary run files, None means the default temporary directory
+        """
+        self.exporter = exporter
+        self.key = key
+        self.reverse = reverse
+        self.memory_limit = memory_limit
+        self.temp_dir = temp_dir
+        self._buffer = []  # (sort key, sequence number, pickled item class and snapshot)
+        self._buffer_size = 0
+        self._runs = []
+        self._count = 0
+
+    def validate_item(self, item):
+        return self.exporter.validate_item(item)
+
+    def export_validated_item(self, item):
+        key = self.key(item)
+        data = pickle.dumps((item.__class__, item.snapshot()), pickle.HIGHEST_PROTOCOL)
+        self._count += 1
+        self._buffer.append((_Reversed(key) if self.reverse else key, self._count, data))
+        self._buffer_size += len(data) + 100  # approximate size of the entry
+        if self._buffer_size >= self.memory_limit:
+            self._spill()
+
+    def export_item(self, item):
+        self.export_validated_item(self.validate_item(item))
+
+    def _spill(self):
+        """
+        Write sorted buffered items to a new run file
+        """
+        self._buffer.sort()
+        run = tempfile.TemporaryFile(dir=self.temp_dir)
+        try:
+            pickler = pickle.Pickler(run, pickle.HIGHEST_PROTOCOL)
+            for entry in self._buffer:
+                pickler.dump(entry)
+                pickler.clear_memo()
+            run.flush()
+        except Exception:
+            run.close()
+            raise
+        self._runs.append(run)
+        self._buffer = []
+        self._buffer_size = 0
+
+    def flush(self):
+        self.exporter.flush()
+
+    def finish_exporting(self):
+        try:
+            self._buffer.sort()
+            entries = heapq.merge(*[_iter_run(run) for run in self._runs] + [iter(self._buffer)])
+            export = self.exporter.export_validated_item
+            for _, _, data in entries:
+                item_cls, snapshot = pickle.loads(data)
+                export(item_cls.from_snapshot(snapshot))
+        finally:
+            for run in self._runs:
+                run.close()
+            self._runs = []
+            self._buffer = []
+            self._buffer_size = 0
+        self.exporter.finish_exporting()
@@ -1,8 +1,8 @@
 # -*- coding: utf-8 -*-
 
-import locale
-from datetime import datetime
+from datetime import datetime, timedelta
 import functools
+import time
 import warnings
 try:
     from collections.abc import Mapping, MutableMapping, Iterable
@@ -21,8 +21,71 @@ def get_tzlocal():
     return tzlocal
 
 
+_tzlocal_cache = {}
+
+
+def get_cached_tzlocal():
+    """
+    Get the local timezone that's resolved once
+    for each timezone configuration of the process and daylight saving time state
+
+    Returns
+    -------
+    tzinfo
+        Local timezone
+    """
+    key = (time.tzname, time.localtime().tm_isdst)
+    try:
+        return _tzlocal_cache[key]
+    except KeyError:
+        tzlocal = _tzlocal_cache[key] = get_tzlocal()
+        return tzlocal
+
+
+RFC822_WEEKDAYS = ('Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun')
+RFC822_MONTHS = ('Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec')
+RFC822_CACHE_SIZE = 256
+
+
+def _format_utcoffset(date):
+    """
+    Format UTC offset of the datetime like the directive %z of strftime
+    """
+    offset = date.utcoffset()
+    if offset is None:
+        return ''
+    sign = '+'
+    if offset < timedelta(0):
+        sign = '-'
+        offset = -offset
+    hours, seconds = divmod(offset.days * 86400 + offset.seconds, 3600)
+    minutes, seconds = divmod(seconds, 60)
+    if offset.microseconds:
+        return '%s%02d%02d%02d.%06d' % (sign, hours, minutes, seconds, offset.microseconds)
+    if seconds:
+        return '%s%02d%02d%02d' % (sign, hours, minutes, seconds)
+    return '%s%02d%02d' % (sign, hours, minutes)
+
+
+def _format_rfc822(date, tzinfo=None, utcoffset=None):
+    year = date.year
+    return '%s, %02d %s %s %02d:%02d:%02d %s' % (
+        RFC822_WEEKDAYS[date.weekday()], date.day, RFC822_MONTHS[date.month - 1],
+        year if year >= 1000 else date.strftime('%Y'),
+        date.hour, date.minute, date.second, _format_utcoffset(date))
+
+
+if hasattr(functools, 'lru_cache'):
+    # the cache key includes timezone and UTC offset since aware datetimes with different timezones can be equal
+    # and datetimes that differ only in fold are equal too
+    _format_rfc822 = functools.lru_cache(maxsize=RFC822_CACHE_SIZE)(_format_rfc822)
+
+
 def format_rfc822(date):
     """
+    Format datetime according to RFC 822 standard
+    independently of the current locale.
+    Naive datetime is interpreted as local time.
 
     Parameters
     ----------
@@ -34,13 +97,9 @@ def format_rfc822(date):
     str
         Stringified datetime object according to RFC 822 standard
     """
-    orig_locale = locale.getlocale(locale.LC_TIME)
-    locale.setlocale(locale.LC_TIME, 'C')
     if not date.tzinfo:
-        date = date.replace(tzinfo=get_tzlocal())
-    date = date.strftime('%a, %d %b %Y %H:%M:%S %z')
-    locale.setlocale(locale.LC_TIME, orig_locale)
-    return date
+        date = date.replace(tzinfo=get_cached_tzlocal())
+    return _format_rfc822(date, date.tzinfo, date.utcoffset())
 
 
 def object_to_list(obj):
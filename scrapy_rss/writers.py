@@ -0,0 +1,335 @@
+# -*- coding: utf-8 -*-
+
+import codecs
+import re
+import warnings
+from xml.sax.saxutils import XMLGenerator, escape, quoteattr
+
+import six
+from scrapy.utils.misc import load_object
+
+try:
+    from lxml import etree
+except ImportError:
+    etree = None
+
+
+XML_NAMESPACE = 'http://www.w3.org/XML/1998/namespace'
+
+_CHARACTERS_TO_ESCAPE = re.compile(u'[&<>]')
+_ATTR_CHARACTERS_TO_ESCAPE = re.compile(u'[&<>"\n\r\t]')
+
+
+class XmlWriter(object):
+    """
+    Fast XML writer with the interface of SAX XMLGenerator that's used by feed exporters.
+
+    It builds XML markup as text chunks and writes them encoded to the output file in large batches.
+    Qualified names of elements and attributes are cached until namespace mappings are changed.
+    The output is identical to the output of XMLGenerator.
+    """
+
+    def __init__(self, out, encoding='utf-8', buffer_chunks=4096):
+        """
+        Parameters
+        ----------
+        out : file-like object
+            Binary file-like object with write method
+        encoding : str
+            Output encoding
+        buffer_chunks : int
+            Number of text chunks that are buffered before writing to the output
+        """
+        self._out = out
+        self._encoding = encoding
+        self._encoder = codecs.getincrementalencoder(encoding)('xmlcharrefreplace')
+        self._buffer_chunks = buffer_chunks
+        self._chunks = []
+        self._write = self._chunks.append
+        self._ns_contexts = [{}]  # stack of {uri: prefix} dicts
+        self._undeclared_ns_maps = []
+        self._qnames = {}
+        self._captured = None  # captured markup that's already flushed
+        self._capture_start = 0
+
+    def flush(self):
+        """
+        Write buffered data to the output
+        """
+        if self._chunks:
+            if self._captured is not None:
+                self._captured.append(u''.join(self._chunks[self._capture_start:]))
+                self._capture_start = 0
+            data = self._encoder.encode(u''.join(self._chunks))
+            written = self._out.write(data)
+            # raw (unbuffered) files can write only part of data
+            while written is not None and written < len(data):
+                data = data[written:]
+                written = self._out.write(data)
+            del self._chunks[:]
+
+    def start_capture(self):
+        """
+        Start capturing of the written markup
+        """
+        self._captured = []
+        self._capture_start = len(self._chunks)
+
+    def stop_capture(self):
+        """
+        Stop capturing of the written markup
+
+        Returns
+        -------
+        str
+            Markup that's written since the capture start
+        """
+        self._captured.append(u''.join(self._chunks[self._capture_start:]))
+        markup = u''.join(self._captured)
+        self._captured = None
+        self._capture_start = 0
+        return markup
+
+    def write_raw(self, markup):
+        """
+        Write already serialized markup as is
+
+        Parameters
+        ----------
+        markup : str
+            Serialized markup
+        """
+        self._write(markup)
+
+    def _qname(self, name):
+        """
+        Build a qualified name from a pair (namespace_uri, local_name)
+        """
+        try:
+            return self._qnames[name]
+        except KeyError:
+            pass
+        ns_uri, local_name = name
+        qname = local_name
+        if ns_uri:
+            if ns_uri == XML_NAMESPACE:
+                qname = 'xml:' + local_name
+            else:
+                prefix = self._ns_contexts[-1][ns_uri]
+                if prefix:
+                    qname = prefix + ':' + local_name
+        self._qnames[name] = qname
+        return qname
+
+    @staticmethod
+    def _escape(data):
+        if _CHARACTERS_TO_ESCAPE.search(data):
+            return escape(data)
+        return data
+
+    @staticmethod
+    def _quoteattr(data):
+        if _ATTR_CHARACTERS_TO_ESCAPE.search(data):
+            return quoteattr(data)
+        return u'"' + data + u'"'
+
+    def startDocument(self):
+        self._write(u'<?xml version="1.0" encoding="%s"?>\n' % self._encoding)
+
+    def endDocument(self):
+        self.flush()
+
+    def startPrefixMapping(self, prefix, uri):
+        context = self._ns_contexts[-1].copy()
+        context[uri] = prefix
+        self._ns_contexts.append(context)
+        self._undeclared_ns_maps.append((prefix, uri))
+        self._qnames = {}
+
+    def endPrefixMapping(self, prefix):
+        self._ns_contexts.pop()
+        self._qnames = {}
+
+    def map_declared_prefix(self, prefix, uri):
+        """
+        Map the prefix to the namespace that's already declared in the enclosing markup,
+        so the namespace is not declared again
+
+        Parameters
+        ----------
+        prefix : str or None
+            Namespace prefix
+        uri : str
+            Namespace URI
+        """
+        context = self._ns_contexts[-1].copy()
+        context[uri] = prefix
+        self._ns_contexts.append(context)
+        self._qnames = {}
+
+    def startElement(self, name, attrs):
+        chunks = [u'<', name]
+        for attr_name, value in attrs.items():
+            chunks.append(u' %s=%s' % (attr_name, self._quoteattr(value)))
+        chunks.append(u'>')
+        self._write(u''.join(chunks))
+
+    def endElement(self, name):
+        self._write(u'</%s>' % name)
+        if len(self._chunks) >= self._buffer_chunks:
+            self.flush()
+
+    def startElementNS(self, name, qname, attrs):
+        if not attrs and not self._undeclared_ns_maps:
+            self._write(u'<' + self._qname(name) + u'>')
+            return
+        chunks = [u'<', self._qname(name)]
+        if self._undeclared_ns_maps:
+            for prefix, uri in self._undeclared_ns_maps:
+                if prefix:
+                    chunks.append(u' xmlns:%s="%s"' % (prefix, uri))
+                else:
+                    chunks.append(u' xmlns="%s"' % uri)
+            self._undeclared_ns_maps = []
+        for attr_name, value in attrs.items():
+            chunks.append(u' %s=%s' % (self._qname(attr_name), self._quoteattr(value)))
+        chunks.append(u'>')
+        self._write(u''.join(chunks))
+
+    def endElementNS(self, name, qname):
+        self._write(u'</' + self._qname(name) + u'>')
+        if len(self._chunks) >= self._buffer_chunks:
+            self.flush()
+
+    def characters(self, content):
+        if content:
+            if not isinstance(content, six.text_type):
+                content = six.text_type(content, self._encoding)
+            self._write(self._escape(content))
+
+    def ignorableWhitespace(self, content):
+        if content:
+            if not isinstance(content, six.text_type):
+                content = six.text_type(content, self._encoding)
+            self._write(content)
+
+
+class LxmlXmlWriter(object):
+    """
+    XML writer with the interface of SAX XMLGenerator that's based on the incremental writer of lxml.
+
+    Serialization and escaping are performed by lxml, the feed is streamed to the output file.
+    The output is equivalent to the output of XMLGenerator
+    but it can differ in quoting of the XML declaration and escaping of attributes.
+    """
+
+    def __init__(self, out, encoding='utf-8'):
+        """
+        Parameters
+        ----------
+        out : file-like object
+            Binary file-like object with write method
+        encoding : str
+            Output encoding
+        """
+        if etree is None:
+            raise ImportError('lxml is required for LxmlXmlWriter')
+        self._out = out
+        self._encoding = encoding
+        self._xmlfile = None
+        self._writer = None
+        self._elements = []
+        self._undeclared_ns_maps = {}
+
+    @staticmethod
+    def _tag(name):
+        ns_uri, local_name = name
+        return '{%s}%s' % (ns_uri, local_name) if ns_uri else local_name
+
+    def flush(self):
+        """
+        Write buffered data to the output
+        """
+        if self._writer is not None:
+            self._writer.flush()
+
+    def startDocument(self):
+        self._xmlfile = etree.xmlfile(self._out, encoding=self._encoding)
+        self._writer = self._xmlfile.__enter__()
+        self._writer.write_declaration()
+
+    def endDocument(self):
+        self._xmlfile.__exit__(None, None, None)
+        self._xmlfile = self._writer = None
+
+    def startPrefixMapping(self, prefix, uri):
+        self._undeclared_ns_maps[prefix or None] = uri
+
+    def endPrefixMapping(self, prefix):
+        pass
+
+    def _start_element(self, tag, attrib):
+        element = self._writer.element(tag, attrib, nsmap=self._undeclared_ns_maps or None)
+        element.__enter__()
+        self._elements.append(element)
+        self._undeclared_ns_maps = {}
+
+    def _end_element(self):
+        self._elements.pop().__exit__(None, None, None)
+
+    def startElement(self, name, attrs):
+        self._start_element(name, dict(attrs.items()))
+
+    def endElement(self, name):
+        self._end_element()
+
+    def startElementNS(self, name, qname, attrs):
+        self._start_element(self._tag(name),
+                            {self._tag(attr_name): value for attr_name, value in attrs.items()})
+
+    def endElementNS(self, name, qname):
+        self._end_element()
+
+    def characters(self, content):
+        if content:
+            if not isinstance(content, six.text_type):
+                content = six.text_type(content, self._encoding)
+            self._writer.write(content)
+
+    ignorableWhitespace = characters
+
+
+XML_WRITERS = {
+    'native': XmlWriter,
+    'sax': XMLGenerator,
+    'lxml': LxmlXmlWriter,
+}
+
+
+def get_xml_writer_cls(writer):
+    """
+    Get class of XML writer
+
+    Parameters
+    ----------
+    writer : str or type or None
+        Name of the predefined writer ('native', 'sax' or 'lxml'),
+        path to the writer class or the writer class itself.
+        None means the default native writer
+
+    Returns
+    -------
+    type
+        Writer class that's constructed with arguments (file, encoding)
+    """
+    if not writer:
+        return XmlWriter
+    if isinstance(writer, six.string_types):
+        if writer in XML_WRITERS:
+            writer = XML_WRITERS[writer]
+        else:
+            writer = load_object(writer)
+    if writer is LxmlXmlWriter and etree is None:
+        warnings.warn('lxml is not installed, SAX XML writer is used instead')
+        return XMLGenerator
+    return writer
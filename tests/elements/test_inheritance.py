@@ -86,6 +86,8 @@ class TestInheritance(RssTestCase):
     @parameterized.expand((level,) for level in range(3, 6))
     def test_inherited_children_with_attrs(self, level):
         elem = Element5()
+        self.assertFalse([comp for comp in elem.__dict__.values() if isinstance(comp, (ElementAttribute, Element))],
+                         msg="Components must be shared with the class until the first access")
 
         children_count = 3*2
         attrs_count = 3*2
@@ -181,6 +183,17 @@ class TestInheritance(RssTestCase):
         self.assertFalse(base_elem.compatible_with(derived_elem))
         self.assertFalse(derived_elem.compatible_with(base_elem))
 
+    @parameterized.expand(((elem_cls,) for elem_cls in [Element, Element2, Element3, Element4, Element5]),
+                          name_func=full_name_func)
+    def test_inherited_serialization_plan(self, elem_cls):
+        attrs_plan, content_name, children_plan = elem_cls._serialization_plan
+        self.assertEqual([(attr_name, attr_name.xml_name)
+                          for attr_name, attr in elem_cls._attrs.items() if not attr.is_content],
+                         list(attrs_plan))
+        self.assertIs(elem_cls._content_name, content_name)
+        self.assertEqual([(child_name, child_name.xml_name) for child_name in elem_cls._children],
+                         list(children_plan))
+
 
 if __name__ == "__main__":
     unittest.main()
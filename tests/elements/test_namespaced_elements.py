@@ -16,18 +16,12 @@ from scrapy_rss.meta import BaseNSComponent, ElementAttribute, Element, Multiple
 
 class TestNamespacedElements(RssTestCase):
     if six.PY3:
-        def tearDown(self):
-            if self.id().endswith('test_partial_init_basenscomponent'):
-                BaseNSComponent._ns_prefix = ''
-
-
         def test_partial_init_basenscomponent(self):
             class BS(BaseNSComponent):
                 def __init__(self, *args, **kwargs):
                     raise TypeError
 
-            del BaseNSComponent._ns_prefix
-
+            # namespace slots stay uninitialized
             try:
                 BS()
             except TypeError as e:
@@ -266,6 +260,61 @@ class TestNamespacedElements(RssTestCase):
         for comp_name, comp in chain(elem.attrs.items(), elem.children.items()):
             self.assertNotIn('__', comp_name.name, msg="Name {!r} of component {!r} contains namespace prefix".format(comp_name, comp))
 
+    def test_static_namespaces(self):
+        class Element0(Element):
+            attr00 = ElementAttribute(is_content=True)
+            attr01 = ElementAttribute(ns_prefix='attr_prefix01', ns_uri='attr_id01')
+
+        class Element1(Element):
+            elem10 = Element0(ns_prefix='el_prefix10', ns_uri='el_id10')
+            elem11 = Element0()
+            elem12 = MultipleElements(Element0)
+
+        class Element2(Element):
+            elem20 = Element1()
+            elem21 = Element0()
+
+        self.assertEqual([(str(attr_name), ns) for attr_name, ns in Element0._attrs_namespaces],
+                         [('attr01', ('attr_prefix01', 'attr_id01'))])
+        self.assertEqual(Element0._children_namespaces, frozenset())
+        self.assertFalse(Element0._namespaces_delta)
+        self.assertEqual(Element1._attrs_namespaces, ())
+        self.assertEqual(Element1._children_namespaces,
+                         {('el_prefix10', 'el_id10'), ('attr_prefix01', 'attr_id01')})
+        self.assertTrue(Element1._namespaces_delta)
+        self.assertEqual(Element2._children_namespaces,
+                         {('el_prefix10', 'el_id10'), ('attr_prefix01', 'attr_id01')})
+        self.assertTrue(Element2._namespaces_delta)
+
+    def test_dynamic_namespaces(self):
+        class Element0(Element):
+            attr00 = ElementAttribute(is_content=True)
+
+        class Element1(Element):
+            elem10 = Element0()
+
+        class Element2(Element):
+            elem20 = Element1()
+
+        elem = Element2()
+        elem.elem20.elem10 = 'value'
+        self.assertEqual(elem.get_namespaces(), set())
+        self.assertFalse(elem._namespaces_delta)
+
+        elem.elem20.elem10.ns_uri = 'el_id10'
+        self.assertTrue(elem._namespaces_delta)
+        self.assertTrue(elem.elem20._namespaces_delta)
+        self.assertEqual(elem.get_namespaces(), {('', 'el_id10')})
+        elem.elem20.elem10.ns_prefix = 'el_prefix10'
+        self.assertEqual(elem.get_namespaces(), {('el_prefix10', 'el_id10')})
+        self.assertEqual(deepcopy(elem).get_namespaces(), {('el_prefix10', 'el_id10')})
+        self.assertFalse(Element2()._namespaces_delta)
+
+        other_elem = Element2()
+        other_elem.elem20 = elem.elem20
+        self.assertTrue(other_elem._namespaces_delta)
+        self.assertEqual(other_elem.get_namespaces(), {('el_prefix10', 'el_id10')})
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 
 import unittest
+from copy import deepcopy
 from itertools import chain, combinations, repeat, product, islice
 
 import six
@@ -288,6 +289,102 @@ class TestNestedElements(RssTestCase):
             setattr(element, elem_name, UnusedElement(value))
 
 
+    @parameterized.expand((attr_path, value)
+                          for attr_path in ATTRIBUTES_PATHS
+                          for value in NO_NONE_ATTR_VALUES)
+    def test_shared_components_isolation(self, attr_path, value):
+        root1 = ElementFirstLevel0()
+        root2 = ElementFirstLevel0()
+        element = root1
+        for component_name in attr_path[:-1]:
+            element = getattr(element, component_name)
+        setattr(element, attr_path[-1], value)
+
+        for root in (root2, ElementFirstLevel0()):
+            component = root
+            for component_name in attr_path:
+                component = getattr(component, component_name)
+            self.assertIsNone(component)
+            self.assertFalse(root.assigned)
+
+    def test_template_values_isolation(self):
+        class ElementWithDefaults(meta.Element):
+            attr0 = meta.ElementAttribute(value='default')
+            attr1 = meta.ElementAttribute(is_content=True)
+
+        class ParentElement(meta.Element):
+            elem0 = ElementWithDefaults(attr1='template value')
+            elem1 = ElementWithDefaults()
+
+        parent1 = ParentElement()
+        parent2 = ParentElement()
+        self.assertEqual('template value', parent1.elem0.attr1)
+        parent1.elem0.attr1 = 'new value'
+        parent1.elem1.attr0 = None
+        self.assertEqual('template value', parent2.elem0.attr1)
+        self.assertEqual('default', parent2.elem1.attr0)
+
+        parent2.clear()
+        self.assertFalse(parent2.assigned)
+        self.assertIsNone(parent2.elem0.attr0)
+        self.assertIsNone(parent2.elem1.attr0)
+        parent3 = ParentElement()
+        self.assertEqual('template value', parent3.elem0.attr1)
+        self.assertEqual('default', parent3.elem0.attr0)
+        self.assertEqual('default', parent3.elem1.attr0)
+
+    @parameterized.expand((attr_path,) for attr_path in ATTRIBUTES_PATHS)
+    def test_assigned_propagation(self, attr_path):
+        root = ElementFirstLevel0()
+        elements = [root]
+        for component_name in attr_path[:-1]:
+            elements.append(getattr(elements[-1], component_name))
+        setattr(elements[-1], attr_path[-1], 'value')
+        for element in elements:
+            self.assertTrue(element.assigned)
+
+        copied_root = deepcopy(root)
+        setattr(elements[-1], attr_path[-1], None)
+        for element in elements:
+            self.assertFalse(element.assigned)
+        self.assertTrue(copied_root.assigned)
+
+        copied_element = copied_root
+        for component_name in attr_path[:-1]:
+            copied_element = getattr(copied_element, component_name)
+        copied_element.clear()
+        self.assertFalse(copied_root.assigned)
+
+        setattr(elements[-1], attr_path[-1], 'value')
+        root.clear()
+        for element in elements:
+            self.assertFalse(element.assigned)
+
+    def test_assigned_propagation_on_replacement(self):
+        root = ElementZeroLevel0()
+        parent = root.elem000
+        old_child = parent.elem110
+        parent.elem110 = ElementSecondLevel1(attr211='value')
+        self.assertTrue(root.assigned)
+
+        old_child.attr211 = 'value'
+        old_child.attr211 = None
+        self.assertTrue(root.assigned)
+
+        parent.elem110.elem210.elem300.attr400 = 'value'
+        parent.elem110.attr211 = None
+        self.assertTrue(root.assigned)
+        parent.elem110.elem210.elem300 = None
+        self.assertFalse(parent.elem110.assigned)
+
+        parent.elem110 = {'attr211': 'value'}
+        self.assertTrue(root.assigned)
+        self.assertTrue(parent.assigned)
+        parent.elem110 = ElementSecondLevel1()
+        self.assertFalse(parent.elem110.assigned)
+        root.elem000 = ElementFirstLevel1()
+        self.assertFalse(root.elem000.assigned)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,11 +1,17 @@
 # -*- coding: utf-8 -*-
 
+import pickle
 import unittest
+from copy import deepcopy
 from parameterized import parameterized
 from itertools import chain, product, combinations, combinations_with_replacement
 from functools import partial
 import pytest
 import six
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
 
 from tests import predefined_items
 from tests.utils import RssTestCase, get_dict_attr, full_name_func
@@ -417,6 +423,43 @@ class TestSimpleElements(RssTestCase):
             with six.assertRaisesRegex(self, InvalidElementValueError, msg):
                 setattr(item, str(elem_name), elem2)
 
+    @parameterized.expand((component,) for component in (
+        NSComponentName('prefix__name', ns_uri='id'),
+        ElementAttribute(value='value', required=True, ns_prefix='prefix', ns_uri='id'),
+    ))
+    def test_slotted_components(self, component):
+        self.assertFalse(hasattr(component, '__dict__'))
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            restored_component = pickle.loads(pickle.dumps(component, protocol))
+            self.assertEqual(repr(restored_component), repr(component))
+        copied_component = deepcopy(component)
+        if isinstance(component, NSComponentName):
+            self.assertIs(copied_component, component)  # names are interned
+        else:
+            self.assertIsNot(copied_component, component)
+        self.assertEqual(repr(copied_component), repr(component))
+
+    @pytest.mark.skipif(tracemalloc is None, reason='tracemalloc is not available')
+    def test_item_memory_budget(self):
+        def make_item(idx):
+            item = RssItem()
+            item.title = 'Title {}'.format(idx)
+            item.link = 'http://example.com/{}'.format(idx)
+            item.description = 'Description {}'.format(idx)
+            item.category = ['first', 'second']
+            item.guid = {'value': 'id{}'.format(idx), 'isPermaLink': False}
+            return item
+
+        make_item(0)
+        tracemalloc.start()
+        try:
+            items = [make_item(idx) for idx in range(100)]
+            size, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        self.assertEqual(100, len(items))
+        self.assertLess(size / 100, 7 * 1024)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+import os
+import re
+from io import BytesIO
+
+import pytest
+from lxml import etree
+from scrapy.exceptions import CloseSpider, NotConfigured
+
+from scrapy_rss import RssItem
+from scrapy_rss.appending import open_feed_for_append, read_declared_namespaces, update_last_build_date
+from scrapy_rss.meta import Element, ElementAttribute
+from tests import predefined_items
+from tests.utils import FeedSettings, export_feed, read_feed
+
+
+NS_ITEMS = [(namespaces, item_cls, item)
+            for item_name, namespaces, item_cls, item in predefined_items.PredefinedItems().ns_items
+            if not isinstance(item_cls, str)][::7]
+
+LAST_BUILD_DATE = re.compile(br'<lastBuildDate>[^<]*</lastBuildDate>')
+
+DC_URI = 'http://purl.org/dc/elements/1.1/'
+
+
+class CreatorElement(Element):
+    value = ElementAttribute(is_content=True, required=True)
+
+
+class DcItem(RssItem):
+    creator = CreatorElement(ns_prefix='dc', ns_uri=DC_URI)
+
+
+@pytest.mark.parametrize('async_export', [False, True])
+@pytest.mark.parametrize('namespaces,item_cls,item', [({}, None, RssItem(title='Title'))] + NS_ITEMS)
+def test_append(async_export, namespaces, item_cls, item):
+    settings = {'FEED_NAMESPACES': namespaces, 'FEED_ASYNC_EXPORT': async_export}
+    if item_cls:
+        settings['FEED_ITEM_CLASS'] = item_cls
+    with FeedSettings() as feed_settings:
+        export_feed(feed_settings, [item] * 5, **settings)
+        expected = read_feed(feed_settings['feed_file'])
+        os.remove(feed_settings['feed_file'])
+        export_feed(feed_settings, [item] * 3, FEED_APPEND=True, **settings)
+        export_feed(feed_settings, [item] * 2, FEED_APPEND=True, **settings)
+        data = read_feed(feed_settings['feed_file'])
+        export_feed(feed_settings, [], FEED_APPEND=True, **settings)
+        assert LAST_BUILD_DATE.sub(b'', read_feed(feed_settings['feed_file'])) == LAST_BUILD_DATE.sub(b'', data)
+    assert LAST_BUILD_DATE.sub(b'', data) == LAST_BUILD_DATE.sub(b'', expected)
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_append_with_undeclared_namespaces(workers):
+    settings = {'FEED_EXPORT_WORKERS': workers}
+    with FeedSettings() as feed_settings:
+        export_feed(feed_settings, [RssItem(title='Title')], **settings)
+        item = DcItem(title='Title 2')
+        item.creator = 'Creator'
+        export_feed(feed_settings, [item], FEED_APPEND=True, FEED_ITEM_CLASS=DcItem, **settings)
+        export_feed(feed_settings, [item], FEED_APPEND=True, FEED_ITEM_CLASS=DcItem,
+                    FEED_NAMESPACES={'dc': 'http://example.com/another-dc'}, **settings)
+        data = read_feed(feed_settings['feed_file'])
+    feed = etree.fromstring(data)
+    assert feed.xpath('//item/title/text()') == ['Title', 'Title 2', 'Title 2']
+    assert feed.xpath('//item/dc:creator/text()', namespaces={'dc': DC_URI}) == ['Creator', 'Creator']
+
+
+def test_read_declared_namespaces():
+    file = BytesIO(b'<?xml version="1.0"?>\n<rss xmlns:dc="http://purl.org/dc/elements/1.1/" version="2.0" '
+                   b"xmlns='http://example.com/?a=1&amp;b=2'><channel xmlns:a=\"id\"></channel></rss>")
+    file.seek(10)
+    assert read_declared_namespaces(file) == {'dc': DC_URI, None: 'http://example.com/?a=1&b=2'}
+    assert file.tell() == 10
+    assert read_declared_namespaces(BytesIO(b'<rss><channel></channel></rss>')) == {}
+
+
+def test_append_to_incomplete_feed():
+    with FeedSettings() as feed_settings:
+        with open(feed_settings['feed_file'], 'wb') as file:
+            file.write(b'<?xml version="1.0" encoding="utf-8"?>\n<rss version="2.0"><channel>')
+        with pytest.raises(CloseSpider) as exc_info:
+            export_feed(feed_settings, [], FEED_APPEND=True)
+        assert 'not a complete feed' in exc_info.value.reason
+        with pytest.raises(ValueError, match='not supported'):
+            export_feed(feed_settings, [], FEED_APPEND=True, FEED_COMPRESSION='gzip')
+
+
+def test_update_last_build_date():
+    feed = (b'<rss><channel><lastBuildDate>Sat, 01 Jan 2000 00:00:00 +0000</lastBuildDate>'
+            b'<item><lastBuildDate>Sat, 01 Jan 2000 00:00:00 +0000</lastBuildDate></item></channel></rss>')
+    file = BytesIO(feed)
+    file.seek(len(feed))
+    update_last_build_date(file, u'<lastBuildDate>Sun, 02 Jan 2000 00:00:00 +0000</lastBuildDate>')
+    assert file.tell() == len(feed)
+    assert file.getvalue() == feed.replace(b'Sat, 01', b'Sun, 02', 1)
+    with pytest.warns(UserWarning, match='another size'):
+        update_last_build_date(file, u'<lastBuildDate>Sun, 02 Jan 2000</lastBuildDate>')
+    assert file.getvalue() == feed.replace(b'Sat, 01', b'Sun, 02', 1)
+
+
+def test_open_feed_for_append():
+    with FeedSettings() as feed_settings:
+        with open(feed_settings['feed_file'], 'wb') as file:
+            file.write(b'<rss><channel><item></item></channel></rss>\n')
+        with open_feed_for_append(feed_settings['feed_file']) as file:
+            assert file.tell() == len(b'<rss><channel><item></item>')
+        with open(feed_settings['feed_file'], 'rb') as file:
+            assert file.read() == b'<rss><channel><item></item></channel></rss>\n'
+
+
+@pytest.mark.parametrize('settings,feed_settings_update,exception', [
+    ({'FEED_XML_WRITER': 'sax'}, {}, ValueError),
+    ({}, {'feed_title': None}, NotConfigured),
+    ({}, {'feed_description': None}, NotConfigured),
+])
+def test_append_with_invalid_settings(settings, feed_settings_update, exception):
+    with FeedSettings() as feed_settings:
+        export_feed(feed_settings, [RssItem(title='Title')])
+        data = read_feed(feed_settings['feed_file'])
+        with pytest.raises(exception):
+            export_feed(dict(feed_settings, **feed_settings_update), [RssItem(title='Title 2')],
+                        FEED_APPEND=True, **settings)
+        assert read_feed(feed_settings['feed_file']) == data
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+import bz2
+import gzip
+from io import BytesIO
+
+import pytest
+import six
+from scrapy.exceptions import CloseSpider
+
+from scrapy_rss import RssItem
+from scrapy_rss.compression import get_compression
+from tests.utils import FeedSettings, export_feed, read_feed
+
+
+DECOMPRESSORS = {
+    None: lambda data: data,
+    'gzip': lambda data: gzip.GzipFile(fileobj=BytesIO(data)).read(),
+    'bz2': bz2.decompress,
+}
+if six.PY3:
+    import lzma
+    DECOMPRESSORS['xz'] = lzma.decompress
+
+py3_only = pytest.mark.skipif(six.PY2, reason='bz2 and xz compressions of the feed require Python 3')
+
+
+def _items(data):
+    return data[data.index(b'<item>'):data.rindex(b'</item>')]
+
+
+def test_get_compression():
+    assert get_compression('feed.rss') is None
+    assert get_compression('feed.rss.gz') == 'gzip'
+    assert get_compression('feed.rss.GZIP') == 'gzip'
+    assert get_compression('feed.rss.bz2') == 'bz2'
+    assert get_compression('feed.xz') == 'xz'
+    assert get_compression('feed.rss.gz', 'none') is None
+    assert get_compression('feed.rss', 'bz2') == 'bz2'
+    with pytest.raises(ValueError, match='Unknown compression'):
+        get_compression('feed.rss', 'zip')
+
+
+@pytest.mark.parametrize('async_export', [False, True])
+@pytest.mark.parametrize('feed_file,settings,compression', [
+    ('feed.rss.gz', {}, 'gzip'),
+    pytest.param('feed.rss.bz2', {}, 'bz2', marks=py3_only),
+    pytest.param('feed.rss.xz', {'FEED_COMPRESSION_LEVEL': 1}, 'xz', marks=py3_only),
+    ('feed.rss', {'FEED_COMPRESSION': 'gzip', 'FEED_COMPRESSION_LEVEL': 1}, 'gzip'),
+    ('feed.rss.gz', {'FEED_COMPRESSION': 'none'}, None),
+    ('feed.rss.gz', {'FEED_FLUSH_EVERY_ITEMS': 7, 'FEED_FSYNC': True}, 'gzip'),
+])
+def test_compressed_feed(async_export, feed_file, settings, compression):
+    items = [RssItem(title='Title {}'.format(i)) for i in range(50)]
+    with FeedSettings(feed_file) as feed_settings:
+        export_feed(feed_settings, items, FEED_ASYNC_EXPORT=async_export, **settings)
+        data = read_feed(feed_settings['feed_file'])
+    with FeedSettings() as feed_settings:
+        export_feed(feed_settings, items)
+        expected = read_feed(feed_settings['feed_file'])
+    assert _items(DECOMPRESSORS[compression](data)) == _items(expected)
+
+
+@pytest.mark.skipif(six.PY3, reason='bz2 and xz compressions of the feed are supported on Python 3')
+@pytest.mark.parametrize('feed_file', ['feed.rss.bz2', 'feed.rss.xz'])
+def test_unsupported_compression(feed_file):
+    with FeedSettings(feed_file) as feed_settings:
+        with pytest.raises(CloseSpider) as exc_info:
+            export_feed(feed_settings, [RssItem(title='Title')])
+    assert 'Python 3' in exc_info.value.reason
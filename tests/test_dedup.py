@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+import os
+
+import pytest
+
+from scrapy_rss import RssItem
+from scrapy_rss.dedup import BloomFilter, SeenKeysIndex, get_item_key
+from scrapy_rss.exceptions import InvalidComponentError
+from tests.utils import CrawlerContext, FeedSettings, export_feed, get_item_titles, read_feed
+
+
+def test_get_item_key():
+    assert get_item_key(RssItem(title='Title')) is None
+    assert get_item_key(RssItem(title='Title', link='http://example.com/1')) == 'http://example.com/1'
+    assert get_item_key(RssItem(title='Title', guid='id-1', link='http://example.com/1')) == 'id-1'
+
+
+@pytest.mark.parametrize('async_export', [False, True])
+def test_dedup_within_run(async_export):
+    items = [RssItem(title='1', guid='a'), RssItem(title='2', link='http://example.com/a'),
+             RssItem(title='3', guid='a'), RssItem(title='4', guid='http://example.com/a'),
+             RssItem(title='5'), RssItem(title='6')]
+    with FeedSettings() as feed_settings:
+        assert export_feed(feed_settings, items, FEED_DEDUP=True, FEED_ASYNC_EXPORT=async_export) == 2
+        assert get_item_titles(read_feed(feed_settings['feed_file'])) == ['1', '2', '5', '6']
+
+
+@pytest.mark.parametrize('jobdir', [False, True])
+def test_dedup_persistence(jobdir):
+    with FeedSettings() as feed_settings:
+        directory = os.path.dirname(feed_settings['feed_file'])
+        if jobdir:
+            settings = {'FEED_DEDUP': True, 'JOBDIR': os.path.join(directory, 'job')}
+            index_path = os.path.join(directory, 'job', 'feed_seen_keys.sqlite')
+        else:
+            index_path = os.path.join(directory, 'seen.sqlite')
+            settings = {'FEED_DEDUP': True, 'FEED_DEDUP_INDEX': index_path}
+        path = feed_settings['feed_file']
+        assert export_feed(feed_settings, [RssItem(title='1', guid='a'), RssItem(title='2', guid='b')],
+                           **settings) == 0
+        assert get_item_titles(read_feed(path)) == ['1', '2']
+        assert os.path.isfile(index_path)
+        assert export_feed(feed_settings, [RssItem(title='3', guid='b'), RssItem(title='4', guid='c')],
+                           **settings) == 1
+        assert get_item_titles(read_feed(path)) == ['4']
+        assert export_feed(feed_settings, [RssItem(title='5', guid='a'), RssItem(title='6', guid='c')],
+                           **settings) == 2
+        assert get_item_titles(read_feed(path)) == []
+
+
+def test_dedup_invalid_item_is_not_recorded():
+    with FeedSettings() as feed_settings:
+        with CrawlerContext(crawler_settings=dict(CrawlerContext.default_settings, FEED_DEDUP=True),
+                            **feed_settings) as context:
+            with pytest.raises(InvalidComponentError):
+                context.ipm.process_item(RssItem(guid='a'), context.spider)
+            context.ipm.process_item(RssItem(title='1', guid='a'), context.spider)
+
+
+def test_seen_keys_index():
+    index = SeenKeysIndex()
+    assert 'a' not in index
+    index.add('a')
+    assert 'a' in index
+    assert u'ключ' not in index
+    index.add(u'ключ')
+    assert u'ключ' in index
+    index.close()
+
+
+def test_seen_keys_index_bloom_filter_file():
+    with FeedSettings() as feed_settings:
+        path = os.path.join(os.path.dirname(feed_settings['feed_file']), 'seen.sqlite')
+        index = SeenKeysIndex(path)
+        for i in range(100):
+            index.add(str(i))
+        index.add('0')
+        index.close()
+        assert os.path.isfile(path + '.bloom')
+
+        index = SeenKeysIndex(path)
+        assert index.count == 100
+        assert index._bloom.size == SeenKeysIndex.min_bloom_size
+        assert all(SeenKeysIndex._digest(str(i)) in index._bloom for i in range(100))
+        # stale filter after a crash is rebuilt from the database
+        index.add('new')
+        index._db.commit()
+        index._db.close()
+        index._db = None
+        index = SeenKeysIndex(path, bloom_size=1 << 16)
+        assert index._bloom.size == 1 << 16
+        assert 'new' in index and '99' in index and 'absent' not in index
+        index.close()
+
+        os.remove(path + '.bloom')
+        index = SeenKeysIndex(path)
+        assert index.count == 101
+        assert 'new' in index
+        index.close()
+
+
+def test_bloom_filter():
+    bloom = BloomFilter(1 << 16)
+    digests = [SeenKeysIndex._digest(str(i)) for i in range(1000)]
+    for digest in digests[:500]:
+        bloom.add(digest)
+    assert all(digest in bloom for digest in digests[:500])
+    assert sum(digest in bloom for digest in digests[500:]) < 10
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+import os
+from io import BytesIO
+
+import pytest
+
+from scrapy_rss import RssItem
+from scrapy_rss.digest import DigestFeedFile, get_metadata_path, get_temp_path, read_metadata
+from tests.utils import FeedSettings, export_feed, read_feed
+
+
+@pytest.mark.parametrize('settings', [{}, {'FEED_ASYNC_EXPORT': True}, {'FEED_COMPRESSION': 'gzip'}])
+def test_skip_unchanged(settings):
+    settings = dict(settings, FEED_SKIP_UNCHANGED=True)
+    with FeedSettings() as feed_settings:
+        path = feed_settings['feed_file']
+        export_feed(feed_settings, [RssItem(title='1'), RssItem(title='2')], **settings)
+        data = read_feed(path)
+        metadata = read_metadata(path)
+        assert metadata['size'] == len(data)
+        assert metadata['etag'] == '"{}"'.format(metadata['digest'][:32])
+        os.utime(path, (0, 0))
+        export_feed(feed_settings, [RssItem(title='1'), RssItem(title='2')], **settings)
+        assert read_feed(path) == data
+        assert os.path.getmtime(path) == 0
+        assert read_metadata(path) == metadata
+        assert not os.path.exists(get_temp_path(path))
+
+        export_feed(feed_settings, [RssItem(title='1'), RssItem(title='3')], **settings)
+        assert read_feed(path) != data
+        assert os.path.getmtime(path) != 0
+        assert read_metadata(path)['digest'] != metadata['digest']
+
+        os.remove(path)
+        export_feed(feed_settings, [RssItem(title='1'), RssItem(title='3')], **settings)
+        assert read_feed(path) != b''
+        assert not os.path.exists(get_temp_path(path))
+
+
+def test_skip_unchanged_channel_change():
+    with FeedSettings() as feed_settings:
+        export_feed(feed_settings, [RssItem(title='1')], FEED_SKIP_UNCHANGED=True)
+        data = read_feed(feed_settings['feed_file'])
+        export_feed(dict(feed_settings, feed_title='Another title'), [RssItem(title='1')], FEED_SKIP_UNCHANGED=True)
+        assert read_feed(feed_settings['feed_file']) != data
+
+
+def test_skip_unchanged_not_supported():
+    with FeedSettings() as feed_settings:
+        with pytest.raises(ValueError, match='not supported'):
+            export_feed(feed_settings, [], FEED_SKIP_UNCHANGED=True, FEED_MAX_ITEMS=3)
+
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 1000])
+def test_digest_excludes_last_build_date(chunk_size):
+    feeds = [(b'<rss><channel><title>T</title><lastBuildDate>' + date + b'</lastBuildDate>'
+              b'<item><title>I</title></item></channel></rss>')
+             for date in (b'Sat, 01 Jan 2000 00:00:00 +0000', b'Sun, 02 Jan 2000')]
+    digests = []
+    with FeedSettings() as feed_settings:
+        for feed in feeds:
+            file = DigestFeedFile(feed_settings['feed_file'], lambda path: BytesIO())
+            for start in range(0, len(feed), chunk_size):
+                file.write(feed[start:start + chunk_size])
+            digests.append(file.hexdigest())
+            file.close()
+        assert not os.path.exists(get_metadata_path(feed_settings['feed_file']))
+    assert digests[0] == digests[1]
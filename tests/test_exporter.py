@@ -1,20 +1,16 @@
 # -*- coding: utf-8 -*-
 import os
+import pickle
 import re
+import time
+from io import BytesIO
 from datetime import datetime
 from itertools import chain, combinations
 from functools import partial
 
-from scrapy_rss.rss import channel_elements
-
-try:
-    from tempfile import TemporaryDirectory
-except ImportError:
-    from backports.tempfile import TemporaryDirectory
 from parameterized import parameterized
 import six
 from lxml import etree
-from packaging.version import Version
 
 import scrapy
 from scrapy import signals
@@ -23,23 +19,22 @@ try:
 except ImportError:
     from scrapy.item import Item as BaseItem
 from tests.utils import RaisedItemPipelineManager, full_name_func
-from scrapy.exceptions import NotConfigured, CloseSpider
-from scrapy.utils.misc import load_object
-from scrapy.utils.test import get_crawler
+from scrapy.exceptions import NotConfigured, CloseSpider, DropItem
+from twisted.internet import task
 
 from scrapy_rss.items import RssItem, FeedItem
 from scrapy_rss.rss.old.items import RssItem as OldRssItem
-from scrapy_rss.meta import Element, ElementAttribute
+from scrapy_rss.meta import Element, ElementAttribute, MultipleElements
 from scrapy_rss.exceptions import *
-from scrapy_rss.exporters import FeedItemExporter, RssItemExporter
+from scrapy_rss import exporters
+from scrapy_rss.exporters import FeedItemExporter, RssItemExporter, _serialize_items_fragment, create_process_pool
+from scrapy_rss import pipelines
+from scrapy_rss.pipelines import FeedExportThread, FeedFlushPolicy
 from scrapy_rss.utils import get_tzlocal
 
 import pytest
 from tests import predefined_items
-from tests.utils import RssTestCase, FrozenDict
-
-if Version(scrapy.__version__) >= Version('2.13'):
-    from twisted.internet import reactor # not used but it's required
+from tests.utils import RssTestCase, CrawlerContext, FullRssItemExporter, FeedSettings, default_feed_settings
 
 if six.PY2:
     import sys
@@ -47,108 +42,6 @@ if six.PY2:
     sys.setdefaultencoding('utf-8')
 
 
-class CrawlerContext(object):
-    default_settings = FrozenDict({'ITEM_PIPELINES':
-                                       {'scrapy_rss.pipelines.FeedExportPipeline': 900,},
-                                   'LOG_LEVEL': 'WARNING',
-                                   'EXTENSIONS': {
-                                       'scrapy.extensions.memusage.MemoryUsage': None,},
-                                   })
-
-    def __init__(self, feed_file=None, feed_title=None, feed_link=None, feed_description=None,
-                 crawler_settings=None):
-        settings = crawler_settings if crawler_settings else dict(self.default_settings)
-        if feed_file:
-            settings['FEED_FILE'] = feed_file
-        if feed_title:
-            settings['FEED_TITLE'] = feed_title
-        if feed_link:
-            settings['FEED_LINK'] = feed_link
-        if feed_description:
-            settings['FEED_DESCRIPTION'] = feed_description
-        self.crawler = get_crawler(settings_dict=settings)
-        self.spider = scrapy.Spider.from_crawler(self.crawler, 'example.com')
-        self.spider.parse = lambda response: ()
-        item_processor = settings.get('ITEM_PROCESSOR')
-        if not item_processor:
-            item_processor = RaisedItemPipelineManager
-        elif isinstance(item_processor, six.string_types):
-            item_processor = load_object(item_processor)
-
-        self.ipm = item_processor.from_crawler(self.crawler)
-
-    def __enter__(self):
-        responses = self.crawler.signals.send_catch_log(signal=signals.spider_opened,
-                                                        spider=self.spider)
-        for _, failure in responses:
-            if failure:
-                failure.raiseException()
-
-        return self
-
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        responses = self.crawler.signals.send_catch_log(signal=signals.spider_closed,
-                                                        spider=self.spider, reason=None)
-        for _, failure in responses:
-            if failure:
-                failure.raiseException()
-
-
-class FullRssItemExporter(FeedItemExporter):
-    def __init__(self, file, channel_title, channel_link, channel_description,
-                 language='en-US',
-                 copyright='Data',
-                 managing_editor='m@dot.com (Manager Name)',
-                 webmaster='web@dot.com (Webmaster Name)',
-                 pubdate=datetime(2000, 2, 1, 0, 10, 30, tzinfo=get_tzlocal()),
-                 last_build_date=datetime(2000, 2, 1, 5, 10, 30, tzinfo=get_tzlocal()),
-                 category='some category',
-                 generator='tester',
-                 docs='http://example.com/rss_docs',
-                 cloud=FrozenDict({
-                     'domain': 'rpc.sys.com',
-                     'port': '80',
-                     'path': '/RPC2',
-                     'registerProcedure': 'myCloud.rssPleaseNotify',
-                     'protocol': 'xml-rpc'
-                 }),
-                 ttl=60,
-                 image=channel_elements.ImageElement(url='http://example.com/img.jpg',
-                                                     width=54),
-                 rating=4.0,
-                 text_input=channel_elements.TextInputElement(title='Input title',
-                                                              description='Description of input',
-                                                              name='Input name',
-                                                              link='http://example.com/cgi.py'),
-                 skip_hours=(0, 1, 3, 7, 23),
-                 skip_days=14,
-                 *args, **kwargs):
-        super(FullRssItemExporter, self) \
-            .__init__(file, channel_title, channel_link, channel_description,
-                      language=language, copyright=copyright, managing_editor=managing_editor,
-                      webmaster=webmaster, pubdate=pubdate, last_build_date=last_build_date,
-                      category=category, generator=generator,
-                      docs=docs, cloud=cloud, ttl=ttl,
-                      image=image, rating=rating, text_input=text_input,
-                      skip_hours=skip_hours, skip_days=skip_days,
-                      *args, **kwargs)
-
-
-default_feed_settings = FrozenDict({'feed_file': 'feed.rss',
-                                    'feed_title': 'Title',
-                                    'feed_link': 'http://example.com/feed',
-                                    'feed_description': 'Description'})
-
-
-class FeedSettings(TemporaryDirectory):
-    def __enter__(self):
-        dirname = super(FeedSettings, self).__enter__()
-        feed_settings = dict(default_feed_settings)
-        feed_settings['feed_file'] = os.path.join(dirname, feed_settings['feed_file'])
-        feed_settings = FrozenDict(feed_settings)
-        return feed_settings
-
-
 initialized_items = predefined_items.PredefinedItems()
 NSItem0 = predefined_items.NSItem0
 NSItem1 = predefined_items.NSItem1
@@ -193,7 +86,7 @@ class TestExporting(RssTestCase):
     def test_custom_exporter1(self):
         with FeedSettings() as feed_settings:
             crawler_settings = dict(CrawlerContext.default_settings)
-            crawler_settings['FEED_EXPORTER'] = 'tests.test_exporter.FullRssItemExporter'
+            crawler_settings['FEED_EXPORTER'] = 'tests.utils.FullRssItemExporter'
 
             with CrawlerContext(crawler_settings=crawler_settings, **feed_settings):
                 pass
@@ -697,6 +590,457 @@ class TestExporting(RssTestCase):
                 with open(feed_settings['feed_file']) as data:
                     self.assertUnorderedXmlEquivalentOutputs(data.read(), feed_tree)
 
+    @parameterized.expand(((False,), (True,)))
+    def test_hoisted_namespaces(self, hoist_namespaces):
+        class Element0(Element):
+            value = ElementAttribute(is_content=True, required=True)
+            attr_prefix__attr = ElementAttribute(ns_uri='attr_id')
+
+        class Element1(Element):
+            value = ElementAttribute(is_content=True, required=True)
+            conflict__attr = ElementAttribute(ns_uri='conflict_id1')
+
+        class Element2(Element):
+            value = ElementAttribute(is_content=True, required=True)
+            conflict__attr = ElementAttribute(ns_uri='conflict_id2')
+
+        class Item0(RssItem):
+            el_prefix__elem0 = MultipleElements(Element0, ns_uri='el_id')
+            elem1 = MultipleElements(Element1)
+            elem2 = MultipleElements(Element2)
+
+        item = Item0(title='Title')
+        item.el_prefix__elem0 = [{'value': 'value1', 'attr_prefix__attr': 'attr1'}, {'value': 'value2'}]
+        item.elem1 = {'value': 'value', 'conflict__attr': 'attr'}
+        item.elem2 = {'value': 'value', 'conflict__attr': 'attr'}
+
+        with FeedSettings() as feed_settings:
+            crawler_settings = dict(CrawlerContext.default_settings)
+            crawler_settings['FEED_ITEM_CLASS'] = Item0
+            crawler_settings['FEED_HOIST_NAMESPACES'] = hoist_namespaces
+            with CrawlerContext(crawler_settings=crawler_settings, **feed_settings) as context:
+                context.ipm.process_item(item, context.spider)
+                context.ipm.process_item(item, context.spider)
+            with open(feed_settings['feed_file'], 'rb') as data:
+                feed_tree = etree.fromstring(data.read())
+
+        expected_root_nsmap = {'el_prefix': 'el_id'}
+        if hoist_namespaces:
+            expected_root_nsmap['attr_prefix'] = 'attr_id'
+        self.assertEqual(expected_root_nsmap, feed_tree.nsmap)
+        items = feed_tree.xpath('//item')
+        self.assertEqual(2, len(items))
+        for item_element in items:
+            self.assertEqual({} if hoist_namespaces else {'attr_prefix': 'attr_id'},
+                             dict(set(item_element.nsmap.items()) - set(feed_tree.nsmap.items())))
+            elements = item_element.xpath('./el_prefix:elem0', namespaces={'el_prefix': 'el_id'})
+            self.assertEqual(['value1', 'value2'], [element.text for element in elements])
+            self.assertEqual('attr1', elements[0].get('{attr_id}attr'))
+            self.assertEqual('attr', item_element.find('elem1').get('{conflict_id1}attr'))
+            self.assertEqual('attr', item_element.find('elem2').get('{conflict_id2}attr'))
+
+    def test_cached_prefix_mappings(self):
+        class Element0(Element):
+            value = ElementAttribute(is_content=True, required=True)
+            b_prefix__attr = ElementAttribute(ns_uri='b_id')
+
+        class Item0(RssItem):
+            c_prefix__elem0 = Element0(ns_uri='c_id')
+            a_prefix__elem1 = Element0(ns_uri='a_id')
+
+        item = Item0(title='Title')
+        item.c_prefix__elem0 = {'value': 'value', 'b_prefix__attr': 'attr'}
+        item.a_prefix__elem1 = 'value'
+
+        def export():
+            out = BytesIO()
+            exporter = FeedItemExporter(out, 'Title', 'http://example.com/feed', 'Description',
+                                        namespaces={'a_prefix': 'a_id'})
+            exporter.start_exporting()
+            exporter.export_item(item)
+            exporter.finish_exporting()
+            return out.getvalue()
+
+        FeedItemExporter._prefix_mappings_cache.clear()
+        data = export()
+        cache_size = len(FeedItemExporter._prefix_mappings_cache)
+        self.assertGreater(cache_size, 0)
+        self.assertEqual(data, export())
+        self.assertEqual(cache_size, len(FeedItemExporter._prefix_mappings_cache))
+        self.assertIn(b'<item xmlns:b_prefix="b_id" xmlns:c_prefix="c_id">', data)
+
+    def test_cached_channel_markup(self):
+        def export(last_build_date, xml_writer='native', category=None):
+            out = BytesIO()
+            exporter = FullRssItemExporter(out, 'Title', 'http://example.com/feed', 'Description',
+                                           last_build_date=last_build_date, xml_writer=xml_writer)
+            if category:
+                exporter.channel.category.append(category)
+            exporter.start_exporting()
+            exporter.finish_exporting()
+            return out.getvalue()
+
+        FeedItemExporter._channel_markup_cache.clear()
+        dates = [datetime(2000, 1, 1, 0, 0, 0, tzinfo=get_tzlocal()),
+                 datetime(2010, 12, 31, 23, 59, 59, tzinfo=get_tzlocal())]
+        for last_build_date in dates:
+            self.assertEqual(export(last_build_date, 'sax'), export(last_build_date))
+            self.assertEqual(1, len(FeedItemExporter._channel_markup_cache))
+        self.assertEqual(export(dates[0], 'sax', category='new category'),
+                         export(dates[0], category='new category'))
+        self.assertEqual(2, len(FeedItemExporter._channel_markup_cache))
+        self.assertNotEqual(export(dates[0]), export(dates[1]))
+
+    def test_cached_channel_markup_of_exporter_subclass(self):
+        class UpperCaseExporter(FeedItemExporter):
+            def _serialize_xml_element(self, element, xml_name=None, attrs_only_namespaces=True):
+                characters = self.xg.characters
+                self.xg.characters = lambda content: characters(content.upper())
+                try:
+                    super(UpperCaseExporter, self)._serialize_xml_element(element, xml_name, attrs_only_namespaces)
+                finally:
+                    self.xg.characters = characters
+
+        def export(exporter_cls):
+            out = BytesIO()
+            exporter = exporter_cls(out, 'Title', 'http://example.com/feed', 'Description',
+                                    last_build_date=datetime(2000, 1, 1, 0, 0, 0, tzinfo=get_tzlocal()))
+            exporter.start_exporting()
+            exporter.finish_exporting()
+            return out.getvalue()
+
+        FeedItemExporter._channel_markup_cache.clear()
+        self.assertIn(b'<title>Title</title>', export(FeedItemExporter))
+        self.assertIn(b'<title>TITLE</title>', export(UpperCaseExporter))
+
+    def test_export_items(self):
+        def export(items, batch=False, **kwargs):
+            out = BytesIO()
+            exporter = FeedItemExporter(out, 'Title', 'http://example.com/feed', 'Description',
+                                        last_build_date=datetime(2000, 1, 1, 0, 0, 0), **kwargs)
+            exporter.start_exporting()
+            if batch:
+                self.assertEqual(len(items), exporter.export_items(iter(items), batch_size=3))
+            else:
+                for item in items:
+                    exporter.export_item(item)
+            exporter.finish_exporting()
+            return out.getvalue()
+
+        items = list(initialized_items.items.values())
+        self.assertEqual(export(items), export(items, batch=True))
+        for item_name, namespaces, item_cls, item in initialized_items.ns_items:
+            if isinstance(item_cls, str):
+                continue
+            kwargs = {'namespaces': namespaces, 'item_cls': item_cls}
+            self.assertEqual(export([item, item], **kwargs), export([item, item], batch=True, **kwargs))
+
+        out = BytesIO()
+        exporter = FeedItemExporter(out, 'Title', 'http://example.com/feed', 'Description')
+        exporter.start_exporting()
+        valid_items = [RssItem(title='Title {}'.format(i)) for i in range(4)]
+        with self.assertRaises(InvalidFeedItemComponentsError):
+            exporter.export_items(valid_items + [RssItem()], batch_size=3)
+        with self.assertRaises(InvalidFeedItemError):
+            exporter.export_items([{'title': 'Title'}])
+        exporter.finish_exporting()
+        self.assertEqual(3, len(etree.fromstring(out.getvalue()).xpath('//item')))
+
+    def test_parallel_serialization(self):
+        executor = create_process_pool(2)
+        self.addCleanup(executor.shutdown)
+
+        def export(items, **kwargs):
+            out = BytesIO()
+            if kwargs.get('workers'):
+                kwargs.setdefault('executor', executor)
+            exporter = FeedItemExporter(out, 'Title', 'http://example.com/feed', 'Description',
+                                        last_build_date=datetime(2000, 1, 1, 0, 0, 0), **kwargs)
+            exporter.start_exporting()
+            for item in items:
+                exporter.export_item(item)
+            exporter.finish_exporting()
+            return out.getvalue()
+
+        def is_picklable(item):
+            try:
+                pickle.dumps(item.__class__)
+            except (pickle.PicklingError, AttributeError):
+                return False
+            return True
+
+        items = [item for item in initialized_items.items.values() if is_picklable(item)]
+        self.assertEqual(export(items), export(items, workers=2, worker_batch_size=3))
+        self.assertEqual(export(items), export(items, workers=2, worker_batch_size=3, executor=None))
+        ns_items = [(namespaces, item_cls, item)
+                    for item_name, namespaces, item_cls, item in initialized_items.ns_items
+                    if not isinstance(item_cls, str) and is_picklable(item)]
+        for namespaces, item_cls, item in ns_items:
+            kwargs = {'namespaces': namespaces, 'item_cls': item_cls}
+            self.assertEqual(export([item, item, item], **kwargs),
+                             export([item, item, item], workers=2, worker_batch_size=2, **kwargs))
+
+        with self.assertRaisesRegex(ValueError, 'native XML writer'):
+            FeedItemExporter(BytesIO(), 'Title', 'http://example.com/feed', 'Description',
+                             workers=2, xml_writer='sax')
+
+    def test_parallel_serialization_pool_per_pipeline(self):
+        with FeedSettings() as feed_settings:
+            crawler_settings = dict(CrawlerContext.default_settings)
+            crawler_settings['FEED_EXPORT_WORKERS'] = 2
+            crawler_settings['FEED_EXPORT_BATCH_SIZE'] = 1
+            crawler_settings['FEED_SHARD_ITEMS'] = 2
+            with CrawlerContext(crawler_settings=crawler_settings, **feed_settings) as context:
+                pipeline, = context.ipm.middlewares
+                executor = pipeline.executors[context.spider]
+                for i in range(5):
+                    context.ipm.process_item(RssItem(title='Title {}'.format(i)), context.spider)
+                    for shard in pipeline.exporters[context.spider].open_shards.values():
+                        self.assertIs(executor, shard.exporter._executor)
+            self.assertEqual({}, pipeline.executors)
+            titles = []
+            for number in range(1, 4):
+                with open(feed_settings['feed_file'].replace('.rss', '.{}.rss'.format(number)), 'rb') as data:
+                    titles.extend(etree.fromstring(data.read()).xpath('//item/title/text()'))
+            self.assertEqual(['Title {}'.format(i) for i in range(5)], titles)
+
+    def test_parallel_serialization_failure(self):
+        def serialize(value):
+            if value == 'fail':
+                raise ValueError('Serialization failure')
+            return value
+
+        class Element0(Element):
+            value = ElementAttribute(is_content=True, required=True, serializer=serialize)
+
+        class Item0(RssItem):
+            el_prefix__elem = Element0(ns_uri='el_id')
+
+        exporter = FeedItemExporter(BytesIO(), 'Title', 'http://example.com/feed', 'Description', workers=2)
+        exporter.start_exporting()
+        try:
+            worker_state = exporter._worker_state
+            item = Item0(title='Title')
+            item.el_prefix__elem = 'fail'
+            with self.assertRaisesRegex(ValueError, 'Serialization failure'):
+                _serialize_items_fragment(worker_state, [(Item0, item.snapshot())])
+            self.assertNotIn(worker_state, exporters._worker_exporters)
+            item.el_prefix__elem = 'value'
+            for _ in range(2):
+                self.assertEqual(u'<item xmlns:el_prefix="el_id"><title>Title</title>'
+                                 u'<el_prefix:elem>value</el_prefix:elem></item>',
+                                 _serialize_items_fragment(worker_state, [(Item0, item.snapshot())]))
+        finally:
+            exporter.finish_exporting()
+
+    @parameterized.expand((queue_size,) for queue_size in (1, 2, 1000))
+    def test_async_export(self, queue_size):
+        items = [RssItem(title='Title {}'.format(i), description='Description {}'.format(i))
+                 for i in range(20)]
+
+        def export(async_export):
+            with FeedSettings() as feed_settings:
+                crawler_settings = dict(CrawlerContext.default_settings)
+                crawler_settings['FEED_ASYNC_EXPORT'] = async_export
+                crawler_settings['FEED_ASYNC_QUEUE_SIZE'] = queue_size
+                with CrawlerContext(crawler_settings=crawler_settings, **feed_settings) as context:
+                    for item in items:
+                        context.ipm.process_item(item, context.spider)
+                    with self.assertRaises(InvalidFeedItemError):
+                        context.ipm.process_item({'title': 'Title'}, context.spider)
+                with open(feed_settings['feed_file'], 'rb') as data:
+                    feed_tree = etree.fromstring(data.read())
+            return [etree.tostring(item_element) for item_element in feed_tree.xpath('//item')]
+
+        self.assertEqual(20, len(export(True)))
+        self.assertEqual(export(False), export(True))
+
+    @parameterized.expand((async_export,) for async_export in (False, True))
+    def test_items_pool(self, async_export):
+        def export(pooled):
+            items = []
+            with FeedSettings() as feed_settings:
+                crawler_settings = dict(CrawlerContext.default_settings)
+                crawler_settings['FEED_ASYNC_EXPORT'] = async_export
+                crawler_settings['FEED_ITEM_POOL'] = pooled
+                with CrawlerContext(crawler_settings=crawler_settings, **feed_settings) as context:
+                    for i in range(20):
+                        item = RssItem.acquire() if pooled else RssItem()
+                        item.title = 'Title {}'.format(i)
+                        item.description = 'Description {}'.format(i)
+                        context.ipm.process_item(item, context.spider)
+                        context.crawler.signals.send_catch_log(signals.item_scraped, item=item,
+                                                               response=None, spider=context.spider)
+                        items.append(item)
+                with open(feed_settings['feed_file'], 'rb') as data:
+                    feed_tree = etree.fromstring(data.read())
+            return items, [etree.tostring(item_element) for item_element in feed_tree.xpath('//item')]
+
+        items, exported_items = export(True)
+        self.assertTrue(all(item._released for item in items))
+        self.assertEqual(export(False)[1], exported_items)
+
+    def test_items_pool_dropped_item(self):
+        with FeedSettings() as feed_settings:
+            crawler_settings = dict(CrawlerContext.default_settings)
+            crawler_settings['FEED_ASYNC_EXPORT'] = True
+            crawler_settings['FEED_ITEM_POOL'] = True
+            with CrawlerContext(crawler_settings=crawler_settings, **feed_settings) as context:
+                item = RssItem.acquire()
+                item.title = 'Title'
+                context.crawler.signals.send_catch_log(signals.item_dropped, item=item, response=None,
+                                                       exception=DropItem('Dropped'), spider=context.spider)
+                self.assertTrue(item._released)
+
+    def test_flush_policy(self):
+        with FeedSettings() as feed_settings:
+            crawler_settings = dict(CrawlerContext.default_settings)
+            crawler_settings['FEED_BUFFER_SIZE'] = 1 << 20
+            crawler_settings['FEED_FLUSH_EVERY_ITEMS'] = 5
+            with CrawlerContext(crawler_settings=crawler_settings, **feed_settings) as context:
+                for i in range(7):
+                    context.ipm.process_item(RssItem(title='Title {}'.format(i)), context.spider)
+                    with open(feed_settings['feed_file'], 'rb') as data:
+                        self.assertEqual(5 if i >= 4 else 0, data.read().count(b'<item>'))
+            with open(feed_settings['feed_file'], 'rb') as data:
+                self.assertEqual(7, len(etree.fromstring(data.read()).xpath('//item')))
+
+        class Exporter(object):
+            flushes = 0
+
+            def flush(self):
+                self.flushes += 1
+
+        exporter = Exporter()
+        with FeedSettings() as feed_settings, open(feed_settings['feed_file'], 'wb') as file:
+            flush_policy = FeedFlushPolicy(exporter, file, interval=0.001, fsync=True)
+            flush_policy.item_exported()
+            self.assertEqual(0, exporter.flushes)
+            time.sleep(0.01)
+            flush_policy.item_exported()
+            self.assertEqual(1, exporter.flushes)
+            self.assertEqual(0, flush_policy.unflushed_items)
+            flush_policy.item_exported()
+            flush_policy.check()
+            self.assertEqual(1, exporter.flushes)
+            time.sleep(0.01)
+            flush_policy.check()
+            self.assertEqual(2, exporter.flushes)
+            flush_policy.check()
+            self.assertEqual(2, exporter.flushes)
+
+    @parameterized.expand((async_export,) for async_export in (False, True))
+    def test_flush_interval_when_idle(self, async_export):
+        clock = task.Clock()
+
+        class LoopingCall(task.LoopingCall):
+            def __init__(self, *args, **kwargs):
+                super(LoopingCall, self).__init__(*args, **kwargs)
+                self.clock = clock
+
+        original_looping_call = pipelines.LoopingCall
+        pipelines.LoopingCall = LoopingCall
+        try:
+            with FeedSettings() as feed_settings:
+                crawler_settings = dict(CrawlerContext.default_settings)
+                crawler_settings['FEED_ASYNC_EXPORT'] = async_export
+                crawler_settings['FEED_BUFFER_SIZE'] = 1 << 20
+                crawler_settings['FEED_FLUSH_INTERVAL'] = 0.01
+                with CrawlerContext(crawler_settings=crawler_settings, **feed_settings) as context:
+                    context.ipm.process_item(RssItem(title='Title'), context.spider)
+                    deadline = time.time() + 5
+                    while True:
+                        time.sleep(0.01)
+                        clock.advance(0.01)
+                        with open(feed_settings['feed_file'], 'rb') as data:
+                            if b'<item>' in data.read() or time.time() > deadline:
+                                break
+                    with open(feed_settings['feed_file'], 'rb') as data:
+                        self.assertIn(b'<item>', data.read())
+                    self.assertEqual(0 if async_export else 1, len(clock.getDelayedCalls()))
+                self.assertEqual([], clock.getDelayedCalls())
+        finally:
+            pipelines.LoopingCall = original_looping_call
+
+    @parameterized.expand((async_export,) for async_export in (False, True))
+    def test_fsync(self, async_export):
+        def export(fsync):
+            with FeedSettings() as feed_settings:
+                crawler_settings = dict(CrawlerContext.default_settings)
+                crawler_settings['FEED_ASYNC_EXPORT'] = async_export
+                crawler_settings['FEED_FSYNC'] = fsync
+                crawler_settings['FEED_FLUSH_EVERY_ITEMS'] = 3
+                with CrawlerContext(crawler_settings=crawler_settings, **feed_settings) as context:
+                    for i in range(10):
+                        context.ipm.process_item(RssItem(title='Title {}'.format(i)), context.spider)
+                with open(feed_settings['feed_file'], 'rb') as data:
+                    feed_tree = etree.fromstring(data.read())
+            return [etree.tostring(item_element) for item_element in feed_tree.xpath('//item')]
+
+        self.assertEqual(export(False), export(True))
+
+    def test_async_export_backpressure(self):
+        import threading
+
+        class BlockedExporter(object):
+            def __init__(self):
+                self.started = threading.Event()
+                self.unblocked = threading.Event()
+                self.exported_items = []
+
+            def export_validated_item(self, item):
+                self.started.set()
+                self.unblocked.wait()
+                self.exported_items.append(item.title.value)
+
+        exporter = BlockedExporter()
+        export_thread = FeedExportThread(exporter, 1)
+        export_thread.start()
+        self.assertEqual('result 0', export_thread.put(RssItem(title='0'), 'result 0'))
+        exporter.started.wait()
+        self.assertEqual('result 1', export_thread.put(RssItem(title='1'), 'result 1'))
+        deferreds = [export_thread.put(RssItem(title=str(i)), 'result {}'.format(i)) for i in (2, 3)]
+        self.assertTrue(all(not deferred.called for deferred in deferreds))
+        exporter.unblocked.set()
+        export_thread.close()
+        self.assertEqual(['0', '1', '2', '3'], exporter.exported_items)
+        self.assertEqual(['result 2', 'result 3'], [deferred.result for deferred in deferreds])
+        self.assertFalse(export_thread.is_alive())
+
+    def test_async_export_item_changed_after_validation(self):
+        import threading
+
+        class BlockedExporter(object):
+            def __init__(self):
+                self.unblocked = threading.Event()
+                self.exported_items = []
+
+            def export_validated_item(self, item):
+                self.unblocked.wait()
+                self.exported_items.append(item.title.value)
+
+        exporter = BlockedExporter()
+        export_thread = FeedExportThread(exporter, 10)
+        export_thread.start()
+        items = [RssItem(title='valid {}'.format(i)) for i in range(2)]
+        for item in items:
+            export_thread.put(item, item)
+            item.title = None
+        exporter.unblocked.set()
+        export_thread.close()
+        self.assertEqual(['valid 0', 'valid 1'], exporter.exported_items)
+
+    def test_async_export_error(self):
+        class FailedExporter(object):
+            def export_validated_item(self, item):
+                raise IOError('No space left on device')
+
+        export_thread = FeedExportThread(FailedExporter(), 10)
+        export_thread.start()
+        export_thread.put(RssItem(title='Title'), 0)
+        with six.assertRaisesRegex(self, IOError, 'No space left'):
+            export_thread.close()
+
 
 if __name__ == '__main__':
     pytest.main()
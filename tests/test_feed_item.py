@@ -1,12 +1,19 @@
 # -*- coding: utf-8 -*-
 
+import pickle
 import unittest
-from itertools import product
+from copy import deepcopy
+from datetime import datetime
+from itertools import chain, product
 from parameterized import parameterized
 import scrapy
 import six
 from scrapy_rss import FeedItem, RssItem, RssedItem
+from scrapy_rss.exceptions import ReleasedItemError
 from scrapy_rss.rss.old.items import RssedItem as OldRssedItem
+from scrapy_rss.rss.item_elements import (TitleElement, LinkElement, DescriptionElement, AuthorElement,
+                                          CommentsElement, EnclosureElement, PubDateElement, SourceElement)
+from tests import predefined_items
 from tests.utils import RssTestCase, full_name_func
 
 
@@ -43,6 +50,27 @@ class MyItem6(OldRssedItem):
     field2 = scrapy.Field()
 
 
+class MyItem7(FeedItem):
+    title = TitleElement()
+    link = LinkElement()
+    description = DescriptionElement()
+    author = AuthorElement()
+    comments = CommentsElement()
+    enclosure = EnclosureElement()
+    pubDate = PubDateElement()
+    source = SourceElement()
+
+
+class MyItem8(MyItem7):
+    def __init__(self, origin=None, **kwargs):
+        super(MyItem8, self).__init__(**kwargs)
+        self._origin = origin
+        self.label = 'label'
+
+
+initialized_items = predefined_items.PredefinedItems()
+
+
 class TestFeedItem(RssTestCase):
     def test_feed_item(self):
         from scrapy_rss import FeedItem as FeedItem1
@@ -142,6 +170,87 @@ class TestFeedItem(RssTestCase):
 
         Derived4()
 
+    @parameterized.expand(chain(initialized_items.items.items(),
+                                ((item_name, item) for item_name, _, _, item in initialized_items.ns_items)),
+                          name_func=full_name_func)
+    def test_snapshot(self, item_name, item):
+        restored_item = item.__class__.from_snapshot(item.snapshot())
+        self.assertIs(restored_item.__class__, item.__class__)
+        self.assertEqual(repr(restored_item), repr(item))
+        self.assertEqual(restored_item.assigned, item.assigned)
+        self.assertEqual(restored_item.get_namespaces(), item.get_namespaces())
+        self.assertEqual(repr(deepcopy(item)), repr(item))
+
+    @parameterized.expand(((item_cls,) for item_cls in (MyItem4, MyItem6)), name_func=full_name_func)
+    def test_fields_snapshot(self, item_cls):
+        item = item_cls(field='value1', field2=2)
+        item.rss.title = 'Title'
+        restored_item = pickle.loads(pickle.dumps(item))
+        self.assertEqual(dict(restored_item), dict(item))
+        self.assertEqual(repr(restored_item.rss), repr(item.rss))
+        self.assertEqual(item.__class__.from_snapshot(item.snapshot())['field'], 'value1')
+
+    def test_compact_snapshot(self):
+        item = MyItem7(title='Title', link='http://example.com/item', description='Description',
+                       pubDate=datetime(2000, 1, 1, 0, 0, 0))
+        snapshot = item.snapshot()
+        self.assertEqual(snapshot[:3], (None, None, None))
+        self.assertEqual(11, len(snapshot))  # fields, public attributes, header and 4 pairs (slot index, element)
+        self.assertLessEqual(10 * len(pickle.dumps(snapshot)), len(pickle.dumps(item.__getstate__())))
+        self.assertEqual(repr(pickle.loads(pickle.dumps(item))), repr(item))
+
+    def test_subclass_state_snapshot(self):
+        item = MyItem8(origin='http://example.com', title='Title')
+        for restored_item in (deepcopy(item), pickle.loads(pickle.dumps(item)),
+                              MyItem8.from_snapshot(item.snapshot())):
+            self.assertEqual(restored_item._origin, 'http://example.com')
+            self.assertEqual(restored_item.label, 'label')
+            self.assertEqual(repr(restored_item), repr(item))
+
+    def test_items_pool(self):
+        item = MyItem7.acquire()
+        self.assertEqual(repr(MyItem7()), repr(item))
+        item.title = 'Title'
+        item.enclosure.url = 'http://example.com/file'
+        item.release()
+        with self.assertRaises(ReleasedItemError):
+            item.release()
+        reused_item = MyItem7.acquire()
+        self.assertIs(reused_item, item)
+        self.assertEqual(repr(MyItem7()), repr(reused_item))
+        self.assertFalse(reused_item.assigned)
+        self.assertIsNot(reused_item, MyItem7.acquire())
+        reused_item.release()
+
+        item = MyItem4.acquire()
+        item['field'] = 'value'
+        item.rss.title = 'Title'
+        item.release()
+        reused_item = MyItem4.acquire()
+        self.assertIs(reused_item, item)
+        self.assertEqual({}, dict(reused_item))
+        self.assertEqual(repr(RssItem()), repr(reused_item.rss))
+
+    def test_items_pool_debug(self):
+        MyItem7.configure_pool(debug=True)
+        try:
+            item = MyItem7.acquire()
+            item.title = 'Title'
+            item.release()
+            with self.assertRaises(ReleasedItemError):
+                item.title
+            with self.assertRaises(ReleasedItemError):
+                item.title = 'New title'
+            with self.assertRaises(ReleasedItemError):
+                item.release()
+            with self.assertRaises(ReleasedItemError):
+                item.assigned
+            with self.assertRaises(ReleasedItemError):
+                item.get_namespaces()
+            self.assertIsNot(MyItem7.acquire(), item)
+        finally:
+            MyItem7.configure_pool(debug=False)
+
 
 if __name__ == '__main__':
     unittest.main()
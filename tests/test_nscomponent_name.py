@@ -1,7 +1,9 @@
 # -*- coding: utf-8 -*-
 
+import pickle
 import pytest
 import re
+from copy import copy
 from itertools import product, chain, combinations
 
 from scrapy_rss.meta import BaseNSComponent, NSComponentName
@@ -386,5 +388,21 @@ def test_get_namespaces_with_compound_name_v2(name, ns_prefix, sec_ns_prefix, ns
     assert n.get_namespaces() == {(ns_prefix, ns_uri)}
 
 
+@pytest.mark.parametrize("name,ns_prefix,ns_uri", chain(product(names, empty_ns_prefixes, empty_ns_uris),
+                                                        product(names, empty_ns_prefixes, ns_uris),
+                                                        product(names, ns_prefixes, ns_uris)))
+def test_interning(name, ns_prefix, ns_uri):
+    n = NSComponentName(name, ns_prefix, ns_uri)
+    assert NSComponentName(name, ns_prefix=ns_prefix or None, ns_uri=ns_uri or '') is n
+    assert pickle.loads(pickle.dumps(n)) is n
+    assert copy(n) is n
+    assert n.xml_name is n.xml_name
+    assert n.qname == ('{}:{}'.format(ns_prefix, name) if ns_prefix else name)
+    with pytest.raises(AttributeError, match='immutable'):
+        n.ns_prefix = 'new_prefix'
+    with pytest.raises(AttributeError, match='immutable'):
+        n.ns_uri = 'new_id'
+
+
 if __name__ == '__main__':
     pytest.main()
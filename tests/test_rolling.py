@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+import os
+from datetime import datetime, timedelta
+from io import BytesIO
+
+import pytest
+
+from scrapy_rss import RssItem
+from scrapy_rss.rolling import iter_feed_items
+from tests.utils import FeedSettings, export_feed, get_item_titles, read_feed
+
+
+@pytest.mark.parametrize('async_export', [False, True])
+def test_rolling_window(async_export):
+    with FeedSettings() as feed_settings:
+        path = feed_settings['feed_file']
+        export_feed(feed_settings, [RssItem(title='Item {}'.format(day), pubDate=datetime(2000, 1, day, 12))
+                                    for day in (3, 1, 5, 2, 4)],
+                    FEED_MAX_ITEMS=3, FEED_ASYNC_EXPORT=async_export)
+        assert get_item_titles(read_feed(path)) == ['Item 5', 'Item 4', 'Item 3']
+        export_feed(feed_settings, [RssItem(title='Item 6', pubDate=datetime(2000, 1, 6, 12)),
+                                    RssItem(title='Item 0', pubDate=datetime(2000, 1, 1, 12))], FEED_MAX_ITEMS=3)
+        assert get_item_titles(read_feed(path)) == ['Item 6', 'Item 5', 'Item 4']
+        export_feed(feed_settings, [RssItem(title='Item without date'),
+                                    RssItem(title='Item 4.1', pubDate=datetime(2000, 1, 4, 12))], FEED_MAX_ITEMS=3)
+        assert get_item_titles(read_feed(path)) == ['Item without date', 'Item 6', 'Item 5']
+        export_feed(feed_settings, [], FEED_MAX_ITEMS=2)
+        assert get_item_titles(read_feed(path)) == ['Item without date', 'Item 6']
+        assert not os.path.exists(path + '.tmp')
+
+
+def test_rolling_window_order_stability():
+    with FeedSettings() as feed_settings:
+        path = feed_settings['feed_file']
+        export_feed(feed_settings, [RssItem(title='Item {}'.format(i), pubDate=datetime(2000, 1, 1, 12))
+                                    for i in range(4)], FEED_MAX_ITEMS=3)
+        assert get_item_titles(read_feed(path)) == ['Item 3', 'Item 2', 'Item 1']
+        export_feed(feed_settings, [], FEED_MAX_ITEMS=3)
+        assert get_item_titles(read_feed(path)) == ['Item 3', 'Item 2', 'Item 1']
+        export_feed(feed_settings, [RssItem(title='Item 4', pubDate=datetime(2000, 1, 1, 12))], FEED_MAX_ITEMS=3)
+        assert get_item_titles(read_feed(path)) == ['Item 4', 'Item 3', 'Item 2']
+
+
+@pytest.mark.parametrize('key', ['guid', 'link'])
+def test_rolling_window_recrawl(key):
+    def items(*titles):
+        return [RssItem(title=title, pubDate=datetime(2000, 1, day, 12),
+                        **{key: 'http://example.com/?item={}&x=1'.format(title)})
+                for title, day in zip(titles, (1, 2, 3, 4))]
+
+    with FeedSettings() as feed_settings:
+        path = feed_settings['feed_file']
+        export_feed(feed_settings, items('A', 'B'), FEED_MAX_ITEMS=3)
+        assert get_item_titles(read_feed(path)) == ['B', 'A']
+        export_feed(feed_settings, items('A', 'B'), FEED_MAX_ITEMS=3)
+        assert get_item_titles(read_feed(path)) == ['B', 'A']
+        export_feed(feed_settings, items('C', 'A'), FEED_MAX_ITEMS=3)
+        assert get_item_titles(read_feed(path)) == ['A', 'B', 'C']
+        export_feed(feed_settings, [RssItem(title='A', pubDate=datetime(2000, 1, 1, 12))], FEED_MAX_ITEMS=3)
+        assert get_item_titles(read_feed(path)) == ['A', 'B', 'A']
+
+
+def test_rolling_window_settings():
+    with FeedSettings() as feed_settings:
+        with pytest.raises(ValueError, match='not supported'):
+            export_feed(feed_settings, [], FEED_MAX_ITEMS=3, FEED_SHARD_ITEMS=2)
+
+
+def test_iter_feed_items():
+    pub_date = datetime(2000, 1, 1, 12, 0, 0) - timedelta(hours=3)
+    feed = (b'<rss><channel><title>T</title><image><url>u</url></image>'
+            b'<item><title>1</title><pubDate>Sat, 01 Jan 2000 12:00:00 +0300</pubDate></item>\n'
+            b'<item attr="a"><title>2</title></item></channel></rss>')
+    expected = [(b'<item><title>1</title><pubDate>Sat, 01 Jan 2000 12:00:00 +0300</pubDate></item>',
+                 (pub_date - datetime(1970, 1, 1)).total_seconds()),
+                (b'<item attr="a"><title>2</title></item>', None)]
+    for chunk_size in (1, 3, 7, 100, 65536):
+        assert list(iter_feed_items(BytesIO(feed), chunk_size=chunk_size)) == expected
@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+import gzip
+import json
+import os
+from datetime import datetime, timedelta
+
+import pytest
+
+from scrapy_rss import RssItem, sharding
+from scrapy_rss.sharding import get_shard_path, get_shards_index_path
+from scrapy_rss.utils import format_rfc822
+from tests.utils import FeedSettings, export_feed, get_item_titles, read_feed
+
+
+def test_get_shard_path():
+    assert get_shard_path('feed.rss', 1) == 'feed.1.rss'
+    assert get_shard_path('dir/feed.rss.gz', 2) == 'dir/feed.2.rss.gz'
+    assert get_shard_path('feed-{shard:03d}.rss', 3) == 'feed-003.rss'
+    assert get_shards_index_path('dir/feed.rss') == 'dir/feed.index.json'
+    assert get_shards_index_path('feed.rss.xz') == 'feed.index.json'
+    assert get_shards_index_path('feed-{shard:03d}.rss') == 'feed.index.json'
+
+
+ITEMS = [RssItem(title='Title {}'.format(i), pubDate=datetime(2000, 1, 1 + i % 28, 12, 0, 0)) for i in range(30)]
+
+
+def _read_shards(index_path):
+    dirname = os.path.dirname(index_path)
+    with open(index_path) as index_file:
+        index = json.load(index_file)
+    shards = []
+    for shard in index['shards']:
+        open_file = gzip.open if shard['file'].endswith('.gz') else open
+        shards.append(get_item_titles(read_feed(os.path.join(dirname, shard['file']), open_file)))
+    return index['shards'], shards
+
+
+@pytest.mark.parametrize('async_export', [False, True])
+def test_sharding_by_items(async_export):
+    with FeedSettings() as feed_settings:
+        export_feed(feed_settings, ITEMS[:7], FEED_SHARD_ITEMS=3, FEED_ASYNC_EXPORT=async_export)
+        index, shards = _read_shards(get_shards_index_path(feed_settings['feed_file']))
+    assert [shard['file'] for shard in index] == ['feed.1.rss', 'feed.2.rss', 'feed.3.rss']
+    assert [shard['items'] for shard in index] == [3, 3, 1]
+    assert shards == [['Title 0', 'Title 1', 'Title 2'], ['Title 3', 'Title 4', 'Title 5'], ['Title 6']]
+    assert index[1]['first_pub_date'] == format_rfc822(datetime(2000, 1, 4, 12, 0, 0))
+    assert index[1]['last_pub_date'] == format_rfc822(datetime(2000, 1, 6, 12, 0, 0))
+
+
+def test_sharding_by_bytes():
+    with FeedSettings('feed-{shard:02d}.rss') as feed_settings:
+        index_path = os.path.join(os.path.dirname(feed_settings['feed_file']), 'shards.json')
+        export_feed(feed_settings, ITEMS, FEED_SHARD_BYTES=1000, FEED_SHARD_INDEX=index_path)
+        index, shards = _read_shards(index_path)
+    assert len(index) > 1
+    assert index[0]['file'] == 'feed-01.rss'
+    assert [shard['items'] for shard in index] == [len(titles) for titles in shards]
+    assert sum(shards, []) == ['Title {}'.format(i) for i in range(30)]
+
+
+def test_compressed_shards():
+    with FeedSettings('feed.rss.gz') as feed_settings:
+        export_feed(feed_settings, ITEMS[:5], FEED_SHARD_ITEMS=2, FEED_FLUSH_EVERY_ITEMS=1, FEED_FSYNC=True)
+        index, shards = _read_shards(get_shards_index_path(feed_settings['feed_file']))
+    assert [shard['file'] for shard in index] == ['feed.1.rss.gz', 'feed.2.rss.gz', 'feed.3.rss.gz']
+    assert sum(shards, []) == ['Title {}'.format(i) for i in range(5)]
+
+
+def test_empty_sharded_feed():
+    with FeedSettings() as feed_settings:
+        export_feed(feed_settings, [], FEED_SHARD_ITEMS=3)
+        index, shards = _read_shards(get_shards_index_path(feed_settings['feed_file']))
+    assert [(shard['file'], shard['items'], shard['first_pub_date']) for shard in index] == [('feed.1.rss', 0, None)]
+    assert shards == [[]]
+
+
+ROTATED_FEED_FILE = os.path.join('feeds', '%(spider)s', '%(date)s.rss')
+
+
+@pytest.mark.parametrize('async_export', [False, True])
+def test_rotation_by_pub_date(async_export):
+    dates = [datetime(2000, 1, 1, 10), datetime(2000, 1, 1, 23), datetime(2000, 1, 2, 1), datetime(2000, 1, 1, 5)]
+    with FeedSettings(ROTATED_FEED_FILE) as feed_settings:
+        feeds_dir = os.path.dirname(os.path.dirname(feed_settings['feed_file']))
+        export_feed(feed_settings, [RssItem(title='Title {}'.format(i), pubDate=date) for i, date in enumerate(dates)],
+                    FEED_ROTATION='daily', FEED_ROTATION_BY='pubDate', FEED_ASYNC_EXPORT=async_export,
+                    FEED_ROTATION_OPEN_WINDOWS=1, FEED_SHARD_INDEX=os.path.join(feeds_dir, '%(spider)s.json'))
+        index, shards = _read_shards(os.path.join(feeds_dir, 'example.com.json'))
+    assert [(shard['file'], shard['window'], shard['items']) for shard in index] == [
+        (os.path.join('example.com', '2000-01-01.rss'), '2000-01-01', 2),
+        (os.path.join('example.com', '2000-01-02.rss'), '2000-01-02', 1),
+        (os.path.join('example.com', '2000-01-01.2.rss'), '2000-01-01', 1),
+    ]
+    assert shards == [['Title 0', 'Title 1'], ['Title 2'], ['Title 3']]
+
+
+def test_rotation_by_unsorted_pub_dates():
+    days = [1, 2, 1, 2, 3, 1, 4, 2, 4, 1]
+    with FeedSettings(ROTATED_FEED_FILE) as feed_settings:
+        feeds_dir = os.path.dirname(os.path.dirname(feed_settings['feed_file']))
+        export_feed(feed_settings, [RssItem(title='Title {}'.format(i), pubDate=datetime(2000, 1, day, 12))
+                                    for i, day in enumerate(days)],
+                    FEED_ROTATION='daily', FEED_ROTATION_BY='pubDate', FEED_FLUSH_EVERY_ITEMS=1, FEED_FSYNC=True,
+                    FEED_SHARD_INDEX=os.path.join(feeds_dir, '%(spider)s.json'))
+        index, shards = _read_shards(os.path.join(feeds_dir, 'example.com.json'))
+    # window of 1st day is finished when 4th day is started, so its last item is late
+    assert [(shard['window'], shard['items']) for shard in index] == [
+        ('2000-01-01', 3), ('2000-01-02', 3), ('2000-01-03', 1), ('2000-01-04', 2), ('2000-01-01', 1)]
+    assert shards[0] == ['Title 0', 'Title 2', 'Title 5']
+    assert shards[1] == ['Title 1', 'Title 3', 'Title 7']
+    assert shards[4] == ['Title 9']
+
+
+@pytest.mark.parametrize('shard_items', [0, 10])
+def test_rotation_of_previous_run(shard_items):
+    with FeedSettings(ROTATED_FEED_FILE) as feed_settings:
+        feeds_dir = os.path.dirname(os.path.dirname(feed_settings['feed_file']))
+        settings = {'FEED_ROTATION': 'daily', 'FEED_ROTATION_BY': 'pubDate', 'FEED_SHARD_ITEMS': shard_items,
+                    'FEED_SHARD_INDEX': os.path.join(feeds_dir, '%(spider)s.json')}
+        export_feed(feed_settings, [RssItem(title='Title 0', pubDate=datetime(2000, 1, 1, 10)),
+                                    RssItem(title='Title 1', pubDate=datetime(2000, 1, 1, 11))], **settings)
+        export_feed(feed_settings, [RssItem(title='Title 0', pubDate=datetime(2000, 1, 1, 12))], **settings)
+        index, shards = _read_shards(os.path.join(feeds_dir, 'example.com.json'))
+    suffix = '.1' if shard_items else ''
+    assert [(shard['file'], shard['items']) for shard in index] == [
+        (os.path.join('example.com', '2000-01-01{}.rss'.format(suffix)), 2),
+        (os.path.join('example.com', '2000-01-01.2.rss'), 1),
+    ]
+    assert shards == [['Title 0', 'Title 1'], ['Title 0']]
+
+
+def test_rotation_by_time(monkeypatch):
+    now = [datetime(2000, 1, 1, 10, 30)]
+
+    class FakeDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return now[0]
+
+    monkeypatch.setattr(sharding, 'datetime', FakeDatetime)
+    dates = [datetime(2000, 1, 1, 10), datetime(2000, 1, 1, 23), datetime(2000, 1, 2, 1)]
+
+    class Clock(object):
+        def process_item(self, item, spider):
+            now[0] += timedelta(minutes=20)
+            return item
+
+    with FeedSettings(ROTATED_FEED_FILE) as feed_settings:
+        feeds_dir = os.path.dirname(os.path.dirname(feed_settings['feed_file']))
+        export_feed(feed_settings, [RssItem(title='Title {}'.format(i), pubDate=date) for i, date in enumerate(dates)],
+                    FEED_ROTATION='hourly', FEED_SHARD_ITEMS=10,
+                    FEED_SHARD_INDEX=os.path.join(feeds_dir, '%(spider)s.json'),
+                    ITEM_PIPELINES={Clock: 100, 'scrapy_rss.pipelines.FeedExportPipeline': 900})
+        index, shards = _read_shards(os.path.join(feeds_dir, 'example.com.json'))
+    assert [(shard['file'], shard['items']) for shard in index] == [
+        (os.path.join('example.com', '2000-01-01T10.1.rss'), 1),
+        (os.path.join('example.com', '2000-01-01T11.1.rss'), 2),
+    ]
+    assert shards == [['Title 0'], ['Title 1', 'Title 2']]
+
+    with pytest.raises(ValueError, match='Unknown rotation'):
+        sharding.ShardedFeedExporter('%(date)s.rss', None, None, rotation='weekly')
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+import os
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from scrapy_rss import RssItem
+from scrapy_rss.sorting import get_sort_key
+from tests.utils import FeedSettings, export_feed, get_item_titles, read_feed
+
+
+def title_length(item):
+    return len(item.title.value)
+
+
+def _items(count, seed=0):
+    rnd = random.Random(seed)
+    items = []
+    for i in range(count):
+        item = RssItem(title='Title {}'.format(i), description='x' * rnd.randint(0, 50))
+        if i % 10:
+            item.pubDate = datetime(2000, 1, 1) + timedelta(hours=rnd.randint(0, 1000))
+        items.append(item)
+    return items
+
+
+@pytest.mark.parametrize('async_export', [False, True])
+@pytest.mark.parametrize('memory_limit', [1, 2000, 64 * 1024 * 1024])
+def test_sort_by_pub_date(async_export, memory_limit):
+    items = _items(200)
+    key = get_sort_key('pubDate')
+    dates = {item.title.value: key(item) if item.pubDate.assigned else None for item in items}
+    with FeedSettings() as feed_settings:
+        export_feed(feed_settings, items, FEED_SORT_BY='pubDate', FEED_SORT_MEMORY_LIMIT=memory_limit,
+                    FEED_SORT_TEMP_DIR=os.path.dirname(feed_settings['feed_file']), FEED_ASYNC_EXPORT=async_export)
+        titles = get_item_titles(read_feed(feed_settings['feed_file']))
+    assert sorted(titles) == sorted(dates)
+    # items without publication date are considered as published at the export, so they are the newest
+    assert all(dates[title] is None for title in titles[:20])
+    dated_titles = titles[20:]
+    assert dated_titles == sorted(dated_titles, key=lambda title: (-dates[title], int(title.split()[1])))
+
+
+@pytest.mark.parametrize('memory_limit', [1, 64 * 1024 * 1024])
+def test_sort_by_element_and_function(memory_limit):
+    items = _items(50)
+    titles = ['Title {}'.format(i) for i in range(50)]
+    with FeedSettings() as feed_settings:
+        path = feed_settings['feed_file']
+        settings = {'FEED_SORT_MEMORY_LIMIT': memory_limit, 'FEED_SORT_TEMP_DIR': os.path.dirname(path)}
+        export_feed(feed_settings, items, FEED_SORT_BY='title', **settings)
+        assert get_item_titles(read_feed(path)) == sorted(titles)
+        export_feed(feed_settings, items, FEED_SORT_BY='title', FEED_SORT_REVERSE=True, **settings)
+        assert get_item_titles(read_feed(path)) == sorted(titles, reverse=True)
+        export_feed(feed_settings, items, FEED_SORT_BY='tests.test_sorting.title_length', **settings)
+        assert get_item_titles(read_feed(path)) == sorted(titles, key=len)
+
+
+def test_sort_by_multiple_elements():
+    items = []
+    for i, categories in enumerate([['b', 'a'], [], ['c'], ['a']]):
+        item = RssItem(title='Title {}'.format(i))
+        for category in categories:
+            item.category.append(category)
+        items.append(item)
+    with FeedSettings() as feed_settings:
+        export_feed(feed_settings, items, FEED_SORT_BY='category')
+        assert get_item_titles(read_feed(feed_settings['feed_file'])) == ['Title 1', 'Title 3', 'Title 0', 'Title 2']
+
+
+def test_sort_settings():
+    with FeedSettings() as feed_settings:
+        with pytest.raises(ValueError, match='not supported'):
+            export_feed(feed_settings, [], FEED_SORT_BY='title', FEED_MAX_ITEMS=10)
@@ -7,7 +7,8 @@ import pytest
 import six
 
 from scrapy_rss.utils import (format_rfc822, is_strict_subclass, get_full_class_name,
-                              deprecated_module, deprecated_class, deprecated_func)
+                              deprecated_module, deprecated_class, deprecated_func,
+                              get_tzlocal, get_cached_tzlocal)
 
 
 class A0:
@@ -59,6 +60,67 @@ def test_format_rfc822(dt, timezone_offset):
                         dt.hour, dt.minute, dt.second, timezone_offset))
     assert format_rfc822(dt) == expected
 
+@pytest.mark.parametrize("offset,expected_offset", [
+    (timedelta(hours=3), '+0300'),
+    (timedelta(hours=-3, minutes=-30), '-0330'),
+    (timedelta(hours=5, minutes=45, seconds=10), '+054510'),
+    (timedelta(hours=-1, microseconds=-5), '-010000.000005'),
+    (None, ''),
+])
+def test_format_rfc822_offsets(offset, expected_offset):
+    class Tz(tzinfo):
+        def utcoffset(self, dt):
+            return offset
+
+        def dst(self, dt):
+            return None
+
+    dt = datetime(2020, 2, 29, 7, 8, 9, tzinfo=Tz())
+    assert format_rfc822(dt) == 'Sat, 29 Feb 2020 07:08:09 ' + expected_offset
+    assert format_rfc822(dt) == dt.strftime('%a, %d %b %Y %H:%M:%S %z')
+
+
+@pytest.mark.skipif(six.PY2, reason='fold attribute of datetime requires Python 3.6')
+def test_format_rfc822_ambiguous_time():
+    class Tz(tzinfo):
+        def utcoffset(self, dt):
+            return timedelta(hours=1 if dt.fold else 2)
+
+        def dst(self, dt):
+            return timedelta(hours=0 if dt.fold else 1)
+
+    tz = Tz()
+    dt = datetime(2020, 10, 25, 2, 30, 0, tzinfo=tz)
+    assert format_rfc822(dt) == 'Sun, 25 Oct 2020 02:30:00 +0200'
+    assert format_rfc822(dt.replace(fold=1)) == 'Sun, 25 Oct 2020 02:30:00 +0100'
+    assert format_rfc822(dt) == 'Sun, 25 Oct 2020 02:30:00 +0200'
+
+
+
+def test_format_rfc822_same_instants():
+    class TzOffset(tzinfo):
+        def __init__(self, hours):
+            self._offset = timedelta(hours=hours)
+
+        def utcoffset(self, dt):
+            return self._offset
+
+        def dst(self, dt):
+            return timedelta(0)
+
+    dt0 = datetime(2000, 1, 1, 12, 0, 0, tzinfo=TzOffset(0))
+    dt1 = datetime(2000, 1, 1, 13, 0, 0, tzinfo=TzOffset(1))
+    assert dt0 == dt1
+    assert format_rfc822(dt0) == 'Sat, 01 Jan 2000 12:00:00 +0000'
+    assert format_rfc822(dt1) == 'Sat, 01 Jan 2000 13:00:00 +0100'
+
+
+def test_format_rfc822_naive():
+    dt = datetime(2010, 12, 28, 1, 1, 1)
+    assert format_rfc822(dt) == dt.replace(tzinfo=get_tzlocal()).strftime('%a, %d %b %Y %H:%M:%S %z')
+    assert get_cached_tzlocal() is get_cached_tzlocal()
+
+
 @pytest.mark.parametrize("tz_offset,tz_name",
                          ((n, 'Etc/GMT{:+}'.format(-n) if abs(n) >= 10 or n == 0
                               else {-1: 'Atlantic/Cape_Verde', 2: 'Europe/Kaliningrad'}[n])
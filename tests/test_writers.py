@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+from datetime import datetime
+from io import BytesIO
+from itertools import chain
+from xml.sax.saxutils import XMLGenerator
+
+import pytest
+from lxml import etree
+
+from scrapy_rss import writers
+from scrapy_rss.exporters import FeedItemExporter
+from scrapy_rss.writers import XmlWriter, LxmlXmlWriter, get_xml_writer_cls
+from tests import predefined_items
+from tests.utils import FullRssItemExporter
+
+
+initialized_items = predefined_items.PredefinedItems()
+XML_WRITERS = ['native']
+ALL_ITEMS = list(chain(
+    ((item_name, None, None, item) for item_name, item in initialized_items.items.items()),
+    ((item_name, namespaces, item_cls, item)
+     for item_name, namespaces, item_cls, item in initialized_items.ns_items
+     if not isinstance(item_cls, str)),
+))
+
+
+def _write_events(writer_cls, encoding='utf-8'):
+    out = BytesIO()
+    writer = writer_cls(out, encoding=encoding)
+    writer.startDocument()
+    writer.startPrefixMapping('p', 'id1')
+    writer.startPrefixMapping(None, 'id2')
+    writer.startElementNS((None, 'root'), 'root', {(None, 'version'): '2.0'})
+    writer.startElement('channel', {})
+    writer.startElementNS(('id1', 'elem'), 'p:elem',
+                          {('id1', 'attr1'): 'a&b<c>"d"', (None, 'attr2'): "'e'\n\t\r",
+                           (None, 'attr3'): 'f"g\'h', ('id2', 'attr4'): ''})
+    writer.characters(u'Text & <markup> "quotes" é中')
+    writer.endElementNS(('id1', 'elem'), 'p:elem')
+    writer.startPrefixMapping('p', 'id3')
+    writer.startElementNS(('id3', 'elem'), 'p:elem', {})
+    writer.characters(b'bytes')
+    writer.characters('')
+    writer.endElementNS(('id3', 'elem'), 'p:elem')
+    writer.endPrefixMapping('p')
+    writer.startElementNS(('id1', 'elem'), 'p:elem', {('http://www.w3.org/XML/1998/namespace', 'lang'): 'en'})
+    writer.ignorableWhitespace('\n ')
+    writer.endElementNS(('id1', 'elem'), 'p:elem')
+    writer.endElement('channel')
+    writer.endElementNS((None, 'root'), 'root')
+    writer.endPrefixMapping(None)
+    writer.endPrefixMapping('p')
+    writer.endDocument()
+    return out.getvalue()
+
+
+@pytest.mark.parametrize('writer', XML_WRITERS)
+@pytest.mark.parametrize('encoding', ['utf-8', 'latin-1', 'ascii'])
+def test_writer_events(writer, encoding):
+    assert _write_events(get_xml_writer_cls(writer), encoding) == _write_events(XMLGenerator, encoding)
+
+
+def test_writer_buffering():
+    out = BytesIO()
+    writer = XmlWriter(out, buffer_chunks=3)
+    writer.startDocument()
+    writer.startElementNS((None, 'root'), 'root', {})
+    assert out.getvalue() == b''
+    writer.endElementNS((None, 'root'), 'root')
+    assert out.getvalue() == b'<?xml version="1.0" encoding="utf-8"?>\n<root></root>'
+
+
+def test_writer_partial_writes():
+    class RawOutput(BytesIO):
+        def write(self, data):
+            return super(RawOutput, self).write(data[:7])
+
+    out = RawOutput()
+    writer = XmlWriter(out)
+    writer.startDocument()
+    writer.startElementNS((None, 'root'), 'root', {})
+    writer.characters(u'Text é中')
+    writer.endElementNS((None, 'root'), 'root')
+    writer.endDocument()
+    assert out.getvalue() == u'<?xml version="1.0" encoding="utf-8"?>\n<root>Text é中</root>'.encode('utf-8')
+
+
+def test_get_xml_writer_cls():
+    assert get_xml_writer_cls(None) is XmlWriter
+    assert get_xml_writer_cls('native') is XmlWriter
+    assert get_xml_writer_cls('sax') is XMLGenerator
+    assert get_xml_writer_cls('scrapy_rss.writers.XmlWriter') is XmlWriter
+    assert get_xml_writer_cls(XMLGenerator) is XMLGenerator
+    assert get_xml_writer_cls('lxml') is LxmlXmlWriter
+
+
+def test_lxml_writer_fallback(monkeypatch):
+    monkeypatch.setattr(writers, 'etree', None)
+    with pytest.warns(UserWarning, match='lxml is not installed'):
+        assert get_xml_writer_cls('lxml') is XMLGenerator
+    with pytest.raises(ImportError):
+        LxmlXmlWriter(BytesIO())
+
+
+def _export(exporter_cls, item, writer, **kwargs):
+    out = BytesIO()
+    exporter = exporter_cls(out, 'Title', 'http://example.com/feed', 'Description',
+                            last_build_date=datetime(2000, 1, 1, 0, 0, 0), xml_writer=writer, **kwargs)
+    exporter.start_exporting()
+    exporter.export_item(item)
+    exporter.export_item(item)
+    exporter.finish_exporting()
+    return out.getvalue()
+
+
+@pytest.mark.parametrize('writer', XML_WRITERS)
+@pytest.mark.parametrize('exporter_cls', [FeedItemExporter, FullRssItemExporter])
+@pytest.mark.parametrize('item_name,namespaces,item_cls,item', ALL_ITEMS)
+def test_identical_output(writer, exporter_cls, item_name, namespaces, item_cls, item):
+    kwargs = {'namespaces': namespaces, 'item_cls': item_cls}
+    assert _export(exporter_cls, item, writer, **kwargs) == _export(exporter_cls, item, 'sax', **kwargs)
+
+
+def _xml_to_tuple(element):
+    return (element.tag, sorted(element.attrib.items()), element.text, element.tail,
+            [_xml_to_tuple(child) for child in element])
+
+
+@pytest.mark.parametrize('exporter_cls', [FeedItemExporter, FullRssItemExporter])
+@pytest.mark.parametrize('item_name,namespaces,item_cls,item', ALL_ITEMS)
+def test_lxml_equivalent_output(exporter_cls, item_name, namespaces, item_cls, item):
+    kwargs = {'namespaces': namespaces, 'item_cls': item_cls}
+    data = _export(exporter_cls, item, 'lxml', **kwargs)
+    expected = _export(exporter_cls, item, 'sax', **kwargs)
+    assert data.startswith(b"<?xml version='1.0' encoding='utf-8'?>")
+    assert _xml_to_tuple(etree.fromstring(data)) == _xml_to_tuple(etree.fromstring(expected))
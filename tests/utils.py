@@ -1,7 +1,13 @@
 # -*- coding: utf-8 -*-
 
+import os
 from collections import Counter
+from datetime import datetime
 
+try:
+    from tempfile import TemporaryDirectory
+except ImportError:
+    from backports.tempfile import TemporaryDirectory
 from unittest.util import safe_repr
 import difflib
 from os.path import commonprefix
@@ -9,20 +15,32 @@ import pprint
 import six
 from lxml.etree import XMLSyntaxError
 
+from packaging.version import Version
 from twisted.python.failure import Failure
+import scrapy
+from scrapy import signals
+from scrapy.exceptions import DropItem
 from scrapy.pipelines import ItemPipelineManager
+from scrapy.utils.misc import load_object
+from scrapy.utils.test import get_crawler
 from lxml import etree
 from xmlunittest import XmlTestCase
 from parameterized import parameterized
 
 from scrapy_rss.meta import Element, MultipleElements, NSComponentName
 from scrapy_rss.items import RssItem
+from scrapy_rss.exporters import FeedItemExporter
+from scrapy_rss.rss import channel_elements
+from scrapy_rss.utils import get_tzlocal
 
 try:
     from collections.abc import Mapping
 except ImportError:
     from collections import Mapping
 
+if Version(scrapy.__version__) >= Version('2.13'):
+    from twisted.internet import reactor # not used but it's required
+
 try:
     from unittest.util import _common_shorten_repr, _shorten
 except ImportError:
@@ -197,6 +215,138 @@ class RaisedItemPipelineManager(ItemPipelineManager):
         return d
 
 
+class CrawlerContext(object):
+    default_settings = FrozenDict({'ITEM_PIPELINES':
+                                       {'scrapy_rss.pipelines.FeedExportPipeline': 900,},
+                                   'LOG_LEVEL': 'WARNING',
+                                   'EXTENSIONS': {
+                                       'scrapy.extensions.memusage.MemoryUsage': None,},
+                                   })
+
+    def __init__(self, feed_file=None, feed_title=None, feed_link=None, feed_description=None,
+                 crawler_settings=None):
+        settings = crawler_settings if crawler_settings else dict(self.default_settings)
+        if feed_file:
+            settings['FEED_FILE'] = feed_file
+        if feed_title:
+            settings['FEED_TITLE'] = feed_title
+        if feed_link:
+            settings['FEED_LINK'] = feed_link
+        if feed_description:
+            settings['FEED_DESCRIPTION'] = feed_description
+        self.crawler = get_crawler(settings_dict=settings)
+        self.spider = scrapy.Spider.from_crawler(self.crawler, 'example.com')
+        self.spider.parse = lambda response: ()
+        item_processor = settings.get('ITEM_PROCESSOR')
+        if not item_processor:
+            item_processor = RaisedItemPipelineManager
+        elif isinstance(item_processor, six.string_types):
+            item_processor = load_object(item_processor)
+
+        self.ipm = item_processor.from_crawler(self.crawler)
+
+    def __enter__(self):
+        responses = self.crawler.signals.send_catch_log(signal=signals.spider_opened,
+                                                        spider=self.spider)
+        for _, failure in responses:
+            if failure:
+                failure.raiseException()
+
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        responses = self.crawler.signals.send_catch_log(signal=signals.spider_closed,
+                                                        spider=self.spider, reason=None)
+        for _, failure in responses:
+            if failure:
+                failure.raiseException()
+
+
+class FullRssItemExporter(FeedItemExporter):
+    def __init__(self, file, channel_title, channel_link, channel_description,
+                 language='en-US',
+                 copyright='Data',
+                 managing_editor='m@dot.com (Manager Name)',
+                 webmaster='web@dot.com (Webmaster Name)',
+                 pubdate=datetime(2000, 2, 1, 0, 10, 30, tzinfo=get_tzlocal()),
+                 last_build_date=datetime(2000, 2, 1, 5, 10, 30, tzinfo=get_tzlocal()),
+                 category='some category',
+                 generator='tester',
+                 docs='http://example.com/rss_docs',
+                 cloud=FrozenDict({
+                     'domain': 'rpc.sys.com',
+                     'port': '80',
+                     'path': '/RPC2',
+                     'registerProcedure': 'myCloud.rssPleaseNotify',
+                     'protocol': 'xml-rpc'
+                 }),
+                 ttl=60,
+                 image=channel_elements.ImageElement(url='http://example.com/img.jpg',
+                                                     width=54),
+                 rating=4.0,
+                 text_input=channel_elements.TextInputElement(title='Input title',
+                                                              description='Description of input',
+                                                              name='Input name',
+                                                              link='http://example.com/cgi.py'),
+                 skip_hours=(0, 1, 3, 7, 23),
+                 skip_days=14,
+                 *args, **kwargs):
+        super(FullRssItemExporter, self) \
+            .__init__(file, channel_title, channel_link, channel_description,
+                      language=language, copyright=copyright, managing_editor=managing_editor,
+                      webmaster=webmaster, pubdate=pubdate, last_build_date=last_build_date,
+                      category=category, generator=generator,
+                      docs=docs, cloud=cloud, ttl=ttl,
+                      image=image, rating=rating, text_input=text_input,
+                      skip_hours=skip_hours, skip_days=skip_days,
+                      *args, **kwargs)
+
+
+default_feed_settings = FrozenDict({'feed_file': 'feed.rss',
+                                    'feed_title': 'Title',
+                                    'feed_link': 'http://example.com/feed',
+                                    'feed_description': 'Description'})
+
+
+class FeedSettings(TemporaryDirectory):
+    def __init__(self, feed_file=None, **kwargs):
+        super(FeedSettings, self).__init__(**kwargs)
+        self.feed_file = feed_file or default_feed_settings['feed_file']
+
+    def __enter__(self):
+        dirname = super(FeedSettings, self).__enter__()
+        feed_settings = dict(default_feed_settings)
+        feed_settings['feed_file'] = os.path.join(dirname, self.feed_file)
+        feed_settings = FrozenDict(feed_settings)
+        return feed_settings
+
+
+def export_feed(feed_settings, items, **settings):
+    """
+    Export items by the pipeline with the default crawler settings that are updated by the given settings.
+    Returns the number of dropped items
+    """
+    crawler_settings = dict(CrawlerContext.default_settings)
+    crawler_settings.update(settings)
+    dropped = 0
+    with CrawlerContext(crawler_settings=crawler_settings, **feed_settings) as context:
+        for item in items:
+            try:
+                context.ipm.process_item(item, context.spider)
+            except DropItem:
+                dropped += 1
+    return dropped
+
+
+def read_feed(path, open_file=open):
+    with open_file(path, 'rb') as data:
+        return data.read()
+
+
+def get_item_titles(data):
+    return [title.text for title in etree.fromstring(data).xpath('//item/title')]
+
+
 class UnorderedXmlTestCase(XmlTestCase):
     """
     Expand XmlTestCase functionality with unordered XML equivalence testing.